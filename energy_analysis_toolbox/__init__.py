@@ -30,6 +30,8 @@ Submodules
 - **logger**: A logging configuration and utility to enable detailed logging and
   diagnostics for energy analysis routines.
 - **keywords**: Defines specific keywords used throughout the analysis for consistency.
+- **core**: Array kernels working on NumPy arrays of epoch-ns times and float
+  values, on which the pandas functions of the toolbox are based.
 - **weather**: Includes tools to calculate heating and cooling degree days and methods
   to analyze thermosensitivity against weather conditions.
 - **timeseries**: Modules for time series analysis, including profiles for
@@ -65,6 +67,7 @@ preprocessing and structuring energy data.
 
 from . import (
     constants,
+    core,
     energy,
     errors,
     keywords,
@@ -0,0 +1,30 @@
+"""Array kernels of |eat| working on NumPy arrays instead of pandas objects.
+
+The functions of this subpackage take and return plain arrays:
+
+- times are 1D int64 arrays of epoch-ns timestamps (UTC), sorted in ascending
+  order;
+- values are float64 arrays with one row per timestamp.
+
+The pandas functions of :py:mod:`energy_analysis_toolbox.timeseries` are thin
+wrappers around these kernels. Using the kernels directly avoids the cost of
+building pandas indexes and series, e.g. in pipelines based on Arrow tables.
+:py:func:`as_times` and :py:func:`as_values` convert NumPy or pyarrow arrays to
+the expected types without copying them when possible.
+"""
+
+from .basics import (
+    as_times,
+    as_values,
+    bounds_over,
+    timesteps,
+)
+from .conservative import (
+    flow_rate_conservative,
+    volume_conservative,
+)
+from .interpolate import (
+    grid_positions,
+    piecewise_affine_kernel,
+    piecewise_constant_kernel,
+)
@@ -0,0 +1,198 @@
+"""Conversions of arrays and basic features of timeseries given as arrays."""
+
+from contextlib import suppress
+
+import numpy as np
+
+from energy_analysis_toolbox.errors import (
+    EATEmptyDataError,
+    EATInvalidTimestepDurationError,
+    EATUndefinedTimestepError,
+)
+
+NS_PER_S = 10**9
+
+
+def as_times(times: np.ndarray) -> np.ndarray:
+    """Return an array of times as epoch-ns int64 values.
+
+    Parameters
+    ----------
+    times : array-like
+        A 1D array of datetime64 or integer (epoch-ns) values, a (possibly
+        tz-aware) ``pd.DatetimeIndex``, or any object supporting the NumPy
+        array protocol such as a ``pyarrow`` timestamp array.
+
+    Returns
+    -------
+    np.ndarray
+        The int64 epoch-ns times. No copy is made when ``times`` already
+        holds int64 or datetime64[ns] values without missing ones.
+
+    Raises
+    ------
+    TypeError
+        If the values are neither datetimes nor integers.
+
+    """
+    with suppress(AttributeError):
+        times = times.as_unit("ns").asi8
+    array = np.asarray(times)
+    if np.issubdtype(array.dtype, np.datetime64):
+        return array.astype("M8[ns]", copy=False).view(np.int64)
+    if np.issubdtype(array.dtype, np.integer):
+        return array.astype(np.int64, copy=False)
+    err = f"Times must be datetimes or epoch-ns integers. Received {array.dtype}."
+    raise TypeError(err)
+
+
+def as_values(values: np.ndarray) -> np.ndarray:
+    """Return an array of values as float64 values.
+
+    Parameters
+    ----------
+    values : array-like
+        A 1D or 2D array of numbers, or any object supporting the NumPy array
+        protocol such as a ``pyarrow`` array.
+
+    Returns
+    -------
+    np.ndarray
+        The float64 values. No copy is made when ``values`` already holds
+        float64 values.
+
+    """
+    return np.asarray(values, dtype=np.float64)
+
+
+def timesteps(
+    times: np.ndarray,
+    last_step: float | None = None,
+) -> np.ndarray:
+    """Return the array of interval durations of epoch-ns times.
+
+    Parameters
+    ----------
+    times : np.ndarray
+        1D int64 array of epoch-ns times in chronological order.
+    last_step : float, optional
+        Duration of the last time-step in (s).
+        The default is |None| meaning that the same duration as the former-last
+        one is used.
+
+    Raises
+    ------
+    EATEmptyDataError :
+        If ``times`` is empty.
+    EATUndefinedTimestepError :
+        If ``times`` contains only one element and ``last_step`` is |None|.
+    EATInvalidTimestepDurationError :
+        If ``last_step < 0``.
+
+    Returns
+    -------
+    np.ndarray
+        The durations in (s). The element i is the duration before the next
+        time.
+
+    """
+    if times.size == 0:
+        err = "Interval durations cannot be inferred for empty time-sequences."
+        raise EATEmptyDataError(err)
+    min_time_indices_length = 2
+    if times.size < min_time_indices_length and last_step is None:
+        err = (
+            "The series should contain at least 2 elements to infer a duration"
+            "when last_step value is None."
+        )
+        raise EATUndefinedTimestepError(err)
+    if last_step is not None and last_step < 0:
+        err = f"Last step duration must be >=0. Received {last_step} s."
+        raise EATInvalidTimestepDurationError(err)
+    # better initialize and assign to avoid table extension in the next step
+    durations = np.empty(times.size)
+    np.divide(np.diff(times), NS_PER_S, out=durations[:-1])
+    if last_step is None:
+        durations[-1] = durations[-2]
+    else:
+        durations[-1] = last_step
+    return durations
+
+
+def with_ghost(
+    times: np.ndarray,
+    last_step: float,
+) -> np.ndarray:
+    """Return epoch-ns times with an extra time ``last_step`` after the last one.
+
+    Parameters
+    ----------
+    times : np.ndarray
+        1D int64 array of epoch-ns times, with at least one element.
+    last_step : float
+        Duration between the last time and the extra one in (s).
+
+    Returns
+    -------
+    np.ndarray
+        A new int64 array with one more element than ``times``.
+
+    """
+    extended = np.empty(times.size + 1, dtype=np.int64)
+    extended[:-1] = times
+    # truncated to the ns, as pd.Timedelta(seconds=last_step)
+    extended[-1] = times[-1] + int(last_step * NS_PER_S)
+    return extended
+
+
+def bounds_over(
+    values: np.ndarray,
+    low_tshd: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return the positions of the intervals when the values are over ``low_tshd``.
+
+    This function is the array kernel of
+    :py:func:`energy_analysis_toolbox.timeseries.extract_features.intervals_over`,
+    which works on the raw values without any index.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        1D array of values in which intervals of consecutive values over
+        ``low_tshd`` are searched. Missing values are considered as not over
+        the threshold.
+    low_tshd : float
+        Lower threshold on the values **(strict)**.
+
+    Returns
+    -------
+    starts : np.ndarray
+        Positions of the first value of each interval.
+    ends : np.ndarray
+        Positions of the first value after each interval.
+
+    Notes
+    -----
+    The shifts of the boolean mask ``values > low_tshd`` are found at once using
+    :py:func:`np.diff` and :py:func:`np.flatnonzero`, so that the cost is linear
+    in the number of values, whatever the number of intervals.
+    As in ``intervals_over``, an interval which is still open at the end
+    of the array is closed on the last position, and an interval which starts
+    on the last position is discarded.
+
+    """
+    over = np.asarray(values) > low_tshd
+    if over.size == 0:
+        return np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+    # 1 position of the values which differ from the previous ones
+    shifts = np.flatnonzero(over[1:] != over[:-1]) + 1
+    # 2 the bounds of the array are shifts if the value is over the threshold
+    if over[0]:
+        shifts = np.r_[0, shifts]
+    last = over.size - 1
+    if over[-1] and (shifts.size == 0 or shifts[-1] != last):
+        shifts = np.r_[shifts, last]
+    # 3 even shifts are starts and odd shifts are ends
+    n_intervals = shifts.size // 2
+    shifts = shifts.astype(np.int64, copy=False)
+    return shifts[0 : 2 * n_intervals : 2], shifts[1 : 2 * n_intervals : 2]
@@ -0,0 +1,197 @@
+"""Resample volumes and flow-rates given at epoch-ns times, conserving volumes.
+
+These are the array kernels of
+:py:mod:`energy_analysis_toolbox.timeseries.resample.conservative`, which
+documents the algorithm.
+"""
+
+import numpy as np
+
+from energy_analysis_toolbox.errors import (
+    EATEmptySourceError,
+    EATEmptyTargetsError,
+    EATInvalidTimestepDurationError,
+)
+
+from .basics import timesteps, with_ghost
+from .interpolate import grid_positions, piecewise_affine_kernel
+
+
+def volume_conservative(
+    source_times: np.ndarray,
+    volumes: np.ndarray,
+    target_times: np.ndarray,
+    last_step_duration: float | None = None,
+    last_target_step_duration: float | None = None,
+) -> np.ndarray:
+    """Resample volumes on target times assuming it is a conservative variable.
+
+    Parameters
+    ----------
+    source_times : np.ndarray
+        1D int64 array of epoch-ns times of the volumes, sorted in ascending
+        order.
+    volumes : np.ndarray
+        1D or 2D float array of the volumes which flow from each source time
+        until the next one, with ``source_times.size`` rows. Each column of a
+        2D array is resampled as a distinct timeseries.
+    target_times : np.ndarray
+        1D int64 array of epoch-ns times at which the volumes are required,
+        sorted in ascending order.
+    last_step_duration : float, optional
+        Duration of the last source time-step in (s).
+        The default is |None| in which case the duration of the former-last
+        time-step is used.
+    last_target_step_duration : float, optional
+        Duration of the last target time-step in (s).
+        The default is |None| in which case the duration of the former-last
+        time-step is used.
+
+    Returns
+    -------
+    np.ndarray
+        The volumes which flow from each target time until the next one, with
+        as many columns as ``volumes``. Volumes which cannot be determined
+        because of missing source volumes are NaN.
+
+    Raises
+    ------
+    EATEmptySourceError :
+        In case ``volumes`` is empty.
+    EATEmptyTargetsError :
+        In case ``target_times`` is empty.
+    EATInvalidTimestepDurationError :
+        In case ``last_step_duration <= 0`` or ``last_target_step_duration <= 0``.
+
+
+    .. seealso::
+
+        :py:func:`energy_analysis_toolbox.timeseries.resample.volume_conservative`
+        for the algorithm.
+
+    """
+    if volumes.shape[0] == 0:
+        err = (
+            "Resampling an empty volumes series to new instants is an "
+            "invalid operation."
+        )
+        raise EATEmptySourceError(err)
+    if target_times.size == 0:
+        err = "Target instants must be provided for the series to be resampled."
+        raise EATEmptyTargetsError(err)
+    if (last_step_duration is not None and last_step_duration <= 0) or (
+        last_target_step_duration is not None and last_target_step_duration <= 0
+    ):
+        err = "Last step duration cannot be zero."
+        raise EATInvalidTimestepDurationError(err)
+    is_nan = np.isnan(volumes)
+    cumulated = np.empty((volumes.shape[0] + 1, *volumes.shape[1:]))
+    cumulated[0] = 0.0  # [3.]
+    if is_nan.any():
+        np.nancumsum(volumes, axis=0, out=cumulated[1:])  # [1.]
+        cumulated[1:][is_nan] = np.nan  # same as pd.Series.cumsum
+    else:
+        np.cumsum(volumes, axis=0, out=cumulated[1:])  # [1.]
+    # the function deals with None last_step_duration values
+    durations = timesteps(source_times[-2:], last_step_duration)
+    source_times = with_ghost(source_times, durations[-1])  # [2.]
+    # the function deals with None last_target_step_duration
+    target_durations = timesteps(target_times[-2:], last_target_step_duration)
+    target_times = with_ghost(target_times, target_durations[-1])  # [4.1]
+    steps = np.diff(target_times)
+    positions = None
+    # counting the sources in the grid steps is linear in the number of sources,
+    # searching the targets is only worth it when there are fewer of them
+    is_regular = steps[0] > 0 and (steps == steps[0]).all()
+    if is_regular and target_times.size >= source_times.size:
+        positions = grid_positions(
+            source_times,
+            target_times[0],
+            steps[0],
+            target_times.size,
+        )
+    interp_cumulated = piecewise_affine_kernel(
+        target_times,
+        source_times,
+        cumulated,
+        positions=positions,
+    )  # [4.2]
+    return np.diff(interp_cumulated, axis=0)  # [5.] [6.] [7.]
+
+
+def flow_rate_conservative(
+    source_times: np.ndarray,
+    flow_rates: np.ndarray,
+    target_times: np.ndarray,
+    last_step_duration: float | None = None,
+    last_target_step_duration: float | None = None,
+) -> np.ndarray:
+    """Resample flow-rates on target times in a volume-conservative way.
+
+    Parameters
+    ----------
+    source_times : np.ndarray
+        1D int64 array of epoch-ns times of the flow-rates, sorted in ascending
+        order.
+    flow_rates : np.ndarray
+        1D or 2D float array of the flow-rates from each source time until the
+        next one in (X.s-1), with ``source_times.size`` rows. Each column of a
+        2D array is resampled as a distinct timeseries.
+    target_times : np.ndarray
+        1D int64 array of epoch-ns times at which the flow-rates are required,
+        sorted in ascending order.
+    last_step_duration : float, optional
+        Duration of the last source time-step in (s).
+        The default is |None| in which case the duration of the former-last
+        time-step is used.
+    last_target_step_duration : float, optional
+        Duration of the last target time-step in (s).
+        The default is |None| in which case the duration of the former-last
+        time-step is used.
+
+    Returns
+    -------
+    np.ndarray
+        The flow-rates from each target time until the next one, with as many
+        columns as ``flow_rates``. Flow-rates which cannot be determined because
+        of missing source values are NaN.
+
+    Raises
+    ------
+    EATEmptySourceError :
+        In case ``flow_rates`` is empty.
+    EATEmptyTargetsError :
+        In case ``target_times`` is empty.
+    EATInvalidTimestepDurationError :
+        In case ``last_step_duration <= 0`` or ``last_target_step_duration <= 0``.
+
+
+    .. seealso::
+
+        :py:func:`energy_analysis_toolbox.timeseries.resample.flow_rate_conservative`
+        for the algorithm.
+
+    """
+    if flow_rates.shape[0] == 0:
+        err = (
+            "Resampling an empty flow-rates series to new instants is an invalid "
+            "(undefined) operation."
+        )
+        raise EATEmptySourceError(err)
+    if target_times.size == 0:
+        err = "Target instants must be provided for the series to be resampled."
+        raise EATEmptyTargetsError(err)
+    durations = timesteps(source_times, last_step_duration)  # [1.]
+    if flow_rates.ndim > 1:
+        durations = durations[:, np.newaxis]
+    interp_volumes = volume_conservative(
+        source_times,
+        flow_rates * durations,  # [2.]
+        target_times,
+        last_step_duration=last_step_duration,
+        last_target_step_duration=last_target_step_duration,
+    )  # [3.]
+    target_durations = timesteps(target_times, last_target_step_duration)
+    if flow_rates.ndim > 1:
+        target_durations = target_durations[:, np.newaxis]
+    return interp_volumes / target_durations  # [4.]
@@ -0,0 +1,179 @@
+"""Interpolate values given at epoch-ns times on other times."""
+
+import numpy as np
+
+
+def _output(
+    out: np.ndarray | None,
+    n_targets: int,
+    values: np.ndarray,
+    dtype: np.dtype,
+) -> np.ndarray:
+    """Return the array in which the interpolated values are written."""
+    shape = (n_targets, *values.shape[1:])
+    if out is None:
+        return np.empty(shape, dtype=dtype)
+    if out.shape != shape:
+        err = f"out should have shape {shape}. Received {out.shape}."
+        raise ValueError(err)
+    return out
+
+
+def grid_positions(
+    source_times: np.ndarray,
+    start: int,
+    step: int,
+    size: int,
+) -> np.ndarray:
+    """Return the positions of the instants of a regular grid in source times.
+
+    This is equivalent to ``np.searchsorted(source_times, grid, side="right") - 1``
+    with ``grid = start + step * np.arange(size)``, but the grid instants are
+    not searched: the source times are counted in the grid steps they belong to.
+
+    Parameters
+    ----------
+    source_times : np.ndarray
+        1D int64 array of epoch-ns times, sorted in ascending order.
+    start : int
+        The first instant of the grid, in epoch-ns.
+    step : int
+        The (positive) duration between two grid instants, in ns.
+    size : int
+        The number of instants in the grid.
+
+    Returns
+    -------
+    np.ndarray
+        For each grid instant, the position of the last source time lower or
+        equal to it, -1 if there is none.
+
+    """
+    # each source time is lower or equal to the grid instants from this one on
+    first_instants = -((start - source_times) // step)
+    np.clip(first_instants, 0, size, out=first_instants)
+    counts = np.bincount(first_instants, minlength=size + 1)[:size]
+    return np.cumsum(counts) - 1
+
+
+def piecewise_affine_kernel(
+    target_times: np.ndarray,
+    source_times: np.ndarray,
+    values: np.ndarray,
+    out: np.ndarray | None = None,
+    positions: np.ndarray | None = None,
+) -> np.ndarray:
+    """Interpolate values as piecewise affine functions of int64 times.
+
+    Parameters
+    ----------
+    target_times : np.ndarray
+        1D int64 array of epoch-ns times at which the values are required.
+        They need not be sorted, but the searches are faster when they are.
+    source_times : np.ndarray
+        1D int64 array of epoch-ns times of the samples, sorted in ascending
+        order.
+    values : np.ndarray
+        1D or 2D array of values with ``source_times.size`` rows. Each column
+        of a 2D array is interpolated as a distinct function.
+    out : np.ndarray, optional
+        A float array with ``target_times.size`` rows and as many columns as
+        ``values`` in which the result is written. The default is |None|,
+        meaning that a new array is returned.
+    positions : np.ndarray, optional
+        For each target time, the position of the last source time lower or
+        equal to it (-1 if none), when already known e.g. from
+        :py:func:`grid_positions`. The default is |None|, meaning that they are
+        searched in ``source_times``.
+
+    Returns
+    -------
+    np.ndarray
+        The interpolated values (``out`` if provided). Target times outside the
+        convex span of ``source_times`` are assigned the border values.
+
+    Notes
+    -----
+    The time differences are computed exactly as integers, and only their
+    ratios are computed as floats, so that no precision is lost for
+    ns-resolution timestamps over long time spans. Unless ``positions`` is
+    provided, the positions of the target times in the source times are
+    found by :py:func:`numpy.searchsorted`, with one binary search per target
+    time.
+
+    """
+    out = _output(out, target_times.size, values, np.float64)
+    if source_times.size == 1:
+        out[...] = values[0]
+        return out
+    if positions is None:
+        positions = np.searchsorted(source_times, target_times, side="right") - 1
+    positions = np.clip(positions, 0, source_times.size - 2)
+    lower_times = source_times[positions]
+    spans = source_times[positions + 1] - lower_times
+    weights = np.divide(
+        target_times - lower_times,
+        spans,
+        out=np.ones(target_times.size),
+        where=spans != 0,
+    )
+    np.clip(weights, 0.0, 1.0, out=weights)
+    if values.ndim > 1:
+        weights = weights[:, np.newaxis]
+    lower = values[positions]
+    upper = values[positions + 1]
+    np.subtract(upper, lower, out=out)
+    out *= weights
+    out += lower
+    # as np.interp, the values at the source times do not depend on the
+    # neighbour samples, which may be nan
+    np.copyto(out, lower, where=weights == 0)
+    np.copyto(out, upper, where=weights == 1)
+    return out
+
+
+def piecewise_constant_kernel(
+    target_times: np.ndarray,
+    source_times: np.ndarray,
+    values: np.ndarray,
+    left_pad: float | None = None,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """Interpolate values as piecewise constant functions of int64 times.
+
+    Each target time is assigned the value of the last source time which is
+    lower or equal to it.
+
+    Parameters
+    ----------
+    target_times : np.ndarray
+        1D int64 array of epoch-ns times at which the values are required,
+        sorted in ascending order.
+    source_times : np.ndarray
+        1D int64 array of epoch-ns times of the samples, sorted in ascending
+        order.
+    values : np.ndarray
+        1D or 2D array of values with ``source_times.size`` rows. Each column
+        of a 2D array is interpolated as a distinct function.
+    left_pad : float or None, optional
+        A value to be used for target times which are located before the
+        first source time. The default is |None| in which case, the first
+        values are used.
+    out : np.ndarray, optional
+        An array with the dtype of ``values``, ``target_times.size`` rows and
+        as many columns as ``values`` in which the result is written. The
+        default is |None|, meaning that a new array is returned.
+
+    Returns
+    -------
+    np.ndarray
+        The interpolated values (``out`` if provided).
+
+    """
+    out = _output(out, target_times.size, values, values.dtype)
+    positions = np.searchsorted(source_times, target_times, side="right") - 1
+    n_before = np.searchsorted(positions, 0)
+    np.take(values, np.maximum(positions, 0), axis=0, out=out)
+    if left_pad is not None:
+        out[:n_before] = left_pad
+    return out
@@ -1,2 +1,4 @@
 """Functions that process energy data."""
+
+from .cumulative import CumulativeEnergyIndex
 from .resample import to_freq
@@ -0,0 +1,355 @@
+"""Answer repeated queries of energy consumed between two instants.
+
+The :py:class:`CumulativeEnergyIndex` is built once from a timeseries of energy
+(or power) and stores the cumulated energy at each instant of the series. The
+energy consumed between any two instants is then the difference of the cumulated
+energy interpolated at these instants, which is answered in O(log n) per query.
+
+The conventions are the ones of |volume_conservative| : the energy of a sample
+is consumed with a constant power until the next sample, and the energy of the
+last sample until ``last_step_duration`` after it.
+
+Example
+-------
+>>> index = CumulativeEnergyIndex(energy_series)
+>>> index.integrate(
+...     pd.Timestamp("2024-01-01 08:00"),
+...     pd.Timestamp("2024-01-01 08:20"),
+... )
+array([1234.5])
+>>> index.integrate_over(intervals)  # table with start and end columns
+>>> index.append(new_energy_series)  # extend it as new data arrives
+
+"""
+
+import numpy as np
+import pandas as pd
+
+from energy_analysis_toolbox.core.basics import timesteps
+from energy_analysis_toolbox.core.interpolate import piecewise_affine_kernel
+from energy_analysis_toolbox.errors import (
+    EATEmptySourceError,
+    EATInvalidTimeseriesError,
+    EATInvalidTimestepDurationError,
+    EATUndefinedTimestepError,
+)
+
+
+class CumulativeEnergyIndex:
+    """The cumulated energy of a timeseries, for fast range integral queries.
+
+    The index holds two arrays of the same size :
+
+    - :py:attr:`timestamps` : the instants of the samples as int64 nanoseconds
+      since epoch (UTC), followed by the end of the last sample;
+    - :py:attr:`cumulated` : the total energy consumed before each of these
+      instants, as float64.
+
+    The cumulated energy is interpolated linearly between two instants. It is 0
+    before the first one and equal to the total energy after the last one.
+
+    .. seealso::
+
+        * :py:func:`.volume_conservative` which uses the same conventions to
+          resample energy timeseries.
+        * :py:func:`energy_analysis_toolbox.power.integrate_over` which
+          integrates power over slices of a series (without partial steps).
+
+    """
+
+    def __init__(
+        self,
+        series: "pd.Series[float]",
+        last_step_duration: float | None = None,
+        *,
+        power: bool = False,
+    ) -> None:
+        """Initialize a CumulativeEnergyIndex instance.
+
+        Parameters
+        ----------
+        series : pd.Series
+            Timeseries of energy in (J), or of any extensive variable, with a
+            sorted DatetimeIndex. The value at an instant is the energy consumed
+            until the next instant. Missing values are managed as in
+            |volume_conservative| : the cumulated energy is undefined at the
+            end of a missing sample.
+        last_step_duration : float, optional
+            Duration of the last time-step in the series in (s).
+            The default is |None| in which case the duration of the former-last
+            time-step is used.
+        power : bool, default False
+            If ``True``, ``series`` is a timeseries of power in (W), the value
+            at an instant being the average power until the next instant. The
+            values passed to :py:meth:`append` are then power values as well.
+
+        Raises
+        ------
+        EATEmptySourceError :
+            In case ``series`` is empty.
+        EATInvalidTimeseriesError :
+            In case the index of the series is not sorted or contains duplicates.
+        EATUndefinedTimestepError :
+            In case ``series`` contains only one element and
+            ``last_step_duration`` is |None|.
+        EATInvalidTimestepDurationError :
+            In case ``last_step_duration <= 0``.
+
+        """
+        if series.empty:
+            err = "A cumulative energy index cannot be built from an empty series."
+            raise EATEmptySourceError(err)
+        self.tz = series.index.tz
+        self.power = power
+        self._times = np.empty(0, dtype=np.int64)
+        self._values = np.empty(0, dtype=np.float64)
+        self._size = 0
+        # total energy, missing values skipped, with and without the last sample
+        self._running_sum = 0.0
+        self._running_sum_before_last = 0.0
+        self._last_rate = np.nan  # power of the last sample if power is True
+        times, values = self._check_samples(series)
+        self._extend(times, values, last_step_duration)
+
+    def __len__(self) -> int:
+        """Return the number of instants in the index, including the last end."""
+        return self._size
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """The instants of the index as int64 nanoseconds since epoch (UTC)."""
+        return self._times[: self._size]
+
+    @property
+    def cumulated(self) -> np.ndarray:
+        """The cumulated energy at each instant of :py:attr:`timestamps`."""
+        return self._values[: self._size]
+
+    @property
+    def start(self) -> pd.Timestamp:
+        """The first instant of the index."""
+        return pd.Timestamp(self._times[0], tz="UTC").tz_convert(self.tz)
+
+    @property
+    def end(self) -> pd.Timestamp:
+        """The end of the last sample of the index."""
+        return pd.Timestamp(self._times[self._size - 1], tz="UTC").tz_convert(self.tz)
+
+    @property
+    def total(self) -> float:
+        """The total energy in the index."""
+        return self._values[self._size - 1]
+
+    def cumulated_at(self, instants: pd.DatetimeIndex | pd.Timestamp) -> np.ndarray:
+        """Return the energy consumed before each of the instants.
+
+        Parameters
+        ----------
+        instants : pd.DatetimeIndex or pd.Timestamp or array-like
+            The instants at which the cumulated energy is required. Time-naive
+            values are assumed to be in the timezone of the index.
+
+        Returns
+        -------
+        np.ndarray
+            The cumulated energy at each instant, linearly interpolated between
+            the instants of the index.
+
+        """
+        # the cumulated energy is 0 at the first instant and the total at the
+        # last one, which are the border values of the kernel
+        return piecewise_affine_kernel(
+            self._as_int64(instants),
+            self.timestamps,
+            self.cumulated,
+        )
+
+    def integrate(
+        self,
+        starts: pd.DatetimeIndex | pd.Timestamp,
+        ends: pd.DatetimeIndex | pd.Timestamp,
+    ) -> np.ndarray:
+        """Return the energy consumed between each couple of instants.
+
+        Parameters
+        ----------
+        starts : pd.DatetimeIndex or pd.Timestamp or array-like
+            The beginnings of the ranges.
+        ends : pd.DatetimeIndex or pd.Timestamp or array-like
+            The ends of the ranges, with the same size as ``starts``.
+
+        Returns
+        -------
+        np.ndarray
+            The energy consumed in each range ``[start, end[``, including the
+            relevant part of the samples which partially overlap the range.
+
+        """
+        return self.cumulated_at(ends) - self.cumulated_at(starts)
+
+    def integrate_over(self, intervals: pd.DataFrame) -> "pd.Series[float]":
+        """Return the energy consumed on each interval of a table.
+
+        Parameters
+        ----------
+        intervals : pd.DataFrame
+            A table of intervals defined with 'start' and 'end' columns
+            containing timestamps.
+
+        Returns
+        -------
+        pd.Series
+            The energy consumed on each interval, with the same index as
+            ``intervals``.
+
+        """
+        return pd.Series(
+            self.integrate(intervals["start"], intervals["end"]),
+            index=intervals.index,
+            dtype=np.float64,
+        )
+
+    def append(
+        self,
+        series: "pd.Series[float]",
+        last_step_duration: float | None = None,
+    ) -> None:
+        """Extend the index with the next samples of the timeseries.
+
+        The former last sample now ends at the first new instant, and the new
+        last sample ends ``last_step_duration`` after it.
+
+        Parameters
+        ----------
+        series : pd.Series
+            The next samples of energy, or of power if the index was created
+            with ``power=True``. They must be located after the last
+            sample of the index.
+        last_step_duration : float, optional
+            Duration of the new last time-step in (s).
+            The default is |None| in which case the duration of the former-last
+            time-step is used.
+
+        Raises
+        ------
+        EATInvalidTimeseriesError :
+            In case the new samples are not sorted or are not located after the
+            last sample of the index.
+
+        """
+        if series.empty:
+            return
+        times, values = self._check_samples(series)
+        last_sample = self._times[self._size - 2]
+        if times[0] <= last_sample:
+            err = (
+                "The appended samples must be located after the last sample of "
+                "the index."
+            )
+            raise EATInvalidTimeseriesError(err)
+        self._size -= 1  # the end of the former last sample is replaced
+        self._extend(times, values, last_step_duration, previous=last_sample)
+
+    def _check_samples(
+        self,
+        series: "pd.Series[float]",
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Return the instants as int64 and the values of a series of samples."""
+        index = series.index
+        if not index.is_monotonic_increasing or not index.is_unique:
+            err = "The index of the series must be sorted without duplicates."
+            raise EATInvalidTimeseriesError(err)
+        return self._as_int64(index), series.to_numpy(dtype=np.float64)
+
+    def _as_int64(self, instants: pd.DatetimeIndex | pd.Timestamp) -> np.ndarray:
+        """Return instants as int64 nanoseconds since epoch (UTC)."""
+        instants = pd.Index(np.atleast_1d(instants))
+        if not isinstance(instants, pd.DatetimeIndex):  # e.g. mixed timezones
+            instants = pd.DatetimeIndex(pd.to_datetime(instants, utc=True))
+        if instants.tz is None and self.tz is not None:
+            instants = instants.tz_localize(self.tz)
+        elif instants.tz is not None and self.tz is None:
+            instants = instants.tz_localize(None)
+        return instants.as_unit("ns").asi8
+
+    def _end_of_last(
+        self,
+        times: np.ndarray,
+        previous: int | None,
+        last_step_duration: float | None,
+    ) -> tuple[int, float]:
+        """Return the end of the last sample and its duration in (s)."""
+        if last_step_duration is not None:
+            if last_step_duration <= 0:
+                err = "Last step duration cannot be zero."
+                raise EATInvalidTimestepDurationError(err)
+            step = round(last_step_duration * 1e9)
+        elif times.size > 1:
+            step = times[-1] - times[-2]
+        elif previous is not None:
+            step = times[-1] - previous
+        else:
+            err = (
+                "The duration of the last step cannot be inferred from a single "
+                "sample when last_step_duration is None."
+            )
+            raise EATUndefinedTimestepError(err)
+        return times[-1] + step, step / 1e9
+
+    def _extend(
+        self,
+        times: np.ndarray,
+        values: np.ndarray,
+        last_step_duration: float | None,
+        previous: int | None = None,
+    ) -> None:
+        """Append samples after the former last one, which end has been removed.
+
+        Parameters
+        ----------
+        times : np.ndarray
+            The instants of the new samples as int64.
+        values : np.ndarray
+            The energy, or power, of the new samples.
+        last_step_duration : float, optional
+            Duration of the new last time-step in (s).
+        previous : int, optional
+            The instant of the former last sample, |None| if the index is empty.
+
+        """
+        end, last_duration = self._end_of_last(times, previous, last_step_duration)
+        if not self.power:
+            energies = values
+            base = self._running_sum
+            # cumulated energy at the first new instant: 0 or the former total
+            head = [0.0] if previous is None else [self._values[self._size]]
+        else:
+            durations = timesteps(times, last_duration)
+            energies = values * durations
+            base = self._running_sum
+            head = [0.0]
+            if previous is not None:
+                # the energy of the former last sample lasts until the first new
+                # instant
+                first_energy = self._last_rate * (times[0] - previous) / 1e9
+                energies = np.r_[first_energy, energies]
+                base = self._running_sum_before_last
+                head = []
+            self._last_rate = values[-1]
+        missing = np.isnan(energies)
+        cumulated = np.cumsum(np.r_[base, np.where(missing, 0.0, energies)])
+        self._running_sum_before_last = cumulated[-2]
+        self._running_sum = cumulated[-1]
+        cumulated[1:][missing] = np.nan
+        self._push(np.r_[times, end], np.r_[head, cumulated[1:]])
+
+    def _push(self, times: np.ndarray, values: np.ndarray) -> None:
+        """Write arrays at the end of the buffers, which grow geometrically."""
+        size = self._size + times.size
+        if size > self._times.size:
+            capacity = max(size, 2 * self._times.size)
+            self._times = np.resize(self._times, capacity)
+            self._values = np.resize(self._values, capacity)
+        self._times[self._size : size] = times
+        self._values[self._size : size] = values
+        self._size = size
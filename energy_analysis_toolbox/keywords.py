@@ -37,6 +37,10 @@ start_f = "start"
 end_f = "end"
 #: The name of the time-index in timeseries data.
 time_f = "timestamp"
+#: The name of the field identifying a meter in long-format tables of timeseries.
+meter_id_f = "meter_id"
+#: The name of the field containing the values in long-format tables of timeseries.
+value_f = "value"
 #: The name of the field containing the heating degree-days.
 heating_dd_f = "heating_degree_days"
 #: The name of the field containing the cooling degree-days.
@@ -31,6 +31,14 @@ pandas.Series with name `eat`. Operations such as the following becom possible::
 
 More examples in :doc:`/user_guide/using_the_accessor`.
 
+DataFrame
+---------
+A pandas dataframe is considered as a table of timeseries, e.g. one per meter. The
+table can either be "wide" (one column per timeseries, sharing the same datetime index)
+or "long" (one row per meter and timestamp, see
+:py:mod:`energy_analysis_toolbox.timeseries.resample.batch`). The conservative
+resampling of all the timeseries in the table is performed at once.
+
 Examples of use
 ~~~~~~~~~~~~~~~
 
@@ -38,7 +46,7 @@ If the accessor has been enabled, it becomes available on any pandas.DataFrame w
 name `eat`. Operations such as the following becom possible::
 
     power_data.eat.power_to_freq('1h')
-    power_data.eat.power_to_energy()
+    energy_data.eat.to_freq('1h', method='volume_conservative')
 
 
 More examples in :doc:`/user_guide/using_the_accessor`.
@@ -289,11 +297,96 @@ class EATAccessorSeries:
 
 @pd.api.extensions.register_dataframe_accessor("eat")
 class EATAccessorDataFrame:
-    """Define a new namespace for the computation toolbox on pandas.Series."""
+    """Define a new namespace for the computation toolbox on pandas.DataFrame.
+
+    The dataframe is considered as a table of timeseries, either in a wide layout
+    (one timeseries per column on a shared DatetimeIndex) or in a long layout.
+    See :py:mod:`energy_analysis_toolbox.timeseries.resample.batch` for details.
+    """
 
     def __init__(
         self,
-        data: pd.DataFrame,  # noqa:ARG002
+        data: pd.DataFrame,
     ) -> None:
-        err = """EAT accessor for DataFrame is not implemented yet."""
-        raise NotImplementedError(err)
+        if not isinstance(data, pd.DataFrame):
+            err = f"Expected the input to be a DataFrame, but got {type(data)}."
+            raise TypeError(err)
+        self._obj = data
+
+    def power_to_freq(
+        self,
+        freq: str | pd.Timedelta,
+        origin: Literal["floor", "ceil"] | pd.Timestamp | None = None,
+        last_step_duration: float | None = None,
+    ) -> pd.DataFrame:
+        """Resample a table of power timeseries to a fixed frequency.
+
+        See :func:`energy_analysis_toolbox.timeseries.resample.flow_rate_to_freq_batch`
+        for details.
+
+        Returns
+        -------
+        pd.DataFrame
+            The power timeseries resampled to a fixed frequency.
+
+        """
+        return timeseries.resample.flow_rate_to_freq_batch(
+            self._obj,
+            freq,
+            origin=origin,
+            last_step_duration=last_step_duration,
+        )
+
+    def energy_to_freq(
+        self,
+        freq: str | pd.Timedelta,
+        origin: Literal["floor", "ceil"] | pd.Timestamp | None = None,
+        last_step_duration: float | None = None,
+    ) -> pd.DataFrame:
+        """Resample a table of energy timeseries to a fixed frequency.
+
+        See :func:`energy_analysis_toolbox.timeseries.resample.volume_to_freq_batch`
+        for details.
+
+        Returns
+        -------
+        pd.DataFrame
+            The energy timeseries resampled to a fixed frequency.
+
+        """
+        return timeseries.resample.volume_to_freq_batch(
+            self._obj,
+            freq,
+            origin=origin,
+            last_step_duration=last_step_duration,
+        )
+
+    def to_freq(
+        self,
+        freq: str | pd.Timedelta | None,
+        origin: Literal["floor", "ceil"] | pd.Timestamp | None = None,
+        last_step_duration: float | None = None,
+        method: resampling_methods = "piecewise_affine",
+        **kwargs,
+    ) -> pd.DataFrame:
+        """Resample a table of timeseries to a fixed frequency with various strategies.
+
+        See :func:`energy_analysis_toolbox.timeseries.resample.to_freq` for details
+        and :py:meth:`EATAccessorSeries.to_freq` for the description of the
+        parameters.
+
+        Returns
+        -------
+        pd.DataFrame
+            The table of timeseries resampled to a fixed frequency, in the same
+            layout as the original one.
+
+        """
+        return timeseries.resample.to_freq(
+            timeseries=self._obj,
+            freq=freq,
+            origin=origin,
+            last_step_duration=last_step_duration,
+            method=method,
+            **kwargs,
+        )
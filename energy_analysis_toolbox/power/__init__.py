@@ -1,7 +1,9 @@
 """Functions that process power data."""
 from . import overconsumption
 from .basics import (
+    cumulated_sums,
     integrate_over,
+    sum_over,
     to_energy,
 )
 from .resample import to_freq
@@ -1,5 +1,8 @@
 """Applies elementary operations on power timeseries."""
 
+from typing import Literal
+
+import numpy as np
 import pandas as pd
 
 from energy_analysis_toolbox.timeseries.extract_features import timestep_durations
@@ -41,6 +44,12 @@ def integrate_over(
         and then using the |volume_conservative| resampling.
 
 
+    .. seealso::
+
+        :py:func:`sum_over` which is used to sum the energy per timestep
+        on all the intervals at once.
+
+
     Examples
     --------
     >>> power = _constant_power(); power
@@ -71,15 +80,7 @@ def integrate_over(
 
 
     """
-    timesteps = timestep_durations(power_series)
-
-    def integrate(row: pd.Series) -> float:
-        """Integrate on a slice with excluded end."""
-        i_start = timesteps.index.get_slice_bound(row["start"], side="left")
-        i_end = timesteps.index.get_slice_bound(row["end"], side="left")
-        return (timesteps.iloc[i_start:i_end] * power_series.iloc[i_start:i_end]).sum()
-
-    return intervals.apply(integrate, axis=1)
+    return sum_over(intervals, to_energy(power_series))
 
 
 def to_energy(
@@ -104,3 +105,95 @@ def to_energy(
     """
     timesteps = timestep_durations(power_series)
     return timesteps * power_series
+
+
+def cumulated_sums(values: np.ndarray) -> np.ndarray:
+    """Return the cumulated sums of an array along its first axis, starting with 0.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        A 1D or 2D array of values. Missing values are ignored (counted as 0).
+
+    Returns
+    -------
+    np.ndarray
+        An array with one more element than ``values`` along the first axis,
+        such that ``cumulated[j] - cumulated[i]`` is the sum of
+        ``values[i:j]``.
+
+    """
+    values = np.asarray(values, dtype=np.float64)
+    cumulated = np.zeros((values.shape[0] + 1, *values.shape[1:]))
+    np.cumsum(np.nan_to_num(values, nan=0.0), axis=0, out=cumulated[1:])
+    return cumulated
+
+
+def sum_over(
+    intervals: pd.DataFrame,
+    series: pd.Series,
+    inclusive: Literal["both", "neither", "left", "right"] = "left",
+    cumulated: np.ndarray | None = None,
+) -> pd.Series:
+    """Return the sums of the values of a series on each interval of a table.
+
+    Parameters
+    ----------
+    intervals : pd.DataFrame
+        A table of intervals defined with 'start' and 'end' columns containing
+        timestamps. These timestamps are used as slice bounds in the series.
+    series : pd.Series
+        A timeseries of values to be summed, e.g. energy per timestep, with a
+        sorted DatetimeIndex. Missing values are ignored.
+    inclusive : {"both", "neither", "left", "right"}, optional
+        Which bounds of the intervals are included in the sums. The default is
+        ``"left"``, i.e. the intervals are ``[start, end[``.
+    cumulated : np.ndarray, optional
+        The cumulated sums of the values of the series as returned by
+        :py:func:`cumulated_sums`. The default is |None| in which case they
+        are computed. Passing them avoids computing them again when the same
+        series is summed over several tables.
+
+    Returns
+    -------
+    pd.Series
+        The sums on each interval, with the same index as ``intervals``.
+
+    Notes
+    -----
+    The values are cumulated once, and all the interval bounds are located in
+    the index of the series at once using :py:meth:`pandas.Index.searchsorted`.
+    The sum on each interval is then the difference of the cumulated values
+    between its bounds, so that the cost is linear in the number of values and
+    intervals.
+
+    """
+    if cumulated is None:
+        cumulated = cumulated_sums(series.to_numpy(dtype=np.float64))
+    side_start = "left" if inclusive in ("both", "left") else "right"
+    side_end = "right" if inclusive in ("both", "right") else "left"
+    i_start = series.index.searchsorted(
+        _as_index_bounds(intervals["start"], series.index),
+        side=side_start,
+    )
+    i_end = series.index.searchsorted(
+        _as_index_bounds(intervals["end"], series.index),
+        side=side_end,
+    )
+    i_end = np.maximum(i_start, i_end)  # empty slices
+    return pd.Series(
+        cumulated[i_end] - cumulated[i_start],
+        index=intervals.index,
+        dtype=np.float64,
+    )
+
+
+def _as_index_bounds(
+    bounds: pd.Series,
+    index: pd.DatetimeIndex,
+) -> pd.DatetimeIndex:
+    """Return interval bounds comparable with the timestamps of the index."""
+    bounds = pd.DatetimeIndex(pd.to_datetime(bounds, utc=index.tz is not None))
+    if index.tz is not None:
+        bounds = bounds.tz_convert(index.tz)
+    return bounds
@@ -1,9 +1,14 @@
 """Finds the overconsumption from a power series and a threshold."""
 
+import numpy as np
 import pandas as pd
 
+from energy_analysis_toolbox import keywords as eatk
 from energy_analysis_toolbox.power import basics as power
-from energy_analysis_toolbox.timeseries.extract_features import intervals_over
+from energy_analysis_toolbox.timeseries.extract_features import (
+    intervals_over,
+    timestep_durations,
+)
 
 
 def from_power_threshold(
@@ -94,3 +99,124 @@ def from_power_threshold(
             intervals_overshoot, power_series - reference_energy_tshd_aligned,
         )
     return intervals_overshoot
+
+
+def from_power_threshold_batch(
+    power_table: pd.DataFrame,
+    overshoot_tshd: pd.DataFrame | pd.Series | float,
+    reference_energy_tshd: pd.DataFrame | pd.Series | float | None = None,
+    meter_f: str = eatk.meter_id_f,
+) -> pd.DataFrame:
+    """Return a table of overconsumption for each column of a table of power.
+
+    This function is the batched version of :py:func:`from_power_threshold` for
+    several timeseries sharing the same index, e.g. the power of a portfolio of
+    sites. All the timeseries are processed at once using array operations.
+
+    Parameters
+    ----------
+    power_table : pd.DataFrame
+        A table of power timeseries in (W), with one column per site and a
+        DatetimeIndex shared by all the sites. See :py:func:`from_power_threshold`.
+    overshoot_tshd : pd.DataFrame or pd.Series or float
+        The threshold in (W) over which the power is considered as
+        over-consumption. It is broadcast to ``power_table`` as follows:
+
+        - a table is aligned on the index and columns of ``power_table``,
+        - a series with a DatetimeIndex is a threshold shared by all the sites,
+          aligned on the index of ``power_table``,
+        - any other series is a constant threshold per site, aligned on the
+          columns of ``power_table``,
+        - a float is the same constant threshold for all the sites.
+
+    reference_energy_tshd : pd.DataFrame or pd.Series or float or None
+        A power in (W) to be subtracted from the power in order to compute
+        an "overshoot energy" for each interval. It is broadcast as
+        ``overshoot_tshd``. The default is |None| in which case
+        ``overshoot_tshd`` is used.
+    meter_f : str, default |eatk.meter_id_f|
+        Name of the column of the returned table which identifies the sites.
+
+    Returns
+    -------
+    pd.DataFrame :
+        A long table of overconsumption with a ``meter_f`` column containing
+        the label of the site, followed by the columns returned by
+        :py:func:`from_power_threshold`. The rows are sorted by site, in the
+        order of the columns of ``power_table``, and by time.
+
+
+    .. seealso::
+
+        :py:func:`from_power_threshold` which processes a single power series.
+
+    Notes
+    -----
+    The intervals are found and integrated as follows :
+
+    - The thresholds are broadcast to a 2D array with the same shape as the
+      power. [1.]
+    - The starts (resp. ends) of the intervals are the positions where the
+      power goes over (resp. back under) the threshold. As in
+      :py:func:`.intervals_over`, an interval which is still open at the end of
+      the table is closed on the last instant. [2.]
+    - The energy of the difference between the power and the reference is
+      cumulated along time for each site, so that the energy of each interval
+      is the difference of the cumulated energy between its bounds. [3.]
+
+    Missing values are not considered as overconsumption, and are ignored in the
+    energy computation.
+
+    """
+    if reference_energy_tshd is None:
+        reference_energy_tshd = overshoot_tshd
+    values = power_table.to_numpy(dtype=np.float64)
+    n_times, n_sites = values.shape
+    min_interval_instants = 2  # an interval needs a start and an end
+    if n_times < min_interval_instants or n_sites == 0:
+        return pd.DataFrame([], columns=[meter_f, "start", "end", "duration", "energy"])
+    # 1.
+    over = values > _broadcast_threshold(overshoot_tshd, power_table)
+    # 2. positions of the bounds as (site, instant) couples, sorted by site
+    starts = np.zeros_like(over)
+    starts[0] = over[0]
+    starts[1:-1] = over[1:-1] & ~over[:-2]
+    ends = np.zeros_like(over)
+    ends[1:-1] = over[:-2] & ~over[1:-1]
+    ends[-1] = over[-2]
+    sites, i_starts = np.nonzero(starts.T)
+    _, i_ends = np.nonzero(ends.T)
+    # 3.
+    timesteps = timestep_durations(power_table.iloc[:, 0]).to_numpy()
+    references = _broadcast_threshold(reference_energy_tshd, power_table)
+    cumulated = power.cumulated_sums(timesteps[:, np.newaxis] * (values - references))
+    intervals = pd.DataFrame(
+        {
+            meter_f: power_table.columns.take(sites),
+            "start": power_table.index.take(i_starts),
+            "end": power_table.index.take(i_ends),
+        },
+    )
+    intervals["duration"] = (intervals["end"] - intervals["start"]).dt.total_seconds()
+    intervals["energy"] = cumulated[i_ends, sites] - cumulated[i_starts, sites]
+    return intervals
+
+
+def _broadcast_threshold(
+    threshold: pd.DataFrame | pd.Series | float,
+    power_table: pd.DataFrame,
+) -> np.ndarray:
+    """Return the threshold as an array broadcastable to the values of the table."""
+    if isinstance(threshold, pd.DataFrame):
+        threshold = threshold.reindex(
+            index=power_table.index,
+            columns=power_table.columns,
+        )
+        return threshold.to_numpy(dtype=np.float64)
+    if isinstance(threshold, pd.Series):
+        if isinstance(threshold.index, pd.DatetimeIndex):
+            threshold = threshold.reindex(power_table.index)
+            return threshold.to_numpy(dtype=np.float64)[:, np.newaxis]
+        threshold = threshold.reindex(power_table.columns)
+        return threshold.to_numpy(dtype=np.float64)[np.newaxis, :]
+    return np.float64(threshold)
@@ -8,6 +8,7 @@ their duration and energy contributions.
 
 import pandas as pd
 
+from energy_analysis_toolbox.power.basics import sum_over
 from energy_analysis_toolbox.timeseries.create.from_intervals import flatten_and_fill
 from energy_analysis_toolbox.timeseries.extract_features import (
     intervals_over,
@@ -88,9 +89,10 @@ def merge_by_proximity(
     intervals = intervals_over(flat_intervals["energy"], 0.0)
     # 5
     intervals["duration"] = (intervals["end"] - intervals["start"]).dt.total_seconds()
-    # 5 inclusive loc but energy filled with 0 between the overshoots.
-    intervals["energy"] = intervals.apply(
-        lambda x: (flat_intervals.loc[x["start"] : x["end"], "energy"].sum()),
-        axis=1,
+    # 5 inclusive bounds but energy filled with 0 between the overshoots.
+    intervals["energy"] = sum_over(
+        intervals,
+        flat_intervals["energy"],
+        inclusive="both",
     )
     return intervals
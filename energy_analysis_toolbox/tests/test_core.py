@@ -0,0 +1,109 @@
+"""Check the array kernels of the eat.core subpackage"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ..core import (
+    as_times,
+    as_values,
+    flow_rate_conservative,
+    timesteps,
+    volume_conservative,
+)
+from ..errors import EATEmptySourceError, EATUndefinedTimestepError
+from ..timeseries.resample import conservative
+
+
+@pytest.fixture
+def volumes():
+    """Create an irregular timeseries of volumes with missing values"""
+    rng = np.random.default_rng(8)
+    index = pd.Timestamp("2022-03-26", tz="Europe/Paris") + pd.to_timedelta(
+        np.cumsum(rng.integers(1, 120, size=2000)),
+        "s",
+    )
+    series = pd.Series(rng.random(index.size), index=index, name="volume")
+    series.iloc[[10, 800]] = np.nan
+    return series
+
+
+def test_as_times():
+    """Check the conversion of times to epoch-ns int64 arrays."""
+    index = pd.date_range("2022-06-15", periods=5, freq="1h", tz="Europe/Paris")
+    expected = index.as_unit("ns").asi8
+    np.testing.assert_array_equal(as_times(index), expected)
+    np.testing.assert_array_equal(as_times(index.tz_convert(None).to_numpy()), expected)
+    np.testing.assert_array_equal(
+        as_times(index.tz_convert(None).to_numpy().astype("M8[s]")),
+        expected,
+    )
+    assert as_times(expected) is expected
+    with pytest.raises(TypeError):
+        as_times(np.array([1.0, 2.0]))
+
+
+def test_arrow_zero_copy():
+    """Check that arrow arrays are used without copy."""
+    pa = pytest.importorskip("pyarrow")
+    index = pd.date_range("2022-06-15", periods=5, freq="1h")
+    times = pa.array(index.to_numpy())
+    values = pa.array(np.arange(5.0))
+    assert np.shares_memory(as_times(times), times.to_numpy())
+    assert np.shares_memory(as_values(values), values.to_numpy())
+    np.testing.assert_array_equal(as_times(times), index.asi8)
+
+
+def test_timesteps():
+    """Check the timesteps of epoch-ns times."""
+    times = np.array([0, 10**9, 3 * 10**9])
+    np.testing.assert_array_equal(timesteps(times), [1.0, 2.0, 2.0])
+    np.testing.assert_array_equal(timesteps(times, last_step=5), [1.0, 2.0, 5.0])
+    with pytest.raises(EATUndefinedTimestepError):
+        timesteps(times[:1])
+
+
+def test_volume_conservative_as_pandas(volumes):
+    """Check that the kernel gives the values of the pandas function."""
+    targets = pd.date_range("2022-03-26", "2022-03-28", freq="15min", tz="UTC")
+    expected = conservative.volume_conservative(volumes, targets)
+    new_values = volume_conservative(
+        as_times(volumes.index),
+        as_values(volumes),
+        as_times(targets),
+    )
+    assert new_values.size == targets.size
+    np.testing.assert_array_equal(new_values[~np.isnan(new_values)], expected.values)
+    with pytest.raises(EATEmptySourceError):
+        volume_conservative(np.array([], dtype=np.int64), np.array([]), targets.asi8)
+
+
+def test_flow_rate_conservative_as_pandas(volumes):
+    """Check that the kernel gives the values of the pandas function."""
+    flow_rates = volumes.fillna(0.5)
+    targets = pd.date_range("2022-03-26", "2022-03-28", freq="7min", tz="UTC")
+    expected = conservative.flow_rate_conservative(flow_rates, targets)
+    new_values = flow_rate_conservative(
+        as_times(flow_rates.index),
+        as_values(flow_rates),
+        as_times(targets),
+    )
+    np.testing.assert_array_equal(new_values, expected.values)
+    # missing values are dropped by the pandas function
+    assert conservative.flow_rate_conservative(volumes, targets).notna().all()
+
+
+@pytest.mark.parametrize("kernel", [volume_conservative, flow_rate_conservative])
+def test_conservative_columns(volumes, kernel):
+    """Check that each column of a 2D array is resampled as a 1D array."""
+    targets = as_times(
+        pd.date_range("2022-03-26", "2022-03-28", freq="15min", tz="UTC"),
+    )
+    values = np.column_stack([volumes, volumes.fillna(0.5), 2 * volumes])
+    new_values = kernel(as_times(volumes.index), values, targets)
+    assert new_values.shape == (targets.size, values.shape[1])
+    for column in range(values.shape[1]):
+        np.testing.assert_array_equal(
+            new_values[:, column],
+            kernel(as_times(volumes.index), values[:, column], targets),
+        )
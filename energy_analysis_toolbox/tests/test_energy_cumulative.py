@@ -0,0 +1,156 @@
+"""Tests for :py:mod:`energy_analysis_toolbox.energy.cumulative` module."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ..energy import CumulativeEnergyIndex
+from ..errors import (
+    EATEmptySourceError,
+    EATInvalidTimeseriesError,
+    EATInvalidTimestepDurationError,
+    EATUndefinedTimestepError,
+)
+from ..timeseries.resample.conservative import (
+    flow_rate_conservative,
+    volume_conservative,
+)
+
+
+def example_energy(size=80, tz=None, seed=0):
+    """Return a random energy timeseries with an irregular index."""
+    rng = np.random.default_rng(seed)
+    index = pd.Timestamp("2023-03-25 23:13:07", tz=tz) + pd.to_timedelta(
+        np.cumsum(rng.integers(1, 2000, size)),
+        unit="s",
+    )
+    return pd.Series(rng.random(size), index=index)
+
+
+def targets_around(series, freq="7min"):
+    """Return a regular grid of instants which overflows the series."""
+    return pd.date_range(
+        series.index[0] - pd.Timedelta("1h"),
+        series.index[-1] + pd.Timedelta("2h"),
+        freq=freq,
+    )
+
+
+@pytest.mark.parametrize("tz", [None, "Europe/Paris"])
+@pytest.mark.parametrize("last_step_duration", [None, 600.0])
+def test_integrate_same_as_volume_conservative(tz, last_step_duration):
+    """Check that range integrals are the ones of the conservative resampling."""
+    series = example_energy(tz=tz)
+    series.iloc[[3, 40]] = np.nan
+    targets = targets_around(series)
+    expected = volume_conservative(
+        series,
+        targets,
+        last_step_duration=last_step_duration,
+        last_target_step_duration=420.0,
+    )
+    index = CumulativeEnergyIndex(series, last_step_duration)
+    obtained = pd.Series(
+        index.integrate(targets, targets + pd.Timedelta("7min")),
+        index=targets,
+    ).dropna()
+    pd.testing.assert_index_equal(obtained.index, expected.index)
+    np.testing.assert_allclose(obtained.to_numpy(), expected.to_numpy())
+    assert index.total == pytest.approx(series.sum())
+    assert index.start == series.index[0]
+
+
+def test_integrate_power_same_as_flow_rate_conservative():
+    """Check that power is integrated as in the conservative resampling."""
+    series = example_energy(tz="UTC")
+    targets = targets_around(series)
+    expected = flow_rate_conservative(
+        series,
+        targets,
+        last_step_duration=300.0,
+        last_target_step_duration=420.0,
+    )
+    index = CumulativeEnergyIndex(series, 300.0, power=True)
+    obtained = index.integrate(targets, targets + pd.Timedelta("7min")) / 420.0
+    np.testing.assert_allclose(obtained, expected.to_numpy())
+    assert index.end == series.index[-1] + pd.Timedelta(seconds=300)
+
+
+@pytest.mark.parametrize("power", [False, True])
+def test_append_same_as_one_shot(power):
+    """Check that appending samples gives the index of the whole series."""
+    series = example_energy(size=50)
+    series.iloc[[10, 30]] = np.nan
+    expected = CumulativeEnergyIndex(series, 120.0, power=power)
+    index = CumulativeEnergyIndex(series.iloc[:1], 60.0, power=power)
+    for start, end in [(1, 2), (2, 17), (17, 18), (18, 50)]:
+        index.append(series.iloc[start:end], 120.0 if end == 50 else None)
+    index.append(series.iloc[:0])
+    assert len(index) == series.size + 1
+    np.testing.assert_array_equal(index.timestamps, expected.timestamps)
+    np.testing.assert_allclose(index.cumulated, expected.cumulated)
+
+
+def test_cumulated_at_bounds():
+    """Check the cumulated energy before, inside and after the index."""
+    series = pd.Series(
+        [1.0, 2.0, 3.0],
+        index=pd.date_range("2024-01-01", periods=3, freq="10min"),
+    )
+    index = CumulativeEnergyIndex(series)
+    instants = pd.DatetimeIndex(
+        [
+            "2023-12-31 23:00",
+            "2024-01-01 00:00",
+            "2024-01-01 00:05",
+            "2024-01-01 00:10",
+            "2024-01-01 00:30",
+            "2024-01-01 02:00",
+        ],
+    )
+    np.testing.assert_allclose(
+        index.cumulated_at(instants),
+        [0.0, 0.0, 0.5, 1.0, 6.0, 6.0],
+    )
+    assert index.cumulated_at(pd.Timestamp("2024-01-01 00:25"))[0] == 4.5
+
+
+def test_integrate_over_time_zones():
+    """Check intervals tables, with bounds in another time-zone."""
+    series = pd.Series(
+        [1.0, 2.0, 3.0],
+        index=pd.date_range("2024-01-01", periods=3, freq="1h", tz="Europe/Paris"),
+    )
+    index = CumulativeEnergyIndex(series)
+    intervals = pd.DataFrame(
+        {
+            "start": pd.to_datetime(["2023-12-31 23:00", "2024-01-01 00:30"], utc=True),
+            "end": pd.to_datetime(["2024-01-01 00:30", "2024-01-01 03:00"], utc=True),
+        },
+        index=["a", "b"],
+    )
+    expected = pd.Series([2.0, 4.0], index=["a", "b"])
+    pd.testing.assert_series_equal(index.integrate_over(intervals), expected)
+    intervals["start"] = intervals["start"].dt.tz_convert("Europe/Paris")
+    intervals["end"] = intervals["end"].dt.tz_localize(None) + pd.Timedelta("1h")
+    pd.testing.assert_series_equal(index.integrate_over(intervals), expected)
+
+
+def test_cumulative_energy_index_errors():
+    """Check that declared errors are raised."""
+    series = example_energy(size=10)
+    with pytest.raises(EATEmptySourceError):
+        CumulativeEnergyIndex(series.iloc[:0])
+    with pytest.raises(EATUndefinedTimestepError):
+        CumulativeEnergyIndex(series.iloc[:1])
+    with pytest.raises(EATInvalidTimestepDurationError):
+        CumulativeEnergyIndex(series, last_step_duration=0)
+    with pytest.raises(EATInvalidTimeseriesError):
+        CumulativeEnergyIndex(series.iloc[::-1])
+    index = CumulativeEnergyIndex(series.iloc[:5])
+    with pytest.raises(EATInvalidTimeseriesError):
+        index.append(series.iloc[4:])
+    with pytest.raises(EATInvalidTimeseriesError):
+        index.append(series.iloc[:4:-1])
+    index.append(series.iloc[5:])
+    assert len(index) == series.size + 1
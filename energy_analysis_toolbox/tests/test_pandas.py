@@ -107,10 +107,27 @@ def test_series_fill_missing_entries():
 
 # Test EATAccessorFrame
 def test_frame():
-    # Test the to_energy method of EATAccessorFrame
+    # Test that the accessor is available on DataFrames
     df = pd.DataFrame(
         {"value": [1, 2, 3], "duration": [1000, 2000, 3000]},
         index=pd.date_range("2022-01-01", periods=3, freq="D"),
     )
-    with pytest.raises(NotImplementedError):
-        df.eat
+    assert df.eat._obj is df
+
+
+def test_frame_energy_to_freq():
+    # Test the energy_to_freq method of EATAccessorFrame
+    from energy_analysis_toolbox.energy import to_freq
+
+    df = pd.DataFrame(
+        {"a": [1.0, 2, 3], "b": [4.0, 5, 6]},
+        index=pd.date_range("2022-01-01", periods=3, freq="D"),
+    )
+    ct_frame = df.eat.energy_to_freq("2D", last_step_duration=3600)
+    assert isinstance(ct_frame, pd.DataFrame)
+    for col in df.columns:
+        pd.testing.assert_series_equal(
+            ct_frame[col],
+            to_freq(df[col], "2D", last_step_duration=3600),
+            check_freq=False,
+        )
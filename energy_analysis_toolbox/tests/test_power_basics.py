@@ -3,7 +3,7 @@ import pandas as pd
 import pytest
 
 from ..errors import EATUndefinedTimestepError
-from ..power import integrate_over, to_energy
+from ..power import cumulated_sums, integrate_over, sum_over, to_energy
 
 
 def _constant_power():
@@ -91,3 +91,62 @@ def test_integrate_over_not_in_index():
         integrate_over(intervals, _constant_power()),
         expected,
     )
+
+
+def test_integrate_over_same_as_slices():
+    """Check the integration against the sums on slices of the series."""
+    rng = np.random.default_rng(4)
+    instants = pd.date_range("2023-10-29", periods=500, freq="7min", tz="Europe/Paris")
+    power_series = pd.Series(rng.random(instants.size), index=instants)
+    power_series.iloc[[10, 11, 250]] = np.nan
+    bounds = np.sort(rng.integers(0, instants.size, (300, 2)), axis=1)
+    intervals = pd.DataFrame(
+        {"start": instants[bounds[:, 0]], "end": instants[bounds[:, 1]]},
+    )
+    energy = to_energy(power_series)
+    expected = pd.Series(
+        [energy.iloc[start:end].sum() for start, end in bounds],
+        dtype=float,
+    )
+    pd.testing.assert_series_equal(integrate_over(intervals, power_series), expected)
+
+
+# ==============================================================================
+# Test sum_over
+# ==============================================================================
+def test_cumulated_sums():
+    """Check the cumulated sums of 1D and 2D arrays with missing values."""
+    np.testing.assert_array_equal(
+        cumulated_sums(np.array([1.0, np.nan, 2.0])),
+        [0.0, 1.0, 1.0, 3.0],
+    )
+    cumulated = cumulated_sums(np.array([[1.0, 2.0], [3.0, np.nan]]))
+    np.testing.assert_array_equal(cumulated, [[0.0, 0.0], [1.0, 2.0], [4.0, 2.0]])
+
+
+@pytest.mark.parametrize(
+    ("inclusive", "expected"),
+    [
+        ("left", [3.0, 0.0]),
+        ("both", [7.0, 4.0]),
+        ("right", [6.0, 0.0]),
+        ("neither", [2.0, 0.0]),
+    ],
+)
+def test_sum_over_inclusive(inclusive, expected):
+    """Check which bounds are included in the sums."""
+    series = pd.Series(
+        [1.0, 2.0, 4.0, 8.0],
+        index=pd.date_range("2024-01-01", periods=4, freq="1h"),
+    )
+    intervals = pd.DataFrame(
+        {
+            "start": [series.index[0], series.index[2]],
+            "end": [series.index[2], series.index[2]],
+        },
+        index=["a", "b"],
+    )
+    pd.testing.assert_series_equal(
+        sum_over(intervals, series, inclusive=inclusive),
+        pd.Series(expected, index=["a", "b"]),
+    )
@@ -1,7 +1,10 @@
 import numpy as np
 import pandas as pd
 
-from ..power.overconsumption.find import from_power_threshold
+from ..power.overconsumption.find import (
+    from_power_threshold,
+    from_power_threshold_batch,
+)
 
 
 def example_power():
@@ -113,3 +116,58 @@ def test_from_power_threshold_custom_ref():
     pd.testing.assert_frame_equal(
         found_intervals, intervals[1:].reset_index(drop=True), check_dtype=False,
     )
+
+
+def example_power_table():
+    """Return a table of power of 3 sites derived from the example power."""
+    power, threshold, _ = example_power()
+    power = power.astype(float)
+    table = pd.DataFrame({"A": power, "B": power * 2, "C": power.shift(3)})
+    table.columns.name = "site"
+    return table, threshold.astype(float)
+
+
+def reference_by_column(power_table, tshd_of, ref_of=lambda site: None):
+    """Apply the single-series function to each column and concatenate."""
+    found = []
+    for site in power_table.columns:
+        intervals = from_power_threshold(
+            power_table[site],
+            overshoot_tshd=tshd_of(site),
+            reference_energy_tshd=ref_of(site),
+        )
+        intervals.insert(0, "meter_id", site)
+        found.append(intervals)
+    return pd.concat(found, ignore_index=True)
+
+
+def test_from_power_threshold_batch_same_as_series():
+    """Check that the batch function matches the single-series one."""
+    table, threshold = example_power_table()
+    per_site = pd.Series({"A": 1.0, "B": 10.0, "C": 5.0})
+    thresholds = pd.DataFrame({"A": threshold, "B": threshold * 3, "C": threshold})
+    cases = [
+        (1.0, lambda site: 1.0),
+        (threshold, lambda site: threshold),
+        (per_site, lambda site: per_site[site]),
+        (thresholds, lambda site: thresholds[site]),
+    ]
+    for overshoot_tshd, tshd_of in cases:
+        found = from_power_threshold_batch(table, overshoot_tshd)
+        expected = reference_by_column(table, tshd_of)
+        pd.testing.assert_frame_equal(found, expected, check_dtype=False)
+    # custom reference
+    found = from_power_threshold_batch(table, per_site, reference_energy_tshd=0.0)
+    expected = reference_by_column(table, per_site.get, lambda site: 0.0)
+    pd.testing.assert_frame_equal(found, expected, check_dtype=False)
+
+
+def test_from_power_threshold_batch_limit_cases():
+    """Check the batch function with no interval and too short tables."""
+    table, _ = example_power_table()
+    assert from_power_threshold_batch(table, 100.0).empty
+    assert from_power_threshold_batch(table.iloc[:1], 0.0).empty
+    found = from_power_threshold_batch(table, 0.0, meter_f="site")
+    assert list(found.columns) == ["site", "start", "end", "duration", "energy"]
+    assert found.shape[0] == 3
+    assert (found["end"] == table.index[-1]).all()
@@ -15,6 +15,7 @@ from energy_analysis_toolbox.thermosensitivity import (
     DayOfWeekCategoricalThermoSensitivity,
     ThermoSensitivity,
 )
+from energy_analysis_toolbox.weather.degree_days_store import DegreeDayStore
 
 
 class TestThermoSensitivity:
@@ -404,6 +405,116 @@ class TestThermoSensitivity:
                 xatol=1e-3,
             )
 
+    def test_calibrate_base_temperature_grid(self):
+        data = self.synth_both.random_consumption(size=self.data_generated_size)
+        ts = ThermoSensitivity(
+            energy_data=data["energy"],
+            temperature_data=data["T"],
+            degree_days_type="both",
+            interseason_mean_temperature=self.interseason_mean_temperature,
+            frequency=self.frequency,
+        )
+        for dd_type, tref in [
+            ("heating", self.tref_heating),
+            ("cooling", self.tref_cooling),
+        ]:
+            bounded = ts.calibrate_base_temperature(dd_type=dd_type, xatol=1e-3)
+            grid = ts.calibrate_base_temperature(
+                dd_type=dd_type,
+                xatol=1e-3,
+                method="grid",
+            )
+            assert grid == pytest.approx(tref, rel=1e-1)
+            assert grid == pytest.approx(bounded, abs=1e-2)
+            coarse = ts.calibrate_base_temperature(
+                dd_type=dd_type,
+                method="grid",
+                grid_step=1,
+                refine=False,
+            )
+            assert coarse == round(coarse)
+        with pytest.raises(ValueError, match="calibration method"):
+            ts.calibrate_base_temperature(dd_type="heating", method="brent")
+
+    def test_calibrate_joint_base_temperatures(self):
+        data = self.synth_both.random_consumption(size=self.data_generated_size)
+        ts = ThermoSensitivity(
+            energy_data=data["energy"],
+            temperature_data=data["T"],
+            degree_days_type="both",
+            interseason_mean_temperature=self.interseason_mean_temperature,
+            frequency=self.frequency,
+        )
+        ts.fit(calibration_method="grid")
+        assert ts.degree_days_base_temperature["heating"] == pytest.approx(
+            self.tref_heating,
+            rel=1e-1,
+        )
+        assert ts.degree_days_base_temperature["cooling"] == pytest.approx(
+            self.tref_cooling,
+            rel=1e-1,
+        )
+        assert ts.model.params["heating_degree_days"] == pytest.approx(
+            self.ts_heating,
+            rel=1e-1,
+        )
+
+    def test_degree_days_store(self):
+        data = self.synth_both.random_consumption(size=self.data_generated_size)
+        store = DegreeDayStore()
+        models = [
+            ThermoSensitivity(
+                energy_data=energy,
+                temperature_data=data["T"],
+                degree_days_type="both",
+                interseason_mean_temperature=self.interseason_mean_temperature,
+                frequency=self.frequency,
+                degree_days_store=store,
+            ).fit()
+            for energy in [data["energy"], 2 * data["energy"]]
+        ]
+        expected = ThermoSensitivity(
+            energy_data=data["energy"],
+            temperature_data=data["T"],
+            degree_days_type="both",
+            interseason_mean_temperature=self.interseason_mean_temperature,
+            frequency=self.frequency,
+        ).fit()
+        pd.testing.assert_series_equal(models[0].model.params, expected.model.params)
+        assert models[1].model.params["heating_degree_days"] == pytest.approx(
+            2 * expected.model.params["heating_degree_days"],
+        )
+        # the second building reads the temperature and the cache from the store
+        assert models[0].degree_days_cache is models[1].degree_days_cache
+        assert store.hits > 0
+
+    def test_calibration_loss_matches_loss_function(self):
+        data = self.synth_both.random_consumption(size=self.data_generated_size)
+        ts = ThermoSensitivity(
+            energy_data=data["energy"],
+            temperature_data=data["T"],
+            degree_days_type="both",
+            interseason_mean_temperature=self.interseason_mean_temperature,
+            frequency=self.frequency,
+        )
+        energy = ts.resampled_energy_temperature[ts.target_name]
+        positions = ts.degree_days_cache.periods.get_indexer(energy.index)
+        for dd_type, t0 in [("heating", 15.2), ("cooling", 24.7)]:
+            expected = ts.loss_function(
+                t0,
+                dd_type,
+                energy,
+                ts.temperature_data,
+                ts.frequency,
+            )
+            loss = ts._calibration_loss(
+                t0,
+                dd_type,
+                energy.to_numpy(),
+                positions,
+            )
+            assert loss == pytest.approx(expected)
+
     def test_calibrate_base_temperatures(self):
         data = self.synth_both.random_consumption(size=self.data_generated_size)
         ts = ThermoSensitivity(
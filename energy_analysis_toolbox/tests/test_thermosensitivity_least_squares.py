@@ -0,0 +1,57 @@
+"""Test the least-squares kernels of the thermosensitivity module."""
+
+import numpy as np
+import pytest
+from statsmodels.api import OLS
+
+from energy_analysis_toolbox.thermosensitivity.least_squares import residual_mse
+
+
+def statsmodels_mse(target, predictors):
+    """Return the MSE of the residuals computed by statsmodels."""
+    design = np.column_stack([predictors, np.ones(target.size)])
+    return OLS(target, design).fit().mse_resid
+
+
+@pytest.mark.parametrize("n_predictors", [1, 2, 3])
+def test_residual_mse_matches_statsmodels(n_predictors):
+    """Check the MSE against statsmodels, for single and batched designs."""
+    rng = np.random.default_rng(0)
+    predictors = rng.normal(size=(4, 100, n_predictors))
+    target = predictors[0] @ rng.normal(size=n_predictors) + rng.normal(size=100)
+    for design in predictors:
+        assert residual_mse(target, design) == pytest.approx(
+            statsmodels_mse(target, design),
+        )
+    np.testing.assert_allclose(
+        residual_mse(target, predictors),
+        [statsmodels_mse(target, design) for design in predictors],
+    )
+
+
+@pytest.mark.filterwarnings(
+    "ignore::statsmodels.tools.sm_exceptions.SingularMatrixWarning"
+)
+def test_residual_mse_rank_deficient():
+    """Check the MSE when degree days are all zeros, as for extreme base temperatures."""
+    rng = np.random.default_rng(1)
+    target = rng.normal(size=50)
+    zeros = np.zeros(50)
+    assert residual_mse(target, zeros) == pytest.approx(statsmodels_mse(target, zeros))
+    design = np.column_stack([zeros, rng.normal(size=50)])
+    assert residual_mse(target, design) == pytest.approx(
+        statsmodels_mse(target, design),
+    )
+
+
+def test_residual_mse_exact_fit():
+    """Check that an almost exact fit keeps an accurate residual error."""
+    predictor = np.linspace(0, 20, 200)
+    noise = 1e-4 * np.sin(np.arange(200))
+    target = 1e3 + 1e2 * predictor + noise
+    assert residual_mse(target, predictor) == pytest.approx(
+        statsmodels_mse(target, predictor),
+        rel=1e-6,
+    )
+    with pytest.raises(ValueError, match="at most 3 dimensions"):
+        residual_mse(target, np.zeros((1, 1, 200, 1)))
@@ -0,0 +1,98 @@
+"""Test the fit of the thermosensitivity of a portfolio of buildings."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from energy_analysis_toolbox.synthetic.thermosensitive_consumption import (
+    DateSynthTSConsumption,
+)
+from energy_analysis_toolbox.thermosensitivity import (
+    CategoricalThermoSensitivity,
+    ThermoSensitivity,
+)
+from energy_analysis_toolbox.thermosensitivity.portfolio import fit_portfolio
+from energy_analysis_toolbox.weather.degree_days_store import DegreeDayStore
+
+
+@pytest.fixture
+def portfolio():
+    """Return 3 buildings on 2 stations, the last one without enough energy data."""
+    synth = DateSynthTSConsumption(
+        base_energy=100,
+        t_ref_heat=16.5,
+        ts_heat=100,
+        ts_cool=0,
+        noise_std=0.0001,
+    )
+    first = synth.random_consumption(size=200)
+    second = synth.random_consumption(size=200)
+    return {
+        "school": (first["energy"], first["T"]),
+        "office": (2 * first["energy"], first["T"]),
+        "empty": (second["energy"].iloc[:1], second["T"]),
+    }
+
+
+def test_fit_portfolio(portfolio):
+    """Check the results of each building against an individual fit."""
+    results = fit_portfolio(portfolio, max_workers=1, chunksize=1)
+    assert list(results.index) == ["school", "office", "empty"]
+    assert results.columns[-1] == "error"
+    for building in ["school", "office"]:
+        energy, temperature = portfolio[building]
+        model = ThermoSensitivity(energy, temperature).fit()
+        row = results.loc[building]
+        assert row["error"] is None
+        assert row["degree_days_type"] == "heating"
+        assert row["heating_base_temperature"] == pytest.approx(
+            model.degree_days_base_temperature["heating"],
+        )
+        assert np.isnan(row["cooling_base_temperature"])
+        assert row["r_squared"] == pytest.approx(model.model.rsquared)
+        assert row["heating_degree_days"] == pytest.approx(
+            model.model.params["heating_degree_days"],
+        )
+    assert results.loc["empty", "error"].startswith("IndexError")
+    assert results.loc["empty", ["r_squared", "Intercept"]].isna().all()
+    assert results["n_observations"].dtype == "Int64"
+    assert results.loc["office", "n_observations"] == model.model.nobs
+
+
+def test_fit_portfolio_process_pool(portfolio):
+    """Check that the pool of processes returns the same table.
+
+    A store given to the models is filled in the current process only.
+    """
+    store = DegreeDayStore()
+    expected = fit_portfolio(portfolio, max_workers=1, degree_days_store=store)
+    assert len(store) > 0
+    store = DegreeDayStore()
+    results = fit_portfolio(
+        portfolio,
+        max_workers=2,
+        chunksize=1,
+        degree_days_store=store,
+    )
+    pd.testing.assert_frame_equal(results, expected)
+    assert len(store) == 0
+    with pytest.raises(ValueError, match="chunksize"):
+        fit_portfolio(portfolio, chunksize=0)
+
+
+def test_fit_portfolio_categories(portfolio):
+    """Check the extra positional arguments given to the model class."""
+    energy, temperature = portfolio["school"]
+    categories = pd.Series(
+        np.where(energy.index.dayofweek < 5, "weekday", "weekend"),
+        index=energy.index,
+    )
+    results = fit_portfolio(
+        {"school": (energy, temperature, categories)},
+        CategoricalThermoSensitivity,
+        max_workers=1,
+        calibration_method="grid",
+        frequency="1D",
+    )
+    assert results.loc["school", "error"] is None
+    assert "heating_degree_days:weekend" in results.columns
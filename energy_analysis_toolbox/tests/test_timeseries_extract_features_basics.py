@@ -11,6 +11,7 @@ from ..errors import (
     EATUndefinedTimestepError,
 )
 from ..timeseries.extract_features.basics import (
+    bounds_over,
     intervals_over,
     timestep_durations,
 )
@@ -241,3 +242,45 @@ def test_intervals_over_always_over():
     assert up_loc.shape[0] == 1
     assert start == pd.Timestamp("2018-07-06 05:00:00")
     assert up_loc[EATK.end_f].iloc[0] == pd.Timestamp("2018-07-06 05:20:00")
+
+
+def test_bounds_over():
+    """Check the positions returned by the array kernel on limit cases."""
+    values = np.array([2.0, 0.0, 3.0, np.nan, 4.0, 4.0, 0.0, 5.0])
+    starts, ends = bounds_over(values, low_tshd=1.0)
+    np.testing.assert_array_equal(starts, [0, 2, 4])
+    np.testing.assert_array_equal(ends, [1, 3, 6])
+    # an interval open at the end is closed on the last position
+    starts, ends = bounds_over(values[:-1], low_tshd=1.0)
+    np.testing.assert_array_equal(starts, [0, 2, 4])
+    np.testing.assert_array_equal(ends, [1, 3, 6])
+    starts, ends = bounds_over(values[:6], low_tshd=1.0)
+    np.testing.assert_array_equal(ends, [1, 3, 5])
+    for empty in [np.array([]), np.array([0.0, 0.0]), np.array([2.0])]:
+        starts, ends = bounds_over(empty, low_tshd=1.0)
+        assert starts.size == 0
+        assert ends.size == 0
+
+
+def test_intervals_over_positions_match_labels():
+    """Check that returned positions and labels match on noisy data."""
+    rng = np.random.default_rng(12)
+    power = pd.Series(
+        rng.random(10000),
+        index=pd.date_range("2018-07-06", periods=10000, freq="1s"),
+    )
+    up_loc, up_iloc = intervals_over(power, low_tshd=0.7, return_positions=True)
+    assert up_loc.shape[0] > 100
+    pd.testing.assert_index_equal(
+        pd.DatetimeIndex(up_loc[EATK.start_f]),
+        power.index[up_iloc[EATK.start_f]],
+        check_names=False,
+    )
+    pd.testing.assert_index_equal(
+        pd.DatetimeIndex(up_loc[EATK.end_f]),
+        power.index[up_iloc[EATK.end_f]],
+        check_names=False,
+    )
+    for start, end in up_iloc.itertuples(index=False):
+        assert (power.iloc[start:end] > 0.7).all()
+        assert end == power.size - 1 or power.iloc[end] <= 0.7
@@ -0,0 +1,205 @@
+"""Tests for :py:mod:`energy_analysis_toolbox.timeseries.resample.batch` module."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from .. import pandas  # noqa:F401
+from ..errors import (
+    EATEmptySourceError,
+    EATEmptyTargetsError,
+    EATInvalidTimeseriesError,
+    EATInvalidTimestepDurationError,
+)
+from ..timeseries.resample._facade import to_freq
+from ..timeseries.resample.batch import (
+    flow_rate_conservative_batch,
+    flow_rate_to_freq_batch,
+    long_to_wide,
+    volume_conservative_batch,
+    volume_to_freq_batch,
+    wide_to_long,
+)
+from ..timeseries.resample.conservative import (
+    flow_rate_conservative,
+    flow_rate_to_freq,
+    volume_conservative,
+    volume_to_freq,
+)
+
+
+def example_wide(n_meters=5, periods=50, irregular=True):
+    """Return a table of random volumes, one column per meter."""
+    rng = np.random.default_rng(42)
+    index = pd.date_range("2022-03-12", periods=periods, freq="7min")
+    if irregular:
+        index = index + pd.to_timedelta(rng.integers(0, 300, periods), unit="s")
+    return pd.DataFrame(
+        rng.random((periods, n_meters)),
+        index=index.rename("time"),
+        columns=pd.Index([f"m{i}" for i in range(n_meters)], name="meter_id"),
+    )
+
+
+def reference_by_column(function, data, *args, **kwargs):
+    """Apply a single-series resampling function to each column of ``data``."""
+    return pd.concat(
+        {col: function(data[col], *args, **kwargs) for col in data.columns},
+        axis=1,
+        names=data.columns.names,
+    )
+
+
+@pytest.mark.parametrize(
+    ("function", "reference"),
+    [
+        (volume_conservative_batch, volume_conservative),
+        (flow_rate_conservative_batch, flow_rate_conservative),
+    ],
+)
+@pytest.mark.parametrize(
+    "targets",
+    [
+        pd.date_range("2022-03-11 23:00", periods=40, freq="13min"),
+        pd.date_range("2022-03-12 01:00", periods=500, freq="47s"),
+        pd.date_range("2022-03-12 02:00", periods=1, freq="1h"),
+    ],
+)
+def test_conservative_batch_same_as_by_column(function, reference, targets):
+    """Check that the batched functions match the single-series ones."""
+    data = example_wide()
+    kwargs = {"last_step_duration": 600, "last_target_step_duration": 1800}
+    expected = reference_by_column(reference, data, targets, **kwargs)
+    obtained = function(data, targets, **kwargs)
+    pd.testing.assert_frame_equal(obtained, expected, check_freq=False)
+
+
+@pytest.mark.parametrize(
+    ("function", "reference"),
+    [
+        (volume_conservative_batch, volume_conservative),
+        (flow_rate_conservative_batch, flow_rate_conservative),
+    ],
+)
+@pytest.mark.parametrize(
+    ("irregular", "freq"),
+    [(True, "10min"), (False, "7min"), (False, "21min")],
+)
+def test_conservative_batch_nan(function, reference, irregular, freq):
+    """Check that missing values are managed as in the single-series function.
+
+    On the regular index, the targets are located on source instants which are
+    followed by missing values.
+    """
+    data = example_wide(irregular=irregular)
+    data.iloc[[3, 17], 1] = np.nan
+    data.iloc[-1, 2] = np.nan
+    targets = pd.date_range("2022-03-12", periods=30, freq=freq)
+    pd.testing.assert_frame_equal(
+        function(data, targets),
+        reference_by_column(reference, data, targets),
+        check_freq=False,
+    )
+
+
+def test_volume_conservative_batch_conservation():
+    """Check that the total volume of each column is conserved."""
+    data = example_wide(irregular=False)
+    targets = pd.date_range("2022-03-11", periods=100, freq="1h")
+    obtained = volume_conservative_batch(data, targets)
+    pd.testing.assert_series_equal(obtained.sum(), data.sum())
+
+
+def test_conservative_batch_errors():
+    """Check that declared errors are raised."""
+    data = example_wide()
+    for function in [volume_conservative_batch, flow_rate_conservative_batch]:
+        with pytest.raises(EATEmptySourceError):
+            function(data.iloc[:0], data.index)
+        with pytest.raises(EATEmptyTargetsError):
+            function(data, pd.DatetimeIndex([]))
+        with pytest.raises(EATInvalidTimestepDurationError):
+            function(data, data.index, last_step_duration=0.0)
+        with pytest.raises(EATInvalidTimestepDurationError):
+            function(data, data.index, last_target_step_duration=-1.0)
+
+
+@pytest.mark.parametrize(
+    ("function", "reference"),
+    [
+        (volume_to_freq_batch, volume_to_freq),
+        (flow_rate_to_freq_batch, flow_rate_to_freq),
+    ],
+)
+def test_to_freq_batch(function, reference):
+    """Check the resampling of wide and long tables to a frequency."""
+    data = example_wide()
+    expected = reference_by_column(reference, data, "15min", origin="floor")
+    obtained = function(data, "15min", origin="floor")
+    pd.testing.assert_frame_equal(obtained, expected, check_freq=False)
+    obtained_long = function(wide_to_long(data), "15min", origin="floor")
+    pd.testing.assert_frame_equal(obtained_long, wide_to_long(expected))
+
+
+def test_long_to_wide_round_trip():
+    """Check the conversions between long and wide layouts."""
+    data = example_wide()
+    long = wide_to_long(data)
+    assert list(long.columns) == ["meter_id", "timestamp", "value"]
+    assert long.shape[0] == data.size
+    wide = long_to_wide(long.sample(frac=1, random_state=0))
+    pd.testing.assert_frame_equal(
+        wide,
+        data.rename_axis(index="timestamp"),
+        check_freq=False,
+    )
+
+
+def test_long_to_wide_errors():
+    """Check that tables which are not aligned are refused."""
+    long = wide_to_long(example_wide())
+    with pytest.raises(EATInvalidTimeseriesError):
+        long_to_wide(long.iloc[1:])
+    with pytest.raises(EATInvalidTimeseriesError):
+        long_to_wide(pd.concat([long, long.iloc[:1]]))
+
+
+def test_to_freq_facade_frame():
+    """Check that the facade dispatches tables to the right engines."""
+    data = example_wide()
+    pd.testing.assert_frame_equal(
+        to_freq(data, "20min", method="volume_conservative"),
+        volume_to_freq_batch(data, "20min"),
+    )
+    pd.testing.assert_frame_equal(
+        to_freq(data, "20min", method="flow_rate_conservative"),
+        flow_rate_to_freq_batch(data, "20min"),
+    )
+    pd.testing.assert_frame_equal(
+        to_freq(data, "20min"),
+        reference_by_column(to_freq, data, "20min"),
+    )
+    expected = reference_by_column(to_freq, data, "20min", method="piecewise_constant")
+    pd.testing.assert_frame_equal(
+        to_freq(wide_to_long(data), "20min", method="piecewise_constant"),
+        wide_to_long(expected),
+    )
+    with pytest.raises(TypeError, match="left_pad"):
+        to_freq(data, "20min", method="volume_conservative", left_pad=0.0)
+
+
+def test_frame_accessor():
+    """Check the resampling methods of the DataFrame accessor."""
+    data = example_wide()
+    pd.testing.assert_frame_equal(
+        data.eat.power_to_freq("1h"),
+        flow_rate_to_freq_batch(data, "1h"),
+    )
+    pd.testing.assert_frame_equal(
+        data.eat.energy_to_freq("1h"),
+        volume_to_freq_batch(data, "1h"),
+    )
+    pd.testing.assert_frame_equal(
+        data.eat.to_freq("1h", method="volume_conservative"),
+        volume_to_freq_batch(data, "1h"),
+    )
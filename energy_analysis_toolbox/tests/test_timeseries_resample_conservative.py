@@ -17,6 +17,7 @@ from ..timeseries.resample.conservative import (
     flow_rate_conservative,
     volume_conservative,
 )
+from ..timeseries.resample.interpolate import grid_positions
 from .fake.timeseries import example_volume_one_day
 
 # =============================================================================
@@ -494,3 +495,115 @@ def test_volume_conservative_as_integral():
     )
     assert coarse_volumes.loc["2020-01-05"] == pytest.approx(volumes.sum())
     assert coarse_volumes.size == 1
+
+
+def test_volume_conservative_regular_grid():
+    """Check that the regular grid positions give the same volumes.
+
+    A regular grid is extended by an irregular last step in order to go
+    through the generic path.
+    """
+    rng = np.random.default_rng(2)
+    steps = rng.integers(1, 600, size=200)
+    volumes = pd.Series(
+        rng.random(steps.size),
+        index=pd.Timestamp("2020-01-06") + pd.to_timedelta(np.cumsum(steps), "s"),
+    )
+    targets = pd.date_range("2020-01-06", periods=2000, freq="37s")
+    regular = volume_conservative(volumes, targets, last_target_step_duration=37)
+    generic = volume_conservative(volumes, targets, last_target_step_duration=38)
+    compare_volumes(regular.iloc[:-1], generic.iloc[:-1])
+    assert regular.sum() == pytest.approx(
+        volumes.loc[: targets[-1] + pd.Timedelta(seconds=36)].sum(),
+    )
+
+
+def test_volume_conservative_nan():
+    """Check the resampling of volumes with nan values on irregular targets.
+
+    The expected volumes are the ones of the previous implementation, based on
+    :py:func:`numpy.interp`.
+    """
+    values = np.arange(1.0, 13.0)
+    values[[4, 9]] = np.nan
+    volumes = pd.Series(
+        values,
+        index=pd.date_range("2020-01-06", periods=12, freq="h"),
+    )
+    targets = pd.DatetimeIndex(
+        [
+            "2020-01-06 00:00",
+            "2020-01-06 03:00",
+            "2020-01-06 06:00",
+            "2020-01-06 09:00",
+            "2020-01-06 11:00",
+        ],
+    )
+    expected = pd.Series([6.0, 10.0, 24.0, 11.0, 12.0], index=targets)
+    compare_volumes(volume_conservative(volumes, targets), expected)
+    durations = np.array([3.0, 3.0, 3.0, 2.0, 2.0]) * 3600
+    compare_flow_rates(
+        flow_rate_conservative(volumes / 3600, targets),
+        expected / durations,
+    )
+
+
+@pytest.mark.parametrize(
+    ("source_freq", "target_freq", "n_targets", "expected"),
+    [
+        (
+            "h",
+            "30min",
+            24,
+            {
+                "00:00": 0.5, "00:30": 0.5, "01:00": 1.0, "01:30": 1.0,
+                "02:00": 1.5, "02:30": 1.5, "03:00": 2.0, "03:30": 2.0,
+                "06:00": 3.5, "06:30": 3.5, "07:00": 4.0, "07:30": 4.0,
+                "08:00": 4.5, "08:30": 4.5, "11:00": 6.0, "11:30": 6.0,
+            },
+        ),
+        (
+            "15min",
+            "10min",
+            18,
+            {
+                "00:00": 2 / 3, "00:10": 1.0, "00:20": 4 / 3, "00:30": 2.0,
+                "00:40": 7 / 3, "00:50": 8 / 3, "01:30": 14 / 3, "01:40": 5.0,
+                "01:50": 16 / 3, "02:00": 6.0, "02:50": 8.0,
+            },
+        ),
+    ],
+)
+def test_volume_conservative_regular_grid_nan(
+    source_freq, target_freq, n_targets, expected,
+):
+    """Check the regular grid path with nan volumes.
+
+    The expected volumes are the ones of the previous implementation, based on
+    :py:func:`numpy.interp`: the target steps with undetermined volumes are
+    dropped.
+    """
+    values = np.arange(1.0, 13.0)
+    values[[4, 9]] = np.nan
+    volumes = pd.Series(
+        values,
+        index=pd.date_range("2020-01-06", periods=12, freq=source_freq),
+    )
+    targets = pd.date_range("2020-01-06", periods=n_targets, freq=target_freq)
+    expected = pd.Series(
+        list(expected.values()),
+        index=pd.DatetimeIndex([f"2020-01-06 {time}" for time in expected]),
+    )
+    compare_volumes(volume_conservative(volumes, targets), expected)
+
+
+def test_grid_positions():
+    """Check the grid positions against a search in the source times."""
+    rng = np.random.default_rng(3)
+    source_times = np.cumsum(rng.integers(0, 50, size=300))
+    for start, step, size in [(-100, 7, 50), (20, 1, 3000), (500, 3, 40)]:
+        grid = start + step * np.arange(size)
+        np.testing.assert_array_equal(
+            grid_positions(source_times, start, step, size),
+            np.searchsorted(source_times, grid, side="right") - 1,
+        )
@@ -3,7 +3,9 @@
 import numpy as np
 import pandas as pd
 import pytest
+from scipy.stats import mode
 
+from ..timeseries.extract_features.basics import index_to_timesteps
 from ..timeseries.resample.index_transformation import (
     estimate_timestep,
     fill_data_holes,
@@ -150,6 +152,41 @@ def test_estimate_timestep_random_frequency():
     assert np.isclose(estimate_timestep(index, "mean"), timestep, rtol=rtol, atol=atol)
 
 
+def test_estimate_timestep_mode_matches_scipy():
+    """Check the integer mode against the mode of the float timesteps."""
+    rng = np.random.default_rng(5)
+    for steps in [
+        rng.choice([1, 2, 3, 60], size=1000) * 10**9,
+        rng.integers(59_000, 61_000, size=3000) * 10**6,
+        rng.integers(1, 10**12, size=1000),
+    ]:
+        index = pd.DatetimeIndex(pd.Timestamp("2022-06-15").value + np.cumsum(steps))
+        expected = mode(index_to_timesteps(index)).mode
+        assert estimate_timestep(index, "mode") == expected
+
+
+def test_estimate_timestep_sampled():
+    """Check the estimations made on a sample of the timesteps."""
+    rng = np.random.default_rng(7)
+    size = 100000
+    timesteps = rng.normal(60, 2, size=size)
+    index = pd.Timestamp("2022-06-15") + pd.to_timedelta(np.cumsum(timesteps), "s")
+    for method in ["median", "kde"]:
+        sampled = estimate_timestep(index, method, max_samples=5000, seed=3)
+        assert np.isclose(sampled, 60, atol=0.5)
+        assert sampled == estimate_timestep(index, method, max_samples=5000, seed=3)
+    # the rank of the sampled median stays close to the one of the median
+    sampled = estimate_timestep(index, "median", max_samples=10000)
+    rank = (index_to_timesteps(index) < sampled).mean()
+    assert abs(rank - 0.5) < 1 / np.sqrt(10000)
+    # no sampling for short indexes
+    assert estimate_timestep(
+        index[:100], "median", max_samples=1000,
+    ) == estimate_timestep(index[:100], "median")
+    with pytest.raises(ValueError, match="max_samples"):
+        estimate_timestep(index, "median", max_samples=0)
+
+
 def test_fill_missing_entry_series():
     """Test the fill missing entry function"""
     freq = "1min"
@@ -194,6 +231,33 @@ def test_fill_missing_entry_frame():
     pd.testing.assert_frame_equal(expected_frame, fixed_frame, check_freq=False)
 
 
+def test_fill_missing_entries_many_holes():
+    """Check the new entries created in many holes of various lengths."""
+    rng = np.random.default_rng(3)
+    full_index = pd.date_range("2022-03-27", periods=5000, freq="1s", tz="Europe/Paris")
+    kept = np.sort(rng.choice(full_index.size, 1000, replace=False))
+    kept = np.union1d(kept, [0, full_index.size - 1])
+    frame = pd.DataFrame(
+        {"a": 1.0, "b": 2.0},
+        index=full_index[kept],
+    )
+    fixed_frame = fill_missing_entries(
+        frame, sampling_period=1, security_factor=2, fill_value=0.0,
+    )
+    expected_frame = frame.reindex(full_index, fill_value=0.0)
+    # the last entry lasts as long as the previous one, hence trailing entries
+    pd.testing.assert_frame_equal(
+        expected_frame, fixed_frame.loc[: full_index[-1]], check_freq=False,
+    )
+    # holes shorter than the security factor are left untouched
+    fixed_frame = fill_missing_entries(
+        frame, sampling_period=1, security_factor=10, fill_value=0.0,
+    )
+    assert fixed_frame.index.is_monotonic_increasing
+    assert (np.diff(fixed_frame.index.asi8) <= 9 * 10**9).all()
+    pd.testing.assert_frame_equal(fixed_frame.loc[frame.index], frame)
+
+
 def test_fill_data_holes():
     """Test the fill data holes function"""
     freq = "1min"
@@ -12,7 +12,9 @@ from ..timeseries.math.derivatives import (
 from ..timeseries.resample.index_transformation import tz_convert_or_localize
 from ..timeseries.resample.interpolate import (
     piecewise_affine,
+    piecewise_affine_kernel,
     piecewise_constant,
+    piecewise_constant_kernel,
 )
 
 # =============================================================================
@@ -184,3 +186,67 @@ def test_piecewise_constant_padding():
     assert np.allclose(stair_interp.to_numpy(), np.array([0.0, 0.0, -1.0]))
     stair_interp = piecewise_constant(bc, target_instants, left_pad=42.0)
     assert np.allclose(stair_interp.to_numpy(), np.array([42.0, 42.0, -1.0]))
+
+
+def test_piecewise_kernels_columns():
+    """Check that 2D values are interpolated as their columns."""
+    rng = np.random.default_rng(4)
+    source_times = np.cumsum(rng.integers(1, 10**10, size=50))
+    target_times = np.sort(
+        rng.integers(source_times[0] - 10**10, source_times[-1] + 10**10, size=200),
+    )
+    values = rng.random((50, 3))
+    affine = piecewise_affine_kernel(target_times, source_times, values)
+    constant = piecewise_constant_kernel(
+        target_times, source_times, values, left_pad=-1.0,
+    )
+    for column in range(values.shape[1]):
+        np.testing.assert_allclose(
+            affine[:, column],
+            np.interp(target_times, source_times, values[:, column]),
+        )
+        np.testing.assert_array_equal(
+            constant[:, column],
+            piecewise_constant_kernel(
+                target_times, source_times, values[:, column], left_pad=-1.0,
+            ),
+        )
+    # results are written in the provided output
+    out = np.empty((200, 3))
+    assert piecewise_affine_kernel(target_times, source_times, values, out=out) is out
+    np.testing.assert_array_equal(out, affine)
+    with pytest.raises(ValueError, match="shape"):
+        piecewise_affine_kernel(target_times, source_times, values, out=out[:, :2])
+
+
+def test_piecewise_affine_ns_precision():
+    """Check that ns offsets are not lost far from the first target."""
+    source = pd.Series(
+        [0.0, 0.0, 1.0],
+        index=pd.DatetimeIndex(
+            ["2000-01-01", "2100-01-01", "2100-01-01 00:00:00.000000002"],
+        ),
+    )
+    targets = pd.DatetimeIndex(["2000-01-01", "2100-01-01 00:00:00.000000001"])
+    interp = piecewise_affine(source, targets)
+    assert interp.iloc[1] == 0.5
+
+
+def test_piecewise_affine_nan():
+    """Check that nan values only spread between their neighbour samples.
+
+    The values at the source times are kept even if the next sample is nan, as
+    with :py:func:`numpy.interp`.
+    """
+    values = np.arange(1.0, 13.0)
+    values[[4, 9]] = np.nan
+    index = pd.date_range("2020-01-06", periods=12, freq="15min")
+    source = pd.Series(values, index=index)
+    interp = piecewise_affine(source, index)
+    np.testing.assert_array_equal(interp.to_numpy(), values)
+    targets = pd.date_range("2020-01-06", periods=34, freq="5min")
+    interp = piecewise_affine(source, targets)
+    np.testing.assert_allclose(
+        interp.to_numpy(),
+        np.interp(targets.asi8, index.asi8, values),
+    )
@@ -0,0 +1,197 @@
+"""Tests for :py:mod:`energy_analysis_toolbox.timeseries.resample.ragged` module."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ..errors import (
+    EATInvalidTimeseriesError,
+    EATInvalidTimestepDurationError,
+    EATUndefinedTimestepError,
+)
+from ..timeseries.resample.batch import volume_to_freq_batch
+from ..timeseries.resample.conservative import (
+    flow_rate_to_freq,
+    volume_to_freq,
+)
+from ..timeseries.resample.ragged import (
+    RaggedTimeseries,
+    flow_rate_to_freq_ragged,
+    volume_to_freq_ragged,
+)
+
+
+def example_series(n_meters=6, tz=None):
+    """Return a dict of random timeseries with their own irregular indexes."""
+    rng = np.random.default_rng(7)
+    series = {}
+    for i in range(n_meters):
+        size = rng.integers(2, 60)
+        steps = rng.integers(30, 1800, size)
+        start = pd.Timestamp("2023-03-25 22:00", tz=tz) + pd.Timedelta(
+            seconds=int(rng.integers(0, 7200)),
+        )
+        index = start + pd.to_timedelta(np.cumsum(steps) - steps[0], unit="s")
+        series[f"meter_{i}"] = pd.Series(rng.random(size), index=index)
+    return series
+
+
+def assert_same_as_series(ragged, series, reference, *args, **kwargs):
+    """Check each timeseries of ``ragged`` against ``reference`` on ``series``."""
+    for meter_id, single in series.items():
+        expected = reference(single, *args, **kwargs)
+        obtained = ragged.get(meter_id)
+        np.testing.assert_allclose(obtained.to_numpy(), expected.to_numpy())
+        pd.testing.assert_index_equal(
+            obtained.index,
+            expected.index.rename(None),
+            exact=False,
+            check_exact=True,
+        )
+
+
+@pytest.mark.parametrize("origin", [None, "floor", "ceil"])
+@pytest.mark.parametrize("last_step_duration", [None, 600])
+@pytest.mark.parametrize(
+    ("function", "reference"),
+    [
+        (volume_to_freq_ragged, volume_to_freq),
+        (flow_rate_to_freq_ragged, flow_rate_to_freq),
+    ],
+)
+def test_to_freq_ragged_same_as_series(
+    function,
+    reference,
+    origin,
+    last_step_duration,
+):
+    """Check that each timeseries is resampled as with the single-series function."""
+    series = example_series()
+    ragged = RaggedTimeseries.from_series(series)
+    resampled = function(
+        ragged,
+        "15min",
+        origin=origin,
+        last_step_duration=last_step_duration,
+    )
+    assert isinstance(resampled, RaggedTimeseries)
+    assert_same_as_series(
+        resampled,
+        series,
+        reference,
+        "15min",
+        origin=origin,
+        last_step_duration=last_step_duration,
+    )
+
+
+def test_volume_to_freq_ragged_origin_and_tz():
+    """Check explicit origins with time-zoned data."""
+    series = example_series(tz="Europe/Paris")
+    ragged = RaggedTimeseries.from_series(series)
+    origin = pd.Timestamp("2023-03-25 21:00")
+    resampled = volume_to_freq_ragged(ragged, "1h", origin=origin)
+    assert_same_as_series(resampled, series, volume_to_freq, "1h", origin=origin)
+
+
+@pytest.mark.parametrize("origin", ["floor", "ceil"])
+@pytest.mark.parametrize("freq", ["45min", "1D"])
+def test_volume_to_freq_ragged_floor_tz(origin, freq):
+    """Check that the origins are rounded in the wall time of time-zoned data."""
+    series = example_series(tz="Europe/Paris")
+    ragged = RaggedTimeseries.from_series(series)
+    resampled = volume_to_freq_ragged(ragged, freq, origin=origin)
+    assert_same_as_series(resampled, series, volume_to_freq, freq, origin=origin)
+
+
+def test_volume_to_freq_ragged_nan_and_empty():
+    """Check that missing values and empty timeseries are managed."""
+    series = example_series()
+    series["meter_1"].iloc[[1, 4]] = np.nan
+    series["empty"] = pd.Series([], index=pd.DatetimeIndex([]), dtype=float)
+    ragged = RaggedTimeseries.from_series(series)
+    resampled = volume_to_freq_ragged(ragged, "10min")
+    assert resampled.lengths[-1] == 0
+    for meter_id in ["meter_0", "meter_2"]:
+        pd.testing.assert_series_equal(
+            resampled.get(meter_id),
+            volume_to_freq(series[meter_id], "10min"),
+            check_freq=False,
+            check_names=False,
+        )
+    # the single-series function drops the undefined bins
+    pd.testing.assert_series_equal(
+        resampled.get("meter_1").dropna(),
+        volume_to_freq(series["meter_1"], "10min"),
+        check_freq=False,
+        check_names=False,
+    )
+
+
+def test_volume_to_freq_ragged_nan_on_grid():
+    """Check the bins starting on a sample which is followed by a missing value."""
+    values = np.arange(1.0, 13.0)
+    values[[4, 9]] = np.nan
+    series = {
+        "on_grid": pd.Series(
+            values,
+            index=pd.date_range("2020-01-06", periods=12, freq="10min"),
+        ),
+        "off_grid": pd.Series(
+            values,
+            index=pd.date_range("2020-01-06 00:05", periods=12, freq="10min"),
+        ),
+    }
+    resampled = volume_to_freq_ragged(RaggedTimeseries.from_series(series), "10min")
+    for meter_id, single in series.items():
+        pd.testing.assert_series_equal(
+            resampled.get(meter_id).dropna(),
+            volume_to_freq(single, "10min"),
+            check_freq=False,
+            check_names=False,
+        )
+
+
+def test_volume_to_freq_ragged_conservation():
+    """Check that the volume of each timeseries is conserved."""
+    series = example_series()
+    resampled = volume_to_freq_ragged(RaggedTimeseries.from_series(series), "7min")
+    totals = np.add.reduceat(resampled.values, resampled.offsets[:-1])
+    np.testing.assert_allclose(totals, [s.sum() for s in series.values()])
+
+
+def test_volume_to_freq_ragged_errors():
+    """Check that declared errors are raised."""
+    series = example_series()
+    series["single"] = series["meter_0"].iloc[:1]
+    ragged = RaggedTimeseries.from_series(series)
+    with pytest.raises(EATUndefinedTimestepError):
+        volume_to_freq_ragged(ragged, "1h")
+    with pytest.raises(EATInvalidTimestepDurationError):
+        volume_to_freq_ragged(ragged, "1h", last_step_duration=0)
+    with pytest.raises(EATInvalidTimeseriesError):
+        RaggedTimeseries(ragged.values, ragged.timestamps, ragged.offsets[:-1])
+
+
+def test_ragged_long_round_trip():
+    """Check the conversions from and to long-format tables."""
+    series = example_series(tz="UTC")
+    ragged = RaggedTimeseries.from_series(series)
+    long = ragged.to_long()
+    assert list(long.columns) == ["meter_id", "timestamp", "value"]
+    ragged_2 = RaggedTimeseries.from_long(long.sample(frac=1, random_state=1))
+    np.testing.assert_array_equal(ragged_2.values, ragged.values)
+    np.testing.assert_array_equal(ragged_2.timestamps, ragged.timestamps)
+    np.testing.assert_array_equal(ragged_2.offsets, ragged.offsets)
+    pd.testing.assert_frame_equal(ragged_2.to_long(), long)
+    with pytest.raises(EATInvalidTimeseriesError):
+        RaggedTimeseries.from_long(pd.concat([long, long.iloc[:1]]))
+
+
+def test_batch_long_not_aligned():
+    """Check that unaligned long tables are resampled with the ragged engine."""
+    series = example_series()
+    long = RaggedTimeseries.from_series(series).to_long()
+    resampled = volume_to_freq_batch(long, "20min")
+    ragged = RaggedTimeseries.from_long(resampled)
+    assert_same_as_series(ragged, series, volume_to_freq, "20min")
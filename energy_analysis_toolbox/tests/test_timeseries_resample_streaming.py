@@ -0,0 +1,235 @@
+"""Tests for :py:mod:`energy_analysis_toolbox.timeseries.resample.streaming` module."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ..errors import (
+    EATEmptySourceError,
+    EATInvalidTimeseriesError,
+    EATInvalidTimestepDurationError,
+    EATResamplingError,
+    EATUndefinedTimestepError,
+)
+from ..timeseries.resample.conservative import flow_rate_to_freq, volume_to_freq
+from ..timeseries.resample.streaming import (
+    ConservativeResampler,
+    append_to_freq,
+    flow_rate_to_freq_chunks,
+    volume_to_freq_chunks,
+)
+
+
+def example_volumes(size=400, tz=None, seed=3, *, regular=False):
+    """Return a random volume timeseries with an irregular index.
+
+    If ``regular``, the index is a grid of 5min steps from midnight instead.
+    """
+    rng = np.random.default_rng(seed)
+    if regular:
+        index = pd.date_range("2023-03-25", periods=size, freq="5min", tz=tz)
+        return pd.Series(rng.random(size), index=index.rename("time"), name="volume")
+    steps = rng.integers(1, 1200, size)
+    index = pd.Timestamp("2023-03-25 23:13:07", tz=tz) + pd.to_timedelta(
+        np.cumsum(steps),
+        unit="s",
+    )
+    return pd.Series(rng.random(size), index=index.rename("time"), name="volume")
+
+
+def split(series, n_chunks, seed=0):
+    """Split a series in chunks of random sizes."""
+    rng = np.random.default_rng(seed)
+    cuts = np.sort(rng.choice(np.arange(1, series.size), n_chunks - 1, replace=False))
+    bounds = np.r_[0, cuts, series.size]
+    return [series.iloc[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+
+@pytest.mark.parametrize("origin", [None, "floor", "ceil"])
+@pytest.mark.parametrize("last_step_duration", [None, 600, 1.5])
+@pytest.mark.parametrize("freq", ["7s", "15min", "1D"])
+@pytest.mark.parametrize("tz", [None, "Europe/Paris"])
+@pytest.mark.parametrize("regular", [False, True])
+def test_chunks_same_as_one_shot(origin, last_step_duration, freq, tz, regular):
+    """Check that the result is exactly the same as the one-shot resampling.
+
+    On the regular grid, the end of the resampling range may be a target
+    instant, which must not be returned. The last volume is then defined, so
+    that a bin starting there would not be dropped as nan.
+    """
+    if regular:
+        series = example_volumes(size=576, tz=tz, regular=True)
+        series.iloc[[5, 6, 100]] = np.nan
+    else:
+        series = example_volumes(tz=tz)
+        series.iloc[[5, 6, 100, -1]] = np.nan
+    expected = volume_to_freq(
+        series,
+        freq,
+        origin=origin,
+        last_step_duration=last_step_duration,
+    )
+    for n_chunks in [1, 7, 80]:
+        obtained = pd.concat(
+            volume_to_freq_chunks(
+                split(series, n_chunks),
+                freq,
+                origin=origin,
+                last_step_duration=last_step_duration,
+            ),
+        )
+        pd.testing.assert_series_equal(
+            obtained,
+            expected,
+            check_exact=True,
+            check_freq=False,
+        )
+
+
+@pytest.mark.parametrize("origin", [None, "floor"])
+@pytest.mark.parametrize("last_step_duration", [None, 600])
+def test_flow_rate_chunks_same_as_one_shot(origin, last_step_duration):
+    """Check that flow-rates are resampled exactly as in the one-shot function."""
+    series = example_volumes(tz="Europe/Paris")
+    expected = flow_rate_to_freq(
+        series,
+        "10min",
+        origin=origin,
+        last_step_duration=last_step_duration,
+    )
+    for n_chunks in [1, 9, series.size]:
+        obtained = pd.concat(
+            flow_rate_to_freq_chunks(
+                split(series, n_chunks),
+                "10min",
+                origin=origin,
+                last_step_duration=last_step_duration,
+            ),
+        )
+        pd.testing.assert_series_equal(
+            obtained,
+            expected,
+            check_exact=True,
+            check_freq=False,
+        )
+
+
+@pytest.mark.parametrize(
+    ("method", "reference"),
+    [
+        ("volume_conservative", volume_to_freq),
+        ("flow_rate_conservative", flow_rate_to_freq),
+    ],
+)
+def test_append_to_freq(method, reference):
+    """Check that appending samples gives the resampling of the whole history."""
+    series = example_volumes()
+    chunks = split(series, 12)
+    resampler = ConservativeResampler("15min", origin="floor", method=method)
+    resampled = None
+    n_received = 0
+    for chunk in chunks:
+        position, tail = append_to_freq(resampled, chunk, resampler)
+        if resampled is None:
+            assert position == 0
+            resampled = tail
+        else:
+            assert position <= resampled.size
+            resampled = pd.concat([resampled.iloc[:position], tail])
+        n_received += chunk.size
+        expected = reference(series.iloc[:n_received], "15min", origin="floor")
+        pd.testing.assert_series_equal(
+            resampled,
+            expected,
+            check_exact=True,
+            check_freq=False,
+        )
+    assert not resampler.closed
+
+
+def test_resampler_preview():
+    """Check that previewing the last bins does not modify the resampler."""
+    series = example_volumes(size=50)
+    resampler = ConservativeResampler("1h")
+    assert resampler.pending_start is None
+    resampler.update(series.iloc[:30])
+    start = resampler.pending_start
+    assert start <= series.index[29]
+    preview = resampler.preview()
+    assert preview.index[0] == start
+    pd.testing.assert_series_equal(resampler.preview(), preview)
+    tail = resampler.append(series.iloc[30:])
+    assert tail.index[0] == start
+    pd.testing.assert_series_equal(
+        tail,
+        volume_to_freq(series, "1h").loc[start:],
+        check_exact=True,
+        check_freq=False,
+    )
+
+
+def test_resampler_append_error():
+    """Check that a failed append leaves the resampler usable.
+
+    The last bins of a single sample cannot be previewed without a
+    ``last_step_duration``.
+    """
+    series = example_volumes(size=50)
+    resampler = ConservativeResampler("1h")
+    with pytest.raises(EATUndefinedTimestepError):
+        resampler.append(series.iloc[:1])
+    assert not resampler.started
+    _, resampled = append_to_freq(None, series.iloc[:30], resampler)
+    position, tail = append_to_freq(resampled, series.iloc[30:], resampler)
+    resampled = pd.concat([resampled.iloc[:position], tail])
+    pd.testing.assert_series_equal(
+        resampled,
+        volume_to_freq(series, "1h"),
+        check_exact=True,
+        check_freq=False,
+    )
+
+
+def test_resampler_returns_covered_bins():
+    """Check that the bins are returned as soon as they are fully covered."""
+    series = pd.Series(
+        [1.0, 2.0, 3.0, 4.0],
+        index=pd.date_range("2024-01-01", periods=4, freq="10min"),
+    )
+    resampler = ConservativeResampler("15min")
+    assert resampler.update(series.iloc[:2]).empty
+    first = resampler.update(series.iloc[2:])
+    pd.testing.assert_series_equal(
+        first,
+        pd.Series([2.0], index=pd.DatetimeIndex(["2024-01-01"])),
+        check_freq=False,
+    )
+    assert resampler.update(series.iloc[:0]).empty
+    last = resampler.close()
+    assert resampler.closed
+    np.testing.assert_allclose(last.to_numpy(), [4.0, 4.0])
+    assert last.index[0] == pd.Timestamp("2024-01-01 00:15")
+
+
+def test_resampler_errors():
+    """Check that declared errors are raised."""
+    series = example_volumes(size=10)
+    with pytest.raises(EATInvalidTimestepDurationError):
+        ConservativeResampler("1h", last_step_duration=0)
+    with pytest.raises(ValueError, match="method"):
+        ConservativeResampler("1h", method="piecewise_affine")
+    with pytest.raises(EATEmptySourceError):
+        ConservativeResampler("1h").close()
+    resampler = ConservativeResampler("1h")
+    resampler.update(series.iloc[:1])
+    with pytest.raises(EATUndefinedTimestepError):
+        resampler.close()
+    resampler = ConservativeResampler("1h")
+    resampler.update(series.iloc[:5])
+    with pytest.raises(EATInvalidTimeseriesError):
+        resampler.update(series.iloc[4:])
+    with pytest.raises(EATInvalidTimeseriesError):
+        resampler.update(series.iloc[::-1])
+    resampler.close()
+    with pytest.raises(EATResamplingError):
+        resampler.update(series.iloc[5:])
@@ -0,0 +1,92 @@
+"""Test the degree days cache module."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from energy_analysis_toolbox.errors.degree_days import (
+    EATInvalidDegreeDaysError,
+    EATInvalidDegreeDaysMethodError,
+)
+from energy_analysis_toolbox.weather.degree_days import dd_compute
+from energy_analysis_toolbox.weather.degree_days_cache import DegreeDaysCache
+
+
+def irregular_temperature():
+    """Return 100 days of irregular noisy temperature, with missing data."""
+    rng = np.random.default_rng(42)
+    index = pd.date_range(
+        start="2023-01-01",
+        periods=24 * 100,
+        freq="1h",
+        tz="Europe/Paris",
+    )
+    index = index[np.sort(rng.choice(index.size, 2000, replace=False))]
+    data = 12 + 8 * np.sin(np.arange(index.size) / 30) + rng.normal(0, 3, index.size)
+    temperature = pd.Series(data, index=index)
+    temperature.iloc[rng.choice(temperature.size, 100)] = np.nan
+    # some whole days without data
+    temperature.iloc[100:200] = np.nan
+    return temperature
+
+
+@pytest.mark.parametrize("method", ["min_max", "mean", "integral", "pro"])
+@pytest.mark.parametrize("frequency", ["1D", "7D", "MS"])
+def test_cache_matches_dd_compute(method, frequency):
+    """Check that the cache returns the same degree days as ``dd_compute``."""
+    temperature = irregular_temperature()
+    cache = DegreeDaysCache(temperature, method=method, frequency=frequency)
+    for dd_type in ["heating", "cooling"]:
+        for reference in [-20, 5, 12.3, 17, 40]:
+            expected = (
+                dd_compute(temperature, reference, dd_type, method=method)
+                .resample(frequency)
+                .sum()
+            )
+            computed = cache.compute(reference, dd_type)
+            pd.testing.assert_series_equal(computed, expected, check_freq=False)
+
+
+@pytest.mark.parametrize("intraday_clip_tshd", [None, 0, 1.5])
+def test_cache_integral_clipping(intraday_clip_tshd):
+    """Check the clipping thresholds of the integral method."""
+    temperature = irregular_temperature()
+    cache = DegreeDaysCache(temperature, intraday_clip_tshd=intraday_clip_tshd)
+    for dd_type in ["heating", "cooling"]:
+        for clip_tshd in [None, 0, -2]:
+            expected = dd_compute(
+                temperature,
+                15,
+                dd_type,
+                clip_tshd=clip_tshd,
+                intraday_clip_tshd=intraday_clip_tshd,
+            )
+            np.testing.assert_allclose(
+                cache.daily_degree_days(15, dd_type, clip_tshd=clip_tshd),
+                expected.to_numpy(),
+            )
+    assert cache.days.equals(expected.index)
+
+
+@pytest.mark.parametrize("method", ["min_max", "mean", "integral", "pro"])
+def test_cache_many_references(method):
+    """Check that an array of references gives the degree days of each one."""
+    cache = DegreeDaysCache(irregular_temperature(), method=method, frequency="7D")
+    references = np.array([[5, 12.3], [17, 30]])
+    for dd_type in ["heating", "cooling"]:
+        degree_days = cache.degree_days(references, dd_type)
+        assert degree_days.shape == (2, 2, cache.periods.size)
+        for index in np.ndindex(references.shape):
+            np.testing.assert_array_equal(
+                degree_days[index],
+                cache.degree_days(references[index], dd_type),
+            )
+
+
+def test_cache_invalid_inputs():
+    """Check the errors raised for invalid methods and types."""
+    temperature = irregular_temperature()
+    with pytest.raises(EATInvalidDegreeDaysMethodError):
+        DegreeDaysCache(temperature, method="median")
+    with pytest.raises(EATInvalidDegreeDaysError):
+        DegreeDaysCache(temperature).compute(15, "both")
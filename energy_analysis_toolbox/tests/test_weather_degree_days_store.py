@@ -0,0 +1,93 @@
+"""Test the degree days store module."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from energy_analysis_toolbox.errors.degree_days import EATInvalidDegreeDaysMethodError
+from energy_analysis_toolbox.weather.degree_days import dd_compute
+from energy_analysis_toolbox.weather.degree_days_store import DegreeDayStore
+
+
+def station_temperature():
+    """Return 60 days of hourly temperature."""
+    rng = np.random.default_rng(7)
+    index = pd.date_range(
+        start="2023-01-01",
+        periods=24 * 60,
+        freq="1h",
+        tz="Europe/Paris",
+    )
+    data = 12 + 8 * np.sin(np.arange(index.size) / 30) + rng.normal(0, 3, index.size)
+    return pd.Series(data, index=index)
+
+
+@pytest.mark.parametrize("method", ["min_max", "mean", "integral", "pro"])
+@pytest.mark.parametrize("missing_day", [False, True])
+def test_store_matches_dd_compute(method, missing_day):
+    """Check the stored degree days against ``dd_compute``.
+
+    The degree days of a day without data are nan, as with ``dd_compute``.
+    """
+    temperature = station_temperature()
+    if missing_day:
+        temperature = temperature.drop(temperature.loc["2023-01-10"].index)
+    store = DegreeDayStore()
+    expected = dd_compute(temperature, 15, "heating", method=method)
+    assert expected.isna().sum() == missing_day
+    for _ in range(2):
+        computed = dd_compute(temperature, 15, "heating", method=method, store=store)
+        pd.testing.assert_series_equal(computed, expected, check_freq=False)
+    pd.testing.assert_series_equal(
+        store.resampled(temperature, 15, "heating", "7D", method=method),
+        expected.resample("7D").sum(),
+        check_freq=False,
+    )
+    pd.testing.assert_series_equal(
+        store.mean_temperature(temperature, "7D"),
+        temperature.resample("7D").mean(),
+    )
+    # daily and 7D degree days, their caches and the mean temperature
+    assert store.hits == 1
+    assert store.misses == 5
+    with pytest.raises(EATInvalidDegreeDaysMethodError):
+        store.daily(temperature, 15, "heating", method="median")
+
+
+def test_store_lru_eviction():
+    """Check that the least recently used results are evicted first."""
+    temperature = station_temperature()
+    store = DegreeDayStore()
+    store.mean_temperature(temperature, "1D")
+    size = store.nbytes
+    store = DegreeDayStore(max_bytes=2 * size)
+    store.mean_temperature(temperature, "1D")
+    store.mean_temperature(temperature, "1D", station="other")
+    store.mean_temperature(temperature, "1D")
+    store.mean_temperature(temperature, "1D", station="third")
+    assert len(store) == 2
+    assert store.nbytes == 2 * size
+    assert store.misses == 3
+    store.mean_temperature(temperature, "1D")
+    assert store.hits == 2
+    store.mean_temperature(temperature, "1D", station="other")
+    assert store.misses == 4
+    # a result larger than the budget is not stored
+    store = DegreeDayStore(max_bytes=size - 1)
+    store.mean_temperature(temperature, "1D")
+    assert len(store) == 0
+    store.clear()
+    assert store.nbytes == 0
+
+
+def test_store_stations():
+    """Check how the stations are identified, and that results are copies."""
+    temperature = station_temperature()
+    store = DegreeDayStore()
+    first = store.daily(temperature, 15, "heating", station="orly")
+    first.iloc[:] = -1
+    second = store.daily(temperature.copy(), 15, "heating", station="orly")
+    assert store.hits == 1
+    assert (second >= 0).all()
+    store.daily(temperature.copy(), 15, "heating")
+    assert store.hits == 1
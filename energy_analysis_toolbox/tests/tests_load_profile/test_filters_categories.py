@@ -362,3 +362,68 @@ def test_remove_categories_arbitrary():
         classificator=classificator,
     )
     pd.testing.assert_series_equal(filtered_s, history.iloc[0::2, 0])
+
+
+# =============================================================================
+# Vectorized and daily classificators
+# =============================================================================
+
+
+def test_vectorized_and_daily_classificators():
+    """Check that all the ways to call the classificator give the same filters."""
+    history = sinusoid_history_df(
+        start=pd.Timestamp("2022-01-03", tz="Europe/Paris"),
+        n_days=14,
+        freq="1h",
+    )
+    calls = []
+
+    def daily_classificator(index):
+        calls.append(len(index))
+        return np.where(index.dayofweek < 2, "closed", "open")
+
+    date = pd.Timestamp("2022-01-20 13:00", tz="Europe/Paris")
+    for kwargs in [{"vectorized": True}, {"vectorized": True, "daily": True}]:
+        pd.testing.assert_frame_equal(
+            same_category(history, date, daily_classificator, **kwargs),
+            same_category(history, date, casa_randazzo),
+        )
+        pd.testing.assert_frame_equal(
+            keep_categories(history, daily_classificator, ["open"], **kwargs),
+            keep_categories(history, casa_randazzo, [True]),
+        )
+        pd.testing.assert_frame_equal(
+            remove_categories(history, daily_classificator, ["open"], **kwargs),
+            remove_categories(history, casa_randazzo, [True]),
+        )
+    assert calls[-1] == 14
+    pd.testing.assert_frame_equal(
+        keep_categories(history, casa_randazzo, [False], daily=True),
+        history.loc[history.index.dayofweek < 2],
+    )
+
+
+def test_tuple_categories():
+    """Check that tuple categories are compared as a whole."""
+    history = sinusoid_history_df(
+        start=pd.Timestamp("2024-01-05"),
+        n_days=2,
+        freq="1h",
+    )
+
+    def classificator(timestamp):
+        return (timestamp.day, timestamp.hour < 12)
+
+    morning = history.iloc[:12]
+    pd.testing.assert_frame_equal(
+        keep_categories(history, classificator, [(5, True)]),
+        morning,
+    )
+    pd.testing.assert_frame_equal(
+        remove_categories(history, classificator, [(5, True)]),
+        history.iloc[12:],
+    )
+    pd.testing.assert_frame_equal(
+        same_category(history, pd.Timestamp("2024-01-05 03:00"), classificator),
+        morning,
+    )
@@ -0,0 +1,107 @@
+"""Tests for the composition of history filters in a pipeline."""
+
+import numpy as np
+import pandas as pd
+import pytest
+import scipy.constants as SK
+
+from energy_analysis_toolbox.timeseries.profiles.preprocessing.history_filters import (
+    HistoryFilterPipeline,
+)
+from energy_analysis_toolbox.timeseries.profiles.preprocessing.history_filters.categories import (
+    keep_categories,
+    remove_categories,
+    same_category,
+)
+from energy_analysis_toolbox.timeseries.profiles.preprocessing.history_filters.weekdays import (
+    same_day_only,
+    weekdays_only,
+    weekends_only,
+)
+
+from .fake_data import sinusoid_history_df
+
+
+def odd_day(timestamp):
+    """Return True if the day of month of the timestamp is odd."""
+    return timestamp.day % 2 == 1
+
+
+def history_example():
+    """Return 5 weeks of hourly history."""
+    return sinusoid_history_df(
+        start=pd.Timestamp("2022-01-03"),
+        n_days=35,
+        freq="1h",
+        period_variation=7 * SK.day,
+    )
+
+
+@pytest.mark.parametrize("as_series", [False, True])
+def test_pipeline_same_as_chained_filters(as_series):
+    """Check that the pipeline returns the same rows as the chained filters."""
+    history = history_example()
+    if as_series:
+        history = history.iloc[:, 0]
+    pipeline = (
+        HistoryFilterPipeline()
+        .weekdays_only()
+        .remove_categories(odd_day, remove=[True], daily=True)
+        .same_day_only()
+    )
+    expected = same_day_only(
+        remove_categories(weekdays_only(history), odd_day, remove=[True]),
+    )
+    assert len(pipeline) == 3
+    if as_series:
+        pd.testing.assert_series_equal(pipeline(history), expected, check_freq=False)
+    else:
+        pd.testing.assert_frame_equal(pipeline(history), expected, check_freq=False)
+    positions = pipeline.positions(history.index)
+    pd.testing.assert_index_equal(
+        history.index[positions],
+        expected.index,
+        exact=False,
+    )
+    mask = pipeline.mask(history.index)
+    assert mask.sum() == expected.shape[0]
+
+
+def test_pipeline_categories():
+    """Check the category steps and the custom steps of the pipeline."""
+    history = history_example()
+    date = pd.Timestamp("2022-02-05")
+    pipeline = (
+        HistoryFilterPipeline()
+        .same_category(date, odd_day)
+        .keep_categories(
+            lambda index: index.hour,
+            keep=[8, 9, 10],
+            vectorized=True,
+        )
+        .weekends_only()
+        .add(lambda index: index.day_of_week == 5)
+    )
+    expected = keep_categories(
+        same_category(history, date, odd_day),
+        lambda timestamp: timestamp.hour,
+        keep=[8, 9, 10],
+    )
+    expected = weekends_only(expected)
+    expected = expected.loc[expected.index.day_of_week == 5]
+    pd.testing.assert_frame_equal(pipeline.apply(history), expected)
+    assert not expected.empty
+
+
+def test_pipeline_edge_cases():
+    """Check empty pipelines, empty histories and empty results."""
+    history = history_example()
+    pd.testing.assert_frame_equal(HistoryFilterPipeline()(history), history)
+    pipeline = HistoryFilterPipeline().weekdays_only().weekends_only().same_day_only()
+    assert pipeline(history).empty
+    assert pipeline.positions(history.index).size == 0
+    assert pipeline(history.iloc[:0]).empty
+    np.testing.assert_array_equal(
+        HistoryFilterPipeline().same_category().mask(history.index),
+        np.ones(history.shape[0], dtype=bool),
+    )
@@ -1,9 +1,21 @@
 """Tests for the ``MeanProfile`` base class.
 """
 
+import warnings
+
+import numpy as np
 import pandas as pd
+import pytest
 
+from energy_analysis_toolbox.timeseries.profiles.localization import (
+    LocalizedMeanProfile,
+)
 from energy_analysis_toolbox.timeseries.profiles.mean_profile import MeanProfile
+from energy_analysis_toolbox.timeseries.profiles.thresholds import (
+    HybridThreshold,
+    RelativeSTDThreshold,
+    RelativeThreshold,
+)
 
 from .check import compare_profiles
 from .fake_data import sinusoid_history
@@ -25,3 +37,100 @@ def test_daily_2():
     expected = history.iloc[:96].copy()
     expected.index += 30 * pd.Timedelta("1D")
     assert expected.size == daily.size
+
+
+def trailing_history(history, time, duration):
+    """Return the history in ``[time - duration, time[``."""
+    return history[(history.index >= time - duration) & (history.index < time)]
+
+
+@pytest.mark.parametrize(
+    ("profile_class", "kwargs"),
+    [
+        (MeanProfile, {}),
+        (MeanProfile, {"window": 4, "is_max": False}),
+        (RelativeThreshold, {"window": 3}),
+        (RelativeSTDThreshold, {}),
+        (HybridThreshold, {"window": 3}),
+        (HybridThreshold, {"is_max": False}),
+    ],
+)
+@pytest.mark.parametrize("trailing", [None, "14D", "9D 7h"])
+@pytest.mark.parametrize("tz", [None, "Europe/Paris"])
+def test_compute_many_same_as_loop(profile_class, kwargs, trailing, tz):
+    """Check that the stacked profiles are the ones computed for each target."""
+    rng = np.random.default_rng(0)
+    index = pd.date_range("2023-09-01", periods=70 * 48, freq="30min", tz=tz)
+    history = pd.Series(rng.random(index.size), index=index, name="example")
+    history.iloc[rng.integers(0, index.size, 100)] = np.nan
+    history = history.drop(history.index[rng.integers(0, index.size, 50)])
+    times = pd.date_range("2023-10-01", periods=45, freq="D", tz=tz)
+    profile = profile_class(**kwargs)
+    if trailing is None:
+        expected = pd.concat([profile.compute(history, time) for time in times])
+    else:
+        duration = pd.Timedelta(trailing)
+        expected = pd.concat(
+            [
+                profile.compute(trailing_history(history, time, duration), time)
+                for time in times
+            ],
+        )
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        obtained = profile.compute_many(history, times, trailing)
+    pd.testing.assert_series_equal(obtained, expected, rtol=1e-10)
+    assert profile.compute_many(history, times[:0], trailing).empty
+
+
+@pytest.mark.parametrize("first_time", ["2023-10-27", "2024-03-28"])
+def test_compute_many_localized(first_time):
+    """Check that localized profiles are the ones of compute across a DST change."""
+    first_time = pd.Timestamp(first_time, tz="Europe/Paris")
+    index = pd.date_range(
+        first_time - pd.Timedelta("30D"),
+        first_time + pd.Timedelta("10D"),
+        freq="1h",
+    )
+    history = pd.Series(np.arange(index.size, dtype=float), index=index)
+    times = pd.date_range(first_time, periods=5, freq="D")
+    profile = LocalizedMeanProfile(window=3)
+    week = pd.Timedelta("7D")
+    expected = pd.concat(
+        [
+            profile.compute(trailing_history(history, time, week), time)
+            for time in times
+        ],
+    )
+    pd.testing.assert_series_equal(profile.compute_many(history, times, "7D"), expected)
+
+
+@pytest.mark.parametrize("window", [1, 3])
+def test_statistics_same_as_groupby(window):
+    """Check the fused mean and std profiles against the pandas groupby."""
+    rng = np.random.default_rng(1)
+    index = pd.date_range("2023-10-01", periods=20 * 96, freq="15min", name="time")
+    history = pd.Series(rng.random(index.size), index=index, name="example")
+    history.iloc[rng.integers(0, index.size, 100)] = np.nan
+    profile = MeanProfile(window=window)
+    mean, std = profile.statistics(history)
+    expected_mean = profile.group(profile.smooth(history)).mean()
+    pd.testing.assert_series_equal(mean, expected_mean, rtol=1e-12)
+    pd.testing.assert_series_equal(std, profile.group(history).std(), rtol=1e-12)
+    table = history.to_frame().assign(double=2 * history, label="a")
+    mean, std = profile.statistics(table, std=False)
+    assert std is None
+    expected_mean = profile.group(profile.smooth(table[["example", "double"]])).mean()
+    pd.testing.assert_frame_equal(mean, expected_mean, rtol=1e-12)
+
+
+def test_slot_codes_cache():
+    """Check that the slots are reused for the same index only."""
+    history = sinusoid_history(freq="30min", noise=0, n_days=7)
+    profile = MeanProfile()
+    slots, codes = profile.slot_codes(history.index)
+    assert profile.slot_codes(history.index)[1] is codes
+    np.testing.assert_array_equal(slots, np.arange(48) * 1800 * 10**9)
+    np.testing.assert_array_equal(codes, np.tile(np.arange(48), 7))
+    shifted = history.index + pd.Timedelta("15min")
+    assert profile.slot_codes(shifted)[1] is not codes
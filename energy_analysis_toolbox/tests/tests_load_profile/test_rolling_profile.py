@@ -1,5 +1,7 @@
 """Testing module for rolling_profile"""
 
+import warnings
+from functools import partial
 from itertools import product
 
 import numpy as np
@@ -9,6 +11,8 @@ import pytest
 from energy_analysis_toolbox.timeseries.profiles.rolling_profile import (
     RollingProfile,
     RollingQuantileProfile,
+    daily_matrix,
+    rows_aggregation,
 )
 
 
@@ -236,3 +240,93 @@ def test_daily_pivot_duplicated_index():
         result.index,
         pd.timedelta_range(0, "1day", freq=freq, closed="left", name="time"),
     )
+
+
+@pytest.mark.parametrize("window", ["60min", "25min", 3, 4])
+@pytest.mark.parametrize(
+    "aggregation",
+    [
+        np.mean,
+        np.nanmax,
+        partial(np.quantile, q=0.3),
+        partial(np.std, ddof=1),
+        lambda x: np.nanmax(x) - np.nanmin(x),
+    ],
+)
+def test_windowed_rolling_agg_same_as_pandas_apply(window, aggregation):
+    """Check the aggregation against a ``pandas`` rolling apply on each window.
+
+    The history has missing values, a dropped row and a winter DST.
+    """
+    rng = np.random.default_rng(4)
+    index = pd.date_range("2023-10-25", "2023-11-03", freq="10min", tz="Europe/Paris")
+    history = pd.DataFrame({"value": rng.random(index.size)}, index=index)
+    history.iloc[rng.integers(0, index.size, 30)] = np.nan
+    history = history.drop(history.index[[50, 51]])
+    profiler = RollingProfile(window, aggregation)
+    pivoted = profiler.daily_pivot(history)
+    pivoted.iloc[[0, 2, 5], 0] = np.nan
+    expected = (
+        pivoted.iloc[:, 0]
+        .rolling(window, center=True)
+        .apply(
+            lambda sub: aggregation(
+                pivoted.loc[sub.index[0] : sub.index[-1], :].to_numpy().ravel(),
+            ),
+            raw=False,
+        )
+        .rename("value")
+        .to_frame()
+    )
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        obtained = profiler.windowed_rolling_agg(pivoted)
+    pd.testing.assert_frame_equal(obtained, expected, check_exact=True)
+
+
+def test_rows_aggregation():
+    """Check which aggregations are computed on the rows of 2D arrays."""
+    values = np.arange(10.0).reshape(2, 5)
+    np.testing.assert_allclose(
+        rows_aggregation(partial(np.quantile, q=0.8))(values),
+        [3.2, 8.2],
+    )
+    np.testing.assert_allclose(rows_aggregation(np.std)(values), [2**0.5] * 2)
+    assert rows_aggregation(lambda x: np.std(x)) is None
+    assert rows_aggregation(partial(np.mean, axis=0)) is None
+
+
+@pytest.mark.parametrize("tz", [None, "UTC", "Europe/Paris", "Asia/Katmandu"])
+@pytest.mark.parametrize("naive", [False, True])
+@pytest.mark.parametrize("freq", ["10min", "1h", "15s"])
+def test_daily_matrix_same_as_pivot(tz, naive, freq):
+    """Check the table against the pivot on histories with DSTs and missing data."""
+    rng = np.random.default_rng(2)
+    index = pd.date_range("2023-10-26 00:07", "2023-11-01", freq=freq, tz=tz)
+    history = pd.DataFrame({"value": rng.random(index.size)}, index=index)
+    history.iloc[rng.integers(0, index.size, 50)] = np.nan
+    history.iloc[:40] = np.nan
+    history = history.drop(history.index[rng.integers(0, index.size, 100)])
+    if naive:
+        history = history.tz_localize(None)
+    pivoted = pd.pivot_table(
+        history.assign(
+            time=history.index - history.index.floor("D"),
+            day=history.index.date,
+        ),
+        index="time",
+        columns=["day"],
+        values=["value"],
+    )["value"]
+    pd.testing.assert_frame_equal(daily_matrix(history["value"]), pivoted)
+
+
+def test_daily_matrix_irregular():
+    """Check that the pivot is used when the time-of-day are not aligned."""
+    index = pd.date_range("2023-06-21", periods=1000, freq="7min")
+    history = pd.DataFrame({"value": np.arange(1000.0)}, index=index)
+    assert daily_matrix(history["value"]) is None
+    assert daily_matrix(history["value"].iloc[:0]) is None
+    pivoted = RollingProfile(None, None).daily_pivot(history)
+    assert pivoted.shape == (1000, 5)
+    assert pivoted.count().sum() == 1000
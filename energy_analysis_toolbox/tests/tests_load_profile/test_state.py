@@ -0,0 +1,81 @@
+"""Tests for the ``TrailingProfileState`` class."""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from energy_analysis_toolbox.errors import EATInvalidTimeseriesError
+from energy_analysis_toolbox.timeseries.profiles import (
+    MeanProfile,
+    TrailingProfileState,
+)
+from energy_analysis_toolbox.timeseries.profiles.thresholds import (
+    HybridThreshold,
+    RelativeSTDThreshold,
+    RelativeThreshold,
+)
+
+
+def daily_chunks(tz=None, n_days=30):
+    """Return the days of a random history with missing values and samples."""
+    rng = np.random.default_rng(0)
+    index = pd.date_range("2023-10-01", periods=n_days * 48, freq="30min", tz=tz)
+    history = pd.Series(100 + rng.random(index.size), index=index, name="example")
+    history.iloc[rng.integers(0, index.size, 150)] = np.nan
+    history = history.drop(history.index[rng.integers(0, index.size, 50)])
+    days = pd.date_range("2023-10-01", periods=n_days + 1, freq="D", tz=tz)
+    return days[1:], [
+        history[(history.index >= start) & (history.index < end)]
+        for start, end in zip(days[:-1], days[1:])
+    ]
+
+
+@pytest.mark.parametrize(
+    "profile",
+    [
+        MeanProfile(),
+        MeanProfile(window=4, is_max=False),
+        RelativeThreshold(window=3),
+        RelativeSTDThreshold(),
+        HybridThreshold(window=3),
+        HybridThreshold(window=5, is_max=False),
+    ],
+)
+@pytest.mark.parametrize("n_periods", [1, 3, 14])
+@pytest.mark.parametrize("tz", [None, "Europe/Paris"])
+def test_state_same_as_compute(profile, n_periods, tz):
+    """Check the profile after each update against the profile of the history."""
+    ends, chunks = daily_chunks(tz=tz)
+    chunks[12] = chunks[12].iloc[:0]
+    state = TrailingProfileState(profile, n_periods)
+    for i, (end, chunk) in enumerate(zip(ends, chunks)):
+        state.push(chunk)
+        assert len(state) == min(i + 1, n_periods)
+        history = pd.concat(chunks[max(0, i + 1 - n_periods) : i + 1])
+        if history.empty:
+            continue
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            obtained = state.compute(end)
+        pd.testing.assert_series_equal(
+            obtained,
+            profile.compute(history, end),
+            rtol=1e-9,
+            check_freq=False,
+        )
+
+
+def test_state_errors():
+    """Check that declared errors are raised."""
+    _, chunks = daily_chunks(n_days=3)
+    with pytest.raises(ValueError, match="periods"):
+        TrailingProfileState(MeanProfile(), 0)
+    state = TrailingProfileState(MeanProfile(), 2)
+    state.push(chunks[1])
+    with pytest.raises(EATInvalidTimeseriesError):
+        state.push(chunks[0])
+    with pytest.raises(EATInvalidTimeseriesError):
+        state.push(chunks[2].iloc[::-1])
+    assert len(state) == 1
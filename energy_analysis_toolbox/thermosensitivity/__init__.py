@@ -5,6 +5,7 @@ from .daily_analysis import (
     DailyCategoricalThermoSensitivity,
     DayOfWeekCategoricalThermoSensitivity,
 )
+from .portfolio import fit_portfolio
 from .thermosensitivity import (
     CategoricalThermoSensitivity,
     ThermoSensitivity,
@@ -10,6 +10,7 @@ from energy_analysis_toolbox.weather.degree_days import (
     literal_computation_dd_types,
     literal_dd_types,
 )
+from energy_analysis_toolbox.weather.degree_days_store import DegreeDayStore
 
 from .thermosensitivity import CategoricalThermoSensitivity
 
@@ -38,6 +39,7 @@ class DailyCategoricalThermoSensitivity(
         interseason_mean_temperature: float = 20,
         base_logger_name: str | None = None,
         min_logger_level_stdout: int | str = logging.ERROR,
+        degree_days_store: DegreeDayStore | None = None,
     ) -> None:
         """Initialize a ``DailyCategoricalThermoSensitivity`` instance.
 
@@ -87,6 +89,10 @@ class DailyCategoricalThermoSensitivity(
         min_logger_level_stdout: str, int, optional
             Minimum logger level below which no message is transferred to stdout
             (i.e. not printed). Default is ``"ERROR"``.
+        degree_days_store : DegreeDayStore, optional
+            A store shared by the buildings of a weather station. See
+            :py:class:`energy_analysis_toolbox.weather.degree_days_store.DegreeDayStore`.
+            Default is None.
 
         """
         frequency = "1D"
@@ -111,6 +117,7 @@ class DailyCategoricalThermoSensitivity(
             interseason_mean_temperature=interseason_mean_temperature,
             base_logger_name=base_logger_name,
             min_logger_level_stdout=min_logger_level_stdout,
+            degree_days_store=degree_days_store,
         )
 
 
@@ -132,6 +139,7 @@ class DayOfWeekCategoricalThermoSensitivity(
         interseason_mean_temperature: float = 20,
         base_logger_name: str | None = None,
         min_logger_level_stdout: int | str = logging.ERROR,
+        degree_days_store: DegreeDayStore | None = None,
     ) -> None:
         """Initialize a ``DayOfWeekCategoricalThermoSensitivity`` instance.
 
@@ -176,6 +184,10 @@ class DayOfWeekCategoricalThermoSensitivity(
         min_logger_level_stdout: str, int, optional
             Minimum logger level below which no message is transferred to stdout
             (i.e. not printed). Default is ``"ERROR"``.
+        degree_days_store : DegreeDayStore, optional
+            A store shared by the buildings of a weather station. See
+            :py:class:`energy_analysis_toolbox.weather.degree_days_store.DegreeDayStore`.
+            Default is None.
 
         """
         degree_days_base_temperature = degree_days_base_temperature or {}
@@ -222,6 +234,7 @@ class DayOfWeekCategoricalThermoSensitivity(
             interseason_mean_temperature=interseason_mean_temperature,
             base_logger_name=base_logger_name,
             min_logger_level_stdout=min_logger_level_stdout,
+            degree_days_store=degree_days_store,
         )
 
 
@@ -0,0 +1,100 @@
+r"""Least-squares kernels used to calibrate the thermosensitivity models.
+
+The calibration of the base temperatures only needs the residual error of the
+linear model for each base temperature tried. The functions of this module compute
+it on NumPy arrays, for a few predictors and an intercept, without building a
+full ``statsmodels`` model. The final model, which users inspect, is still fitted
+with ``statsmodels``.
+
+The fit is computed on centered data, so that the intercept does not appear in the
+normal equations:
+
+.. math::
+    (X_c^T X_c) \\beta = X_c^T y_c
+
+where :math:`X_c` and :math:`y_c` are the predictors and the target minus their
+mean. The residuals are then computed explicitly, which avoids the loss of precision
+of :math:`y_c^T y_c - \\beta^T X_c^T y_c` when the fit is almost perfect.
+
+"""
+
+import numpy as np
+
+
+def residual_mse(
+    target: np.ndarray,
+    predictors: np.ndarray,
+) -> float | np.ndarray:
+    """Return the mean squared error of the residuals of a linear model.
+
+    The model is fitted by ordinary least squares, with an intercept added to the
+    predictors. The result is the same as ``OLS(target, [predictors, 1]).fit()
+    .mse_resid`` from ``statsmodels``, including for rank-deficient predictors,
+    e.g. degree days which are all zeros.
+
+    Parameters
+    ----------
+    target : np.ndarray
+        The array of the ``n`` observations to be modeled.
+    predictors : np.ndarray
+        The predictors, without the intercept, with shape:
+
+        - ``(n,)`` for a single predictor;
+        - ``(n, p)`` for ``p`` predictors;
+        - ``(b, n, p)`` for a batch of ``b`` designs of ``p`` predictors, all
+          fitted on the same ``target``.
+
+    Returns
+    -------
+    float or np.ndarray
+        The sum of the squared residuals divided by the degrees of freedom of the
+        residuals. An array of shape ``(b,)`` is returned for a batch of designs.
+
+    Raises
+    ------
+    ValueError
+        If the predictors have more than 3 dimensions.
+
+    Examples
+    --------
+    >>> x = np.arange(10.0)
+    >>> y = 2 * x + 1 + np.array([1, -1] * 5)
+    >>> residual_mse(y, x)
+    1.212121212121212
+
+    """
+    max_predictors_ndim = 3
+    target = np.asarray(target, dtype=np.float64)
+    predictors = np.asarray(predictors, dtype=np.float64)
+    if predictors.ndim == 1:
+        predictors = predictors[:, np.newaxis]
+    if predictors.ndim > max_predictors_ndim:
+        err = f"Predictors must have at most 3 dimensions, not {predictors.ndim}."
+        raise ValueError(err)
+    centered_target = target - target.mean()
+    centered = predictors - predictors.mean(axis=-2, keepdims=True)
+    transposed = np.swapaxes(centered, -1, -2)
+    gram = transposed @ centered
+    cross = transposed @ centered_target
+    # pseudo-inverse of the gram matrix, which also gives its rank
+    eigenvalues, eigenvectors = np.linalg.eigh(gram)
+    tolerance = (
+        eigenvalues.max(axis=-1, keepdims=True)
+        * gram.shape[-1]
+        * np.finfo(np.float64).eps
+    )
+    is_kept = eigenvalues > tolerance
+    inverses = np.divide(
+        1.0,
+        eigenvalues,
+        out=np.zeros_like(eigenvalues),
+        where=is_kept,
+    )
+    projected = np.einsum("...ji,...j->...i", eigenvectors, cross) * inverses
+    coefficients = np.einsum("...ij,...j->...i", eigenvectors, projected)
+    residuals = centered_target - np.einsum("...ij,...j->...i", centered, coefficients)
+    # the intercept adds one to the rank of the centered predictors
+    rank = is_kept.sum(axis=-1) + 1
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mse = np.einsum("...i,...i->...", residuals, residuals) / (target.size - rank)
+    return mse if mse.ndim else float(mse)
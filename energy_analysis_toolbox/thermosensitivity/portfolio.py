@@ -0,0 +1,183 @@
+"""Fit the thermosensitivity of the buildings of a portfolio.
+
+The :py:func:`fit_portfolio` function fits one thermosensitivity model per building,
+in a pool of processes. Buildings are grouped by weather station, i.e. by temperature
+series, and the models of a task share a
+:py:class:`energy_analysis_toolbox.weather.degree_days_store.DegreeDayStore`, so that
+the temperature-side work is done once per station in each task.
+
+A failure of one building is reported in the results table, without stopping the
+fit of the others.
+
+Examples
+--------
+>>> buildings = {
+...     "school": (school_energy, station_temperature),
+...     "office": (office_energy, station_temperature),
+... }
+>>> fit_portfolio(buildings, degree_days_type="auto", max_workers=4)
+        degree_days_type  heating_base_temperature  ...  r_squared error
+school           heating                     16.21  ...       0.91  None
+office              both                     15.48  ...       0.87  None
+
+"""
+
+from collections.abc import Hashable, Mapping
+from concurrent.futures import ProcessPoolExecutor
+from copy import deepcopy
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from energy_analysis_toolbox.weather.degree_days_store import DegreeDayStore
+
+from .thermosensitivity import ThermoSensitivity, literal_calibration_methods
+
+
+def fit_portfolio(
+    buildings: Mapping[Hashable, tuple],
+    model_class: type[ThermoSensitivity] = ThermoSensitivity,
+    *,
+    calibration_method: literal_calibration_methods = "bounded",
+    max_workers: int | None = None,
+    chunksize: int = 16,
+    **model_kwargs,
+) -> pd.DataFrame:
+    """Fit a thermosensitivity model for each building of a portfolio.
+
+    Parameters
+    ----------
+    buildings : Mapping[Hashable, tuple]
+        The data of each building, as a tuple ``(energy, temperature, *args)``,
+        where ``args`` are the other positional arguments of ``model_class``, e.g.
+        the categories of a
+        :py:class:`energy_analysis_toolbox.thermosensitivity.CategoricalThermoSensitivity`.
+        Buildings on the same weather station should share the same temperature
+        series object, which is then processed once.
+    model_class : type, optional
+        The class of the models, ``ThermoSensitivity`` or one of its subclasses.
+        The default is ``ThermoSensitivity``.
+    calibration_method : {"bounded", "grid"}, optional
+        The method used to calibrate the base temperatures.
+        See :py:meth:`ThermoSensitivity.calibrate_base_temperatures`.
+        The default is "bounded".
+    max_workers : int or None, optional
+        The maximum number of processes. If ``1``, the models are fitted in the
+        current process. The default is None, i.e. the number of processors.
+    chunksize : int, optional
+        The maximum number of buildings of a station fitted by one task of the pool.
+        The default is 16.
+    model_kwargs : mapping, optional
+        The keyword arguments passed to ``model_class``, e.g. the ``frequency`` or the
+        ``degree_days_type``. A ``degree_days_store`` is shared by all the models
+        if ``max_workers`` is ``1``, and filled in place. With several processes,
+        each task works on its own copy of it, and the store of the caller is not
+        modified. Without a store, each task uses a new store with the default
+        memory budget.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per building, in the order of ``buildings``, with the columns:
+
+        - ``degree_days_type`` : the type of the degree days of the model;
+        - ``heating_base_temperature`` and ``cooling_base_temperature``;
+        - ``r_squared`` and ``n_observations`` of the model, the latter with the
+          nullable ``Int64`` dtype;
+        - the coefficients of the model, named as its predictors;
+        - ``error`` : the error raised by the building, None if the fit succeeded.
+
+    Raises
+    ------
+    ValueError
+        If ``chunksize`` is lower than 1.
+
+    Notes
+    -----
+    With several processes, the data, the ``model_class`` and the ``model_kwargs``
+    must be picklable, e.g. the categories function of a
+    :py:class:`energy_analysis_toolbox.thermosensitivity.DailyCategoricalThermoSensitivity`
+    cannot be a lambda.
+
+    """
+    if chunksize < 1:
+        err = f"chunksize must be at least 1, not {chunksize}."
+        raise ValueError(err)
+    stations: dict[int, tuple[pd.Series, list]] = {}
+    for building, (energy, temperature, *args) in buildings.items():
+        _, station_buildings = stations.setdefault(id(temperature), (temperature, []))
+        station_buildings.append((building, energy, args))
+    tasks = [
+        (
+            temperature,
+            station_buildings[start : start + chunksize],
+            model_class,
+            calibration_method,
+            model_kwargs,
+        )
+        for temperature, station_buildings in stations.values()
+        for start in range(0, len(station_buildings), chunksize)
+    ]
+    if max_workers == 1:
+        chunks = [_fit_station_chunk(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            chunks = list(executor.map(_fit_station_chunk, *zip(*tasks, strict=True)))
+    results = {building: row for chunk in chunks for building, row in chunk}
+    table = pd.DataFrame.from_dict(results, orient="index")
+    columns = [column for column in table.columns if column != "error"]
+    table = table.reindex(index=list(buildings), columns=[*columns, "error"])
+    if "n_observations" in table:
+        # the failed buildings would turn the counts into floats
+        table["n_observations"] = table["n_observations"].astype("Int64")
+    return table
+
+
+def _fit_station_chunk(
+    temperature: pd.Series,
+    station_buildings: list[tuple[Hashable, pd.Series, list]],
+    model_class: type[ThermoSensitivity],
+    calibration_method: literal_calibration_methods,
+    model_kwargs: dict[str, Any],
+) -> list[tuple[Hashable, dict]]:
+    """Fit the models of buildings sharing a temperature series.
+
+    The models share a store, so that the temperature-side work is done once.
+    """
+    model_kwargs = dict(model_kwargs)
+    store = model_kwargs.pop("degree_days_store", None)
+    if store is None:
+        store = DegreeDayStore()
+    results = []
+    for building, energy, args in station_buildings:
+        try:
+            model = model_class(
+                energy,
+                temperature,
+                *args,
+                degree_days_store=store,
+                **deepcopy(model_kwargs),
+            )
+            model.fit(calibration_method=calibration_method)
+        except Exception as error:  # noqa:BLE001
+            results.append((building, {"error": f"{type(error).__name__}: {error}"}))
+            continue
+        results.append((building, _model_summary(model)))
+    return results
+
+
+def _model_summary(
+    model: ThermoSensitivity,
+) -> dict:
+    """Return the row of a fitted model in the results table."""
+    base_temperatures = model.degree_days_base_temperature
+    return {
+        "degree_days_type": model.degree_days_type,
+        "heating_base_temperature": base_temperatures.get("heating", np.nan),
+        "cooling_base_temperature": base_temperatures.get("cooling", np.nan),
+        "r_squared": model.model.rsquared,
+        "n_observations": int(model.model.nobs),
+        **model.model.params.to_dict(),
+        "error": None,
+    }
@@ -99,7 +99,14 @@ is calibrated by minimizing the mean squared error between the energy and the he
 above) the intersaison mean temperature.
 
 The optimization is done with the `scipy.optimize.minimize_scalar` function with the
-`bounded` method.
+`bounded` method. The temperature data is processed once in a
+`energy_analysis_toolbox.weather.degree_days_cache.DegreeDaysCache`, so that each
+base temperature tried by the optimizer does not go through the whole temperature data.
+
+The ``"grid"`` calibration method first evaluates the loss at once on a grid of base
+temperatures, which is more robust to local minima, and then refines the best one with
+the bounded optimization. When both heating and cooling degree days are used, the grid
+covers all the pairs of base temperatures, which are calibrated jointly.
 
 """
 
@@ -116,6 +123,7 @@ from statsmodels.api import OLS
 
 from energy_analysis_toolbox.energy.resample import to_freq as energy_to_freq
 from energy_analysis_toolbox.logger import init_logging
+from energy_analysis_toolbox.thermosensitivity.least_squares import residual_mse
 from energy_analysis_toolbox.weather.degree_days import (
     dd_compute,
     dd_types,
@@ -123,11 +131,34 @@ from energy_analysis_toolbox.weather.degree_days import (
     literal_dd_types,
     literal_valid_dd_types,
 )
+from energy_analysis_toolbox.weather.degree_days_cache import DegreeDaysCache
+from energy_analysis_toolbox.weather.degree_days_store import DegreeDayStore
 
 if TYPE_CHECKING:
     from pandas.core.resample import Resampler
 
 
+calibration_methods = [
+    "bounded",
+    "grid",
+]
+literal_calibration_methods = Literal[
+    "bounded",
+    "grid",
+]
+# maximum number of values of the designs evaluated at once by the joint grid search
+GRID_CHUNK_SIZE = 2**22
+
+
+def _base_temperature_grid(
+    bounds: tuple[float, float],
+    step: float,
+) -> np.ndarray:
+    """Return the base temperatures regularly spaced within the bounds."""
+    n_points = int(np.ceil((bounds[1] - bounds[0]) / step)) + 1
+    return np.linspace(bounds[0], bounds[1], n_points)
+
+
 ThermosensitivityInstance = TypeVar(
     "ThermosensitivityInstance",
     bound="ThermoSensitivity",
@@ -199,6 +230,7 @@ class ThermoSensitivity:
         interseason_mean_temperature: float = 20,
         base_logger_name: str | None = None,
         min_logger_level_stdout: int | str = logging.ERROR,
+        degree_days_store: DegreeDayStore | None = None,
     ) -> None:
         """Initialize a ``ThermoSensitivity`` instance.
 
@@ -245,6 +277,11 @@ class ThermoSensitivity:
         min_logger_level_stdout: str, int, optional
             Minimum logger level below which no message is transferred to stdout
             (i.e. not printed). Default is ``"ERROR"``.
+        degree_days_store : DegreeDayStore, optional
+            A store shared by the buildings of a weather station, so that the
+            temperature-side computations are done once per station. See
+            :py:class:`energy_analysis_toolbox.weather.degree_days_store.DegreeDayStore`.
+            Default is None, i.e. no sharing.
 
         Raises
         ------
@@ -268,6 +305,7 @@ class ThermoSensitivity:
         self.degree_days_type = degree_days_type
         self.degree_days_base_temperature = degree_days_base_temperature or {}
         self.degree_days_computation_method = degree_days_computation_method
+        self.degree_days_store = degree_days_store
         self.interseason_mean_temperature = interseason_mean_temperature
         self.predictors: list[str] = []
         self._model = None
@@ -389,6 +427,11 @@ class ThermoSensitivity:
 
         This property is cached to avoid recomputing it multiple times.
         """
+        if self.degree_days_store is not None:
+            return self.degree_days_store.mean_temperature(
+                self.temperature_data,
+                self.frequency,
+            ).rename(self.temperature_name)
         return (
             self.temperature_data.resample(self.frequency)
             .mean()
@@ -409,6 +452,29 @@ class ThermoSensitivity:
             axis=1,
         ).dropna(how="any", axis=0)
 
+    @cached_property
+    def degree_days_cache(
+        self,
+    ) -> DegreeDaysCache:
+        """The degree days of the temperature data, for any base temperature.
+
+        The temperature data is processed once, so that the degree days are cheap
+        to compute for each base temperature tried during the calibration.
+
+        This property is cached to avoid recomputing it multiple times.
+        """
+        if self.degree_days_store is not None:
+            return self.degree_days_store.cache(
+                self.temperature_data,
+                method=self.degree_days_computation_method,
+                frequency=self.frequency,
+            )
+        return DegreeDaysCache(
+            self.temperature_data,
+            method=self.degree_days_computation_method,
+            frequency=self.frequency,
+        )
+
     @property
     def model(
         self,
@@ -649,23 +715,48 @@ class ThermoSensitivity:
         for dd_type in degree_days_base_temperature:
             if self.degree_days_type in [dd_type, "both"]:
                 degree_days = [
-                    dd_compute(
-                        self.temperature_data,
+                    self._resampled_degree_days(
                         degree_days_base_temperature[dd_type],
-                        dd_type=dd_type,
-                        method=self.degree_days_computation_method,
+                        dd_type,
                     )
-                    .resample(self.frequency)
-                    .sum()
                     for dd_type in degree_days_base_temperature
                 ]
         return pd.concat(degree_days, axis=1)
 
+    def _resampled_degree_days(
+        self,
+        reference: float,
+        dd_type: literal_valid_dd_types,
+    ) -> pd.Series:
+        """Return the degree days of the temperature data at the frequency."""
+        if self.degree_days_store is not None:
+            return self.degree_days_store.resampled(
+                self.temperature_data,
+                reference,
+                dd_type,
+                self.frequency,
+                method=self.degree_days_computation_method,
+            )
+        return (
+            dd_compute(
+                self.temperature_data,
+                reference,
+                dd_type=dd_type,
+                method=self.degree_days_computation_method,
+            )
+            .resample(self.frequency)
+            .sum()
+        )
+
     def calibrate_base_temperature(
         self,
         dd_type: literal_dd_types = "heating",
         t0: float | None = None,
         xatol: float = 1e-1,
+        *,
+        method: literal_calibration_methods = "bounded",
+        grid_step: float = 0.5,
+        refine: bool = True,
     ) -> float:
         """Calibrate the base temperature for the specified degree days type.
 
@@ -674,6 +765,11 @@ class ThermoSensitivity:
         the degree days model. The optimization is done using the
         `scipy.optimize.minimize_scalar` function with a bounded method.
 
+        With the ``"grid"`` method, the loss is first evaluated at once for all the
+        base temperatures of a grid, which avoids the local minima of the bounded
+        optimization. The best temperature of the grid is then refined by the bounded
+        optimization, in the interval of one grid step around it.
+
         Parameters
         ----------
         dd_type : str, optional
@@ -692,6 +788,20 @@ class ThermoSensitivity:
             This controls how precise the optimized base temperature needs to be.
             Default is 1e-1 (0.1°C).
 
+        method : str, optional
+            The calibration method, must be one of the following:
+            - "bounded": bounded scalar optimization.
+            - "grid": evaluation on a grid of base temperatures, then refinement.
+            The default is "bounded".
+
+        grid_step : float, optional
+            The step between the base temperatures of the grid, used by the
+            ``"grid"`` method only. Default is 0.5°C.
+
+        refine : bool, optional
+            If True, the best base temperature of the grid is refined with the bounded
+            optimization. Used by the ``"grid"`` method only. Default is True.
+
         Returns
         -------
         float
@@ -700,7 +810,8 @@ class ThermoSensitivity:
         Raises
         ------
         ValueError
-            If the `dd_type` is invalid (not one of "heating" or "cooling").
+            If the `dd_type` is invalid (not one of "heating" or "cooling"), or if
+            the `method` is invalid (not one of "bounded" or "grid").
 
         Example
         -------
@@ -727,15 +838,27 @@ class ThermoSensitivity:
         else:
             err = "Invalid degree days type. Must be one of 'heating' or 'cooling'."
             raise ValueError(err)
+        if method not in calibration_methods:
+            err = "Invalid calibration method. Must be one of 'bounded' or 'grid'."
+            raise ValueError(err)
+        energy, positions = self._calibration_data(mask)
+        if method == "grid":
+            grid = _base_temperature_grid(bounds, grid_step)
+            degree_days = self.degree_days_cache.degree_days(grid, dd_type)
+            losses = residual_mse(energy, degree_days[:, positions, np.newaxis])
+            best = grid[np.nanargmin(losses)]
+            if not refine:
+                return float(best)
+            bounds = (
+                max(bounds[0], best - grid_step),
+                min(bounds[1], best + grid_step),
+            )
         res = minimize_scalar(
-            self.loss_function,
+            self._calibration_loss,
             args=(
                 dd_type,
-                self.resampled_energy_temperature[self.target_name],
-                self.temperature_data,
-                self.frequency,
-                mask,
-                self.degree_days_computation_method,
+                energy,
+                positions,
             ),
             bounds=bounds,
             method="bounded",
@@ -750,6 +873,10 @@ class ThermoSensitivity:
         t0_heating: float | None = None,
         t0_cooling: float | None = None,
         xatol: float = 1e-1,
+        *,
+        method: literal_calibration_methods = "bounded",
+        grid_step: float = 0.5,
+        refine: bool = True,
     ) -> None:
         """Calibrate the base temperatures for both heating and cooling degree days.
 
@@ -760,7 +887,10 @@ class ThermoSensitivity:
 
         If the `degree_days_type` is "heating", only the heating base temperature is
         calibrated. If it is "cooling", only the cooling base temperature is calibrated.
-        If it is "both", both base temperatures are calibrated.
+        If it is "both", both base temperatures are calibrated. With the ``"grid"``
+        method, they are then calibrated jointly, on the grid of all the pairs of
+        heating and cooling base temperatures, with a model using both degree days on
+        all the periods. See :py:meth:`calibrate_joint_base_temperatures`.
 
         Parameters
         ----------
@@ -778,6 +908,18 @@ class ThermoSensitivity:
             This controls how precise the optimized base temperatures need to be.
             Default is 1e-1 (0.1°C).
 
+        method : str, optional
+            The calibration method, "bounded" or "grid".
+            See :py:meth:`calibrate_base_temperature`. The default is "bounded".
+
+        grid_step : float, optional
+            The step between the base temperatures of the grid.
+            See :py:meth:`calibrate_base_temperature`. Default is 0.5°C.
+
+        refine : bool, optional
+            If True, the best base temperatures of the grid are refined.
+            See :py:meth:`calibrate_base_temperature`. Default is True.
+
         Returns
         -------
         None
@@ -794,6 +936,15 @@ class ThermoSensitivity:
         >>> ts.calibrate_base_temperatures(t0_heating=15, t0_cooling=25, xatol=0.05)
 
         """
+        if method == "grid" and self.degree_days_type == "both":
+            self.degree_days_base_temperature.update(
+                self.calibrate_joint_base_temperatures(
+                    xatol=xatol,
+                    grid_step=grid_step,
+                    refine=refine,
+                ),
+            )
+            return
         types_to_calibrate = []
         if self.degree_days_type in ["heating", "both"]:
             types_to_calibrate.append("heating")
@@ -808,9 +959,141 @@ class ThermoSensitivity:
                 dd_type=cast(Literal["heating", "cooling"], dd_type),
                 t0=t0,
                 xatol=xatol,
+                method=method,
+                grid_step=grid_step,
+                refine=refine,
             )
             self.degree_days_base_temperature[dd_type] = topt
 
+    def calibrate_joint_base_temperatures(
+        self,
+        xatol: float = 1e-1,
+        grid_step: float = 0.5,
+        *,
+        refine: bool = True,
+    ) -> dict[str, float]:
+        """Calibrate the heating and cooling base temperatures together.
+
+        The loss is the mean squared error of the model using both the heating and
+        the cooling degree days, on all the periods. It is evaluated at once for all
+        the pairs of base temperatures of a grid, by chunks which size is bounded by
+        ``GRID_CHUNK_SIZE`` values.
+
+        The heating base temperature is searched between 10°C and the interseason
+        mean temperature, the cooling one between the interseason mean temperature
+        and 30°C.
+
+        Parameters
+        ----------
+        xatol : float, optional
+            The absolute error tolerance for the refinement.
+            Default is 1e-1 (0.1°C).
+
+        grid_step : float, optional
+            The step between the base temperatures of the grid. Default is 0.5°C.
+
+        refine : bool, optional
+            If True, each base temperature of the best pair is refined with a bounded
+            scalar optimization, in the interval of one grid step around it, the
+            other base temperature being fixed. Default is True.
+
+        Returns
+        -------
+        dict[str, float]
+            The optimized base temperatures, with keys "heating" and "cooling".
+
+        Example
+        -------
+        >>> ts.calibrate_joint_base_temperatures(grid_step=0.2)
+        {'heating': 16.48, 'cooling': 23.02}
+
+        """
+        energy, positions = self._calibration_data()
+        bounds = {
+            "heating": (10.0, self.interseason_mean_temperature),
+            "cooling": (self.interseason_mean_temperature, 30.0),
+        }
+        grids = {
+            dd_type: _base_temperature_grid(dd_bounds, grid_step)
+            for dd_type, dd_bounds in bounds.items()
+        }
+        heating = self.degree_days_cache.degree_days(grids["heating"], "heating")
+        heating = heating[:, positions]
+        cooling = self.degree_days_cache.degree_days(grids["cooling"], "cooling")
+        cooling = cooling[:, positions]
+        losses = np.empty((heating.shape[0], cooling.shape[0]))
+        rows = max(1, GRID_CHUNK_SIZE // (2 * cooling.size))
+        for start in range(0, heating.shape[0], rows):
+            chunk = heating[start : start + rows]
+            designs = np.stack(
+                np.broadcast_arrays(chunk[:, np.newaxis], cooling[np.newaxis]),
+                axis=-1,
+            )
+            losses[start : start + rows] = residual_mse(
+                energy,
+                designs.reshape(-1, energy.size, 2),
+            ).reshape(chunk.shape[0], -1)
+        heating_index, cooling_index = np.unravel_index(
+            np.nanargmin(losses),
+            losses.shape,
+        )
+        best = {
+            "heating": float(grids["heating"][heating_index]),
+            "cooling": float(grids["cooling"][cooling_index]),
+        }
+        if refine:
+            for dd_type, other_type in [("heating", "cooling"), ("cooling", "heating")]:
+                other_degree_days = self.degree_days_cache.degree_days(
+                    best[other_type],
+                    other_type,
+                )[positions]
+                low, high = bounds[dd_type]
+                res = minimize_scalar(
+                    self._calibration_loss,
+                    args=(
+                        dd_type,
+                        energy,
+                        positions,
+                        other_degree_days,
+                    ),
+                    bounds=(
+                        max(low, best[dd_type] - grid_step),
+                        min(high, best[dd_type] + grid_step),
+                    ),
+                    method="bounded",
+                    options={
+                        "xatol": xatol,
+                    },
+                )
+                best[dd_type] = res.x
+        return best
+
+    def _calibration_data(
+        self,
+        mask: pd.Series | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Return the energy used by the calibration and its positions in the cache.
+
+        Parameters
+        ----------
+        mask : pd.Series or None, optional
+            A boolean mask of the periods of the resampled energy to keep.
+            Default is None.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray]
+            The resampled energy data and the positions of its periods in the
+            periods of the :py:attr:`degree_days_cache`.
+
+        """
+        energy = self.resampled_energy_temperature[self.target_name]
+        if mask is not None:
+            energy = energy[mask]
+        positions = self.degree_days_cache.periods.get_indexer(energy.index)
+        is_known = positions >= 0
+        return energy.to_numpy()[is_known], positions[is_known]
+
     def _fit_thermosensitivity(
         self,
     ) -> None:
@@ -839,20 +1122,22 @@ class ThermoSensitivity:
 
     def fit(
         self: ThermosensitivityInstance,
+        calibration_method: literal_calibration_methods = "bounded",
     ) -> ThermosensitivityInstance:
         """Train the model.
 
         This method will:
 
-        1. Calibrate the base temperature if it is not set.
-           See :meth:`calibrate_base_temperature`.
+        1. Calibrate the base temperature if it is not set, with the
+           ``calibration_method``, "bounded" (default) or "grid".
+           See :meth:`calibrate_base_temperatures`.
         2. Aggregate the data. This consists of resampling the energy and temperature
            data and the computation of the degree days. See :meth:`_aggregate_data`.
         3. Fit the thermosensitivity model.
            See :meth:`_fit_thermosensitivity`.
 
         """
-        self.calibrate_base_temperatures()
+        self.calibrate_base_temperatures(method=calibration_method)
         self._aggregate_data(self.degree_days_base_temperature)
         self._fit_thermosensitivity()
         return self
@@ -864,8 +1149,9 @@ class ThermoSensitivity:
         class_name = self.__class__.__name__
         header = f"""{class_name}(frequency={self.frequency},
         degree_days_type={self.degree_days_type},
-        degree_days_base_temperature={ {k:round(v, 2) for k,v
-            in self.degree_days_base_temperature.items()} },
+        degree_days_base_temperature={
+            {k: round(v, 2) for k, v in self.degree_days_base_temperature.items()}
+        },
         degree_days_computation_method={self.degree_days_computation_method},
         interseason_mean_temperature={self.interseason_mean_temperature})"""
         if self._model is not None:
@@ -895,6 +1181,10 @@ class ThermoSensitivity:
         to the desired frequency, and compared against the resampled energy data. The
         MSE is used as the objective function to optimize the base temperature.
 
+        The linear model is fitted on arrays with
+        :py:func:`energy_analysis_toolbox.thermosensitivity.least_squares.residual_mse`
+        rather than with ``statsmodels``, which is used by :py:meth:`fit` only.
+
         Parameters
         ----------
         t0 : float
@@ -946,6 +1236,7 @@ class ThermoSensitivity:
             reference=t0,
             dd_type=dd_type,
             method=degree_days_computation_method,
+            store=self.degree_days_store,
         )
         degree_days_resampled = (
             degree_days.resample(frequency).sum().rename("degree_days")
@@ -954,16 +1245,58 @@ class ThermoSensitivity:
             how="any",
             axis=0,
         )
-        data["Intercept"] = 1
         if mask is not None:
             data = data[mask]
-        model = OLS(
-            data[resampled_energy.name],
-            data[["degree_days", "Intercept"]],
-        ).fit()
-        log_message = f"{t0=:.4f}, {model.mse_resid:.2f}, {model.mse_total:.2f}"
+        mse_resid = residual_mse(
+            data[resampled_energy.name].to_numpy(),
+            data["degree_days"].to_numpy(),
+        )
+        log_message = f"{t0=:.4f}, {mse_resid:.2f}"
         self.logger.info(log_message)
-        return model.mse_resid
+        return mse_resid
+
+    def _calibration_loss(
+        self,
+        t0: float,
+        dd_type: literal_valid_dd_types,
+        energy: np.ndarray,
+        positions: np.ndarray,
+        other_degree_days: np.ndarray | None = None,
+    ) -> float:
+        """Loss function of the base temperature used by the calibration.
+
+        Same as :py:meth:`loss_function`, with the degree days taken from the
+        :py:attr:`degree_days_cache`.
+
+        Parameters
+        ----------
+        t0 : float
+            Base temperature used to compute degree days.
+        dd_type : literal_valid_dd_types
+            Type of degree days to compute.
+        energy : np.ndarray
+            The resampled energy data to be modeled, already masked.
+        positions : np.ndarray
+            The positions of the energy periods in the periods of the cache.
+        other_degree_days : np.ndarray or None, optional
+            The degree days of the other type, used as a second predictor in the
+            joint calibration of the heating and cooling base temperatures.
+            Default is None.
+
+        Returns
+        -------
+        float
+            The mean squared error (MSE) of the residuals between the observed
+            energy data and the modeled energy data based on degree days.
+
+        """
+        degree_days = self.degree_days_cache.degree_days(t0, dd_type)[positions]
+        if other_degree_days is not None:
+            degree_days = np.column_stack([degree_days, other_degree_days])
+        mse_resid = residual_mse(energy, degree_days)
+        log_message = f"{t0=:.4f}, {mse_resid:.2f}"
+        self.logger.info(log_message)
+        return mse_resid
 
 
 class CategoricalThermoSensitivity(
@@ -989,6 +1322,7 @@ class CategoricalThermoSensitivity(
         interseason_mean_temperature: float = 20,
         base_logger_name: str | None = None,
         min_logger_level_stdout: int | str = logging.ERROR,
+        degree_days_store: DegreeDayStore | None = None,
     ) -> None:
         """Return a ``CategoricalThermoSensitivity`` instance.
 
@@ -1057,6 +1391,10 @@ class CategoricalThermoSensitivity(
             integer constants from the `logging` module. If you want to have details
             on what's going on in the code, set this to ``"INFO"`` or ``"WARNING"``.
 
+        degree_days_store : DegreeDayStore, optional
+            A store shared by the buildings of a weather station. See
+            :py:class:`ThermoSensitivity`. Default is None.
+
         """
         degree_days_base_temperature = {} or degree_days_base_temperature
         self._categories = categories
@@ -1070,6 +1408,7 @@ class CategoricalThermoSensitivity(
             interseason_mean_temperature=interseason_mean_temperature,
             base_logger_name=base_logger_name,
             min_logger_level_stdout=min_logger_level_stdout,
+            degree_days_store=degree_days_store,
         )
 
     @cached_property
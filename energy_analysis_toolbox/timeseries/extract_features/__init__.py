@@ -1,6 +1,7 @@
 """Package containing tools to extract features in timeseries."""
 
 from .basics import (
+    bounds_over,
     intervals_over,
     timestep_durations,
 )
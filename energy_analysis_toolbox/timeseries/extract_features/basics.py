@@ -4,9 +4,13 @@ import numpy as np
 import pandas as pd
 
 from energy_analysis_toolbox import keywords as eatk
+from energy_analysis_toolbox.core.basics import (
+    as_times,
+    bounds_over,
+    timesteps,
+)
 from energy_analysis_toolbox.errors import (
     EATEmptyDataError,
-    EATInvalidTimestepDurationError,
     EATUndefinedTimestepError,
 )
 
@@ -96,29 +100,16 @@ def intervals_over(
     """
     if series.empty:
         return pd.DataFrame([], columns=[eatk.start_f, eatk.end_f])
-    # 1 diffs in a Bool series -> True if element differs from previous
-    over_status_shift = (series > low_tshd).diff()
-    # 2
-    over_status_shift.iloc[0] = series.iloc[0] > low_tshd
-    over_status_shift.iloc[-1] = over_status_shift.iloc[-1] or (
-        series.iloc[-1] > low_tshd
-    )
-    # indexes of shifts
-    actual_times = over_status_shift.index.where(over_status_shift).dropna()
-    actual_inds = [series.index.get_loc(time) for time in actual_times]
-    # 3 as [[start, end]]
-    bound_indexes = [
-        [actual_inds[2 * i], actual_inds[2 * i + 1]]
-        for i in range(len(actual_inds) // 2)
-    ]
-    bound_labels = [
-        [over_status_shift.index[s], over_status_shift.index[e]]
-        for s, e in bound_indexes
-    ]
-    intervals = pd.DataFrame(bound_labels, columns=[eatk.start_f, eatk.end_f])
+    starts, ends = bounds_over(series.to_numpy(), low_tshd)  # [1] [2] [3]
     # 4
+    intervals = pd.DataFrame(
+        {
+            eatk.start_f: series.index.take(starts),
+            eatk.end_f: series.index.take(ends),
+        },
+    )
     if return_positions:
-        iloc_bounds = pd.DataFrame(bound_indexes, columns=[eatk.start_f, eatk.end_f])
+        iloc_bounds = pd.DataFrame({eatk.start_f: starts, eatk.end_f: ends})
         return intervals, iloc_bounds
     return intervals
 
@@ -223,24 +214,4 @@ def index_to_timesteps(
         which works on timeseries by applying this function to its index.
 
     """
-    if time_indexes.empty:
-        err = "Interval durations cannot be inferred for empty time-sequences."
-        raise EATEmptyDataError(err)
-    min_time_indices_length = 2
-    if time_indexes.size < min_time_indices_length and last_step is None:
-        err = (
-            "The series should contain at least 2 elements to infer a duration"
-            "when last_step value is None."
-        )
-        raise EATUndefinedTimestepError(err)
-    if last_step is not None and last_step < 0:
-        err = f"Last step duration must be >=0. Received {last_step} s."
-        raise EATInvalidTimestepDurationError(err)
-    # better initialize and assign to avoid table extension in the next step
-    durations = np.empty(time_indexes.size)
-    durations[:-1] = (time_indexes[1:] - time_indexes[0:-1]).total_seconds()
-    if last_step is None:
-        durations[-1] = durations[-2]
-    else:
-        durations[-1] = last_step
-    return durations
+    return timesteps(as_times(time_indexes), last_step)
@@ -14,3 +14,4 @@ from .rolling_profile import (
     RollingProfile,
     RollingQuantileProfile,
 )
+from .state import TrailingProfileState
@@ -2,7 +2,7 @@
 
 import pandas as pd
 
-from .mean_profile import MeanProfile
+from .mean_profile import MeanProfile, _trailing_bounds
 from .rolling_profile import (
     RollingProfile,
     RollingQuantileProfile,
@@ -74,6 +74,59 @@ class LocalizedMeanProfile(
     see :py:class:`.MeanProfile`
     """
 
+    def compute_many(
+        self,
+        history: pd.Series,
+        times: pd.DatetimeIndex,
+        trailing: str | pd.Timedelta | None = None,
+    ) -> pd.Series:
+        """Return the profiles for many target times, stacked in one timeseries.
+
+        The history and target times are unlocalized and the stacked profiles are
+        relocalized as in :py:meth:`LocalizedProfileMixin.compute`. The trailing
+        histories are selected on the localized index, so that the result is the
+        same as the one of :py:meth:`LocalizedProfileMixin.compute` called on
+        each trailing history, including around DSTs.
+
+        .. seealso::
+
+            :py:meth:`.MeanProfile.compute_many`
+
+        """
+        source_tz = history.index.tz
+        times = pd.DatetimeIndex(times)
+        if (
+            source_tz is None
+            or times.empty
+            or (
+                trailing is not None
+                and (
+                    isinstance(history, pd.DataFrame)
+                    or not history.index.is_monotonic_increasing
+                )
+            )
+        ):
+            # the per-target loop calls compute on the localized history
+            return super().compute_many(history, times, trailing)
+        naive_history = history.tz_localize(None)
+        naive_times = times.tz_localize(None)
+        if trailing is None:
+            profiles = super().compute_many(naive_history, naive_times)
+        else:
+            starts, ends = _trailing_bounds(
+                history.index,
+                times,
+                pd.Timedelta(trailing),
+            )
+            reference, std = self._trailing_statistics(
+                naive_history,
+                naive_times,
+                starts,
+                ends,
+            )
+            profiles = self.threshold(reference, std)
+        return profiles.tz_localize(source_tz, ambiguous=True, nonexistent="NaT")
+
 
 class LocalizedRollingProfile(
     LocalizedProfileMixin,
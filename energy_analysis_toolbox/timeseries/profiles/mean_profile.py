@@ -1,7 +1,11 @@
 """Defines a base class to compute average load profiles from history."""
 
+import numpy as np
 import pandas as pd
 
+# minimum number of values for the standard deviation (ddof=1) to be defined
+MIN_STD_COUNT = 2
+
 
 class MeanProfile:
     """A class which computes a simple mean profile."""
@@ -33,6 +37,8 @@ class MeanProfile:
         self.period = period
         self.is_max = is_max
         self.window = window
+        # slots of the last index passed to slot_codes, reused for the same index
+        self._slots_cache = None
 
     def group(
         self,
@@ -51,6 +57,101 @@ class MeanProfile:
         """
         return history.groupby(history.index - history.index.floor(self.period))
 
+    def slot_codes(
+        self,
+        index: pd.DatetimeIndex,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Return the slots of the period and the slot of each instant in an index.
+
+        The result is cached for the last index, such that repeated calls with the
+        index of the same history do not floor it again.
+
+        Parameters
+        ----------
+        index : pd.DatetimeIndex
+            The index of a history.
+
+        Returns
+        -------
+        slots : np.ndarray
+            The sorted offsets of the instants from the beginning of their
+            ``self.period``, as int64 in (ns). These are the keys of
+            :py:meth:`group`.
+        codes : np.ndarray
+            The position in ``slots`` of the offset of each instant of ``index``.
+
+        """
+        cached = self._slots_cache
+        if cached is not None and cached[0] is index and cached[1] == self.period:
+            return cached[2]
+        offsets = (index - index.floor(self.period)).as_unit("ns").asi8
+        codes, slots = pd.factorize(offsets, sort=True)
+        self._slots_cache = (index, self.period, (slots, codes))
+        return slots, codes
+
+    def statistics(
+        self,
+        history: pd.Series | pd.DataFrame,
+        *,
+        std: bool = True,
+    ) -> tuple[pd.Series | pd.DataFrame, pd.Series | pd.DataFrame | None]:
+        """Return the mean and standard deviation profiles of the history.
+
+        Both profiles are computed in a single pass on the slot of each instant
+        (see :py:meth:`slot_codes`), without a ``pandas`` groupby.
+
+        Parameters
+        ----------
+        history : pd.Series or pd.DataFrame
+            Consumption history. Only the numeric columns of a table are used.
+        std : bool, default True
+            If False, the standard deviation is not computed.
+
+        Returns
+        -------
+        mean : pd.Series or pd.DataFrame
+            The mean of the smoothed history (see :py:meth:`smooth`) in each slot,
+            indexed by the offsets of the slots as in ``self.group(history).mean()``.
+        std : pd.Series or pd.DataFrame or None
+            The standard deviation of the (unsmoothed) history in each slot, as in
+            ``self.group(history).std()``, or |None| if ``std`` is False.
+
+        """
+        slots, codes = self.slot_codes(history.index)
+        if isinstance(history, pd.Series):
+            table = history.to_frame()
+        else:
+            table = history.select_dtypes("number")
+        values = table.to_numpy(dtype=np.float64)
+        smoothed = self.smooth(table).to_numpy(dtype=np.float64)
+        index = pd.TimedeltaIndex(
+            slots,
+            dtype="timedelta64[ns]",
+            name=history.index.name,
+        ).as_unit(history.index.unit)
+        means = np.empty((slots.size, table.shape[1]))
+        stds = np.empty((slots.size, table.shape[1]))
+        for column in range(table.shape[1]):
+            means[:, column] = _bincount_moments(
+                codes,
+                smoothed[:, column],
+                slots.size,
+                std=False,
+            )[0]
+            if std:
+                stds[:, column] = _bincount_moments(
+                    codes,
+                    values[:, column],
+                    slots.size,
+                )[1]
+        if isinstance(history, pd.Series):
+            mean = pd.Series(means[:, 0], index=index, name=history.name)
+            deviation = pd.Series(stds[:, 0], index=index, name=history.name)
+        else:
+            mean = pd.DataFrame(means, index=index, columns=table.columns)
+            deviation = pd.DataFrame(stds, index=index, columns=table.columns)
+        return mean, deviation if std else None
+
     def compute(
         self,
         history: pd.Series,
@@ -80,12 +181,206 @@ class MeanProfile:
         from history.
 
         """
-        if self.window == 1:
-            pass
-        elif self.is_max:
-            history = history.rolling(self.window, center=True).max()
-        else:
-            history = history.rolling(self.window, center=True).min()
-        mean_profile_compare = self.group(history).mean(numeric_only=True)
+        mean_profile_compare, _ = self.statistics(history, std=False)
         mean_profile_compare.index += time
         return mean_profile_compare
+
+    def smooth(
+        self,
+        history: pd.Series | pd.DataFrame,
+    ) -> pd.Series | pd.DataFrame:
+        """Return the history transformed by the rolling max (or min) of ``window``.
+
+        Parameters
+        ----------
+        history : pd.Series or pd.DataFrame
+
+        Returns
+        -------
+        pd.Series or pd.DataFrame
+            The history itself if ``self.window == 1``.
+
+        """
+        if self.window == 1:
+            return history
+        if self.is_max:
+            return history.rolling(self.window, center=True).max()
+        return history.rolling(self.window, center=True).min()
+
+    def threshold(
+        self,
+        reference: pd.Series,
+        std: pd.Series,  # noqa:ARG002
+    ) -> pd.Series:
+        """Return the threshold profile from the statistics of the history.
+
+        Parameters
+        ----------
+        reference : pd.Series
+            The mean profile of the smoothed history, see :py:meth:`smooth`.
+        std : pd.Series
+            The standard deviation profile of the history, with the same index
+            as ``reference``.
+
+        Returns
+        -------
+        pd.Series
+            The mean profile itself.
+
+        """
+        return reference
+
+    def compute_many(
+        self,
+        history: pd.Series,
+        times: pd.DatetimeIndex,
+        trailing: str | pd.Timedelta | None = None,
+    ) -> pd.Series:
+        """Return the profiles for many target times, stacked in one timeseries.
+
+        Parameters
+        ----------
+        history : pd.Series
+            Consumption history used to computed the profiles, with a sorted index.
+        times : pd.DatetimeIndex or array-like of pd.Timestamp
+            The times at which the profiles are of interest, see :py:meth:`compute`.
+        trailing : str or pd.Timedelta, optional
+            The duration of the history used for each target time. The default is
+            |None| in which case the whole history is used for all the targets.
+
+        Returns
+        -------
+        pd.Series
+            The concatenation of the profiles at each time in ``times``, which is
+            the same as::
+
+                pd.concat([self.compute(history_at(time), time) for time in times])
+
+            where ``history_at(time)`` is the whole history if ``trailing`` is
+            |None|, and the history in ``[time - trailing, time[`` otherwise.
+
+        Notes
+        -----
+        With the whole history, the profile is computed once and shifted to each
+        target time. With a trailing history, the mean and standard deviation of
+        the slots are computed for all the targets at once with ``numpy``, and
+        combined with :py:meth:`threshold`. The profiles are then equal to the ones
+        obtained with ``pandas`` up to rounding errors.
+
+        A per-target loop is used for a table (DataFrame) of history or a history
+        with an unsorted index.
+
+        """
+        times = pd.DatetimeIndex(times)
+        if times.empty:
+            return history.iloc[:0]
+        if trailing is None:
+            profile = self.compute(history, times[0])
+            offsets = profile.index - times[0]
+            return pd.concat([profile.set_axis(offsets + time) for time in times])
+        trailing = pd.Timedelta(trailing)
+        if (
+            isinstance(history, pd.DataFrame)
+            or not history.index.is_monotonic_increasing
+        ):
+            return pd.concat(
+                [
+                    self.compute(
+                        history.loc[
+                            (history.index >= time - trailing) & (history.index < time)
+                        ],
+                        time,
+                    )
+                    for time in times
+                ],
+            )
+        starts, ends = _trailing_bounds(history.index, times, trailing)
+        reference, std = self._trailing_statistics(history, times, starts, ends)
+        return self.threshold(reference, std)
+
+    def _trailing_statistics(
+        self,
+        history: pd.Series,
+        times: pd.DatetimeIndex,
+        starts: np.ndarray,
+        ends: np.ndarray,
+    ) -> tuple[pd.Series, pd.Series]:
+        """Return the stacked mean and std profiles on trailing histories.
+
+        The trailing history of ``times[i]`` is ``history.iloc[starts[i]:ends[i]]``.
+        The samples of all the trailing histories are gathered in one array, and
+        each of them is labelled with its target and slot in the period. The
+        statistics of each label are then computed with :py:func:`numpy.bincount`.
+        """
+        slots, slot_codes = self.slot_codes(history.index)
+        lengths = ends - starts
+        targets = np.repeat(np.arange(times.size), lengths)
+        positions = np.arange(lengths.sum()) - np.repeat(
+            np.cumsum(lengths) - lengths,
+            lengths,
+        )
+        rows = starts[targets] + positions
+        labels = targets * slots.size + slot_codes[rows]
+        size = times.size * slots.size
+        values = history.to_numpy(dtype=np.float64)
+        smoothed = self.smooth(history).to_numpy(dtype=np.float64)[rows]
+        if self.window > 1:
+            # the rolling window of the trailing history is truncated at its bounds
+            edges = self.smooth(pd.Series(np.zeros(2 * self.window))).isna()
+            before = edges.to_numpy().argmin()
+            after = edges.to_numpy()[::-1].argmin()
+            truncated = (positions < before) | (positions >= lengths[targets] - after)
+            smoothed[truncated] = np.nan
+        present = np.bincount(labels, minlength=size) > 0
+        mean, _ = _bincount_moments(labels, smoothed, size)
+        _, std = _bincount_moments(labels, values[rows], size)
+        index = pd.DatetimeIndex(
+            times.repeat(slots.size)[present]
+            + pd.to_timedelta(np.tile(slots, times.size)[present]),
+            name=history.index.name,
+        )
+        return (
+            pd.Series(mean[present], index=index, name=history.name),
+            pd.Series(std[present], index=index, name=history.name),
+        )
+
+
+def _trailing_bounds(
+    index: pd.DatetimeIndex,
+    times: pd.DatetimeIndex,
+    trailing: pd.Timedelta,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return the positions of the trailing histories of times in a sorted index.
+
+    The trailing history of ``times[i]`` is ``[times[i] - trailing, times[i][``,
+    located at ``[starts[i], ends[i][`` in ``index``.
+    """
+    starts = index.searchsorted(times - trailing, side="left")
+    ends = index.searchsorted(times, side="left")
+    return starts, ends
+
+
+def _bincount_moments(
+    labels: np.ndarray,
+    values: np.ndarray,
+    size: int,
+    *,
+    std: bool = True,
+) -> tuple[np.ndarray, np.ndarray | None]:
+    """Return the mean and the standard deviation (ddof=1) of values by label.
+
+    Missing values are skipped. The mean is |NaN| without any value and the standard
+    deviation is |NaN| with less than two values, or |None| if ``std`` is False.
+    """
+    observed = ~np.isnan(values)
+    values = np.where(observed, values, 0.0)
+    counts = np.bincount(labels, weights=observed, minlength=size)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.bincount(labels, weights=values, minlength=size) / counts
+        if not std:
+            return mean, None
+        deviations = np.where(observed, values - mean[labels], 0.0)
+        squares = np.bincount(labels, weights=deviations**2, minlength=size)
+        std = np.sqrt(squares / (counts - 1))
+    std[counts < MIN_STD_COUNT] = np.nan
+    return mean, std
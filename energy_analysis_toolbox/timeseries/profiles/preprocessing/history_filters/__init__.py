@@ -2,5 +2,7 @@
 
 from . import (
     categories,
+    pipeline,
     weekdays,
 )
+from .pipeline import HistoryFilterPipeline
@@ -4,17 +4,88 @@ This module provides utility functions to subset or filter historical data by
 categorizing time-indexed rows using a user-defined classificator. The filters
 allow for keeping or removing rows based on matching categories or inclusion
 in specified category lists.
+
+The classificator is called on each timestamp by default. It can also be
+declared as :
+
+- ``vectorized`` : it maps a DatetimeIndex to an array of categories, and is
+  called once on the whole index;
+- ``daily`` : the category only depends on the date, and the classificator is
+  called once per day in the history, on the midnight of the day.
+
+Example
+-------
+>>> keep_categories(history, classificator=is_holiday, keep=[False], daily=True)
+>>> keep_categories(
+...     history,
+...     classificator=lambda index: index.hour < 8,
+...     keep=[True],
+...     vectorized=True,
+... )
+
 """
 
 from collections.abc import Callable
 
+import numpy as np
 import pandas as pd
 
 
+def classify(
+    index: pd.DatetimeIndex,
+    classificator: Callable,
+    *,
+    vectorized: bool = False,
+    daily: bool = False,
+) -> np.ndarray:
+    """Return the category of each timestamp in an index.
+
+    Parameters
+    ----------
+    index : pd.DatetimeIndex
+        The timestamps to be classified.
+    classificator : callable
+        A function mapping a timestamp to a category, or a DatetimeIndex to an
+        array of categories if ``vectorized`` is True.
+    vectorized : bool, default False
+        If True, the classificator is called once with a DatetimeIndex.
+    daily : bool, default False
+        If True, the category of a timestamp is the one of the midnight of its
+        day, and the classificator is called only for the distinct days in
+        ``index``.
+
+    Returns
+    -------
+    np.ndarray
+        The category of each timestamp.
+
+    """
+    if daily:
+        codes, days = pd.factorize(index.normalize())
+        return classify(days, classificator, vectorized=vectorized)[codes]
+    if vectorized:
+        return np.asarray(classificator(index))
+    return index.to_series().apply(classificator).to_numpy()
+
+
+def _isin(categories: np.ndarray, values: list) -> np.ndarray:
+    """Return the mask of the categories which are in ``values``.
+
+    Each distinct category is looked up once in Python, so that any hashable
+    category (e.g. a tuple) is compared as a whole, unlike with ``np.isin``.
+    """
+    codes, uniques = pd.factorize(categories, use_na_sentinel=False)
+    values = set(values)
+    return np.array([category in values for category in uniques], dtype=bool)[codes]
+
+
 def same_category(
     history: pd.DataFrame,
     date: pd.Timestamp | None = None,
     classificator: Callable | None = None,
+    *,
+    vectorized: bool = False,
+    daily: bool = False,
 ) -> pd.DataFrame:
     """Return the subset of history for which the category is the same as the date.
 
@@ -30,6 +101,10 @@ def same_category(
     classificator : callable or None, optional
         A function mapping a timestamp to a category. If None, return the
         whole history.
+    vectorized : bool, default False
+        If True, the classificator maps a DatetimeIndex to an array of categories.
+    daily : bool, default False
+        If True, the category only depends on the date. See :py:func:`classify`.
 
     Returns
     -------
@@ -40,17 +115,23 @@ def same_category(
     """
     if history.empty or classificator is None:
         return history
-    if date is None:
-        date = (history.index[-1].floor("D")) + pd.Timedelta("1D")
-    categories = history.index.to_series().apply(classificator)
-    ref_category = classificator(date)
-    return history.loc[categories == ref_category]
+    mask = same_category_mask(
+        history.index,
+        date,
+        classificator,
+        vectorized=vectorized,
+        daily=daily,
+    )
+    return history.loc[mask]
 
 
 def keep_categories(
     history: pd.DataFrame,
     classificator: Callable | None = None,
     keep: list | None = None,
+    *,
+    vectorized: bool = False,
+    daily: bool = False,
 ) -> pd.DataFrame:
     """Return the subset of history for which the category is in the list.
 
@@ -66,6 +147,10 @@ def keep_categories(
         A list of categories representation.
         All rows in ``history`` for which index the ``classificator`` returns
         a value which ``not is in keep`` are dumped from the returned history.
+    vectorized : bool, default False
+        If True, the classificator maps a DatetimeIndex to an array of categories.
+    daily : bool, default False
+        If True, the category only depends on the date. See :py:func:`classify`.
 
     Returns
     -------
@@ -76,10 +161,13 @@ def keep_categories(
     """
     if history.empty or classificator is None:
         return history
-    if keep is None:
-        keep = []
-    categories = history.index.to_series().apply(classificator)
-    mask = [(cat_image in keep) for cat_image in categories.to_numpy()]
+    mask = keep_categories_mask(
+        history.index,
+        classificator,
+        keep,
+        vectorized=vectorized,
+        daily=daily,
+    )
     return history.loc[mask]
 
 
@@ -87,6 +175,9 @@ def remove_categories(
     history: pd.DataFrame,
     classificator: Callable | None = None,
     remove: list | None = None,
+    *,
+    vectorized: bool = False,
+    daily: bool = False,
 ) -> pd.DataFrame:
     """Return the subset of history for which the category is the same as the date.
 
@@ -102,6 +193,10 @@ def remove_categories(
         A list of categories representation.
         All rows in ``history`` for which index the ``classificator`` returns
         a value which ``is in remove`` are dumped from the returned history.
+    vectorized : bool, default False
+        If True, the classificator maps a DatetimeIndex to an array of categories.
+    daily : bool, default False
+        If True, the category only depends on the date. See :py:func:`classify`.
 
     Returns
     -------
@@ -112,8 +207,86 @@ def remove_categories(
     """
     if history.empty or classificator is None:
         return history
+    mask = remove_categories_mask(
+        history.index,
+        classificator,
+        remove,
+        vectorized=vectorized,
+        daily=daily,
+    )
+    return history.loc[mask]
+
+
+def same_category_mask(
+    index: pd.DatetimeIndex,
+    date: pd.Timestamp | None = None,
+    classificator: Callable | None = None,
+    *,
+    vectorized: bool = False,
+    daily: bool = False,
+) -> np.ndarray:
+    """Return the mask of the timestamps of the same category as the date.
+
+    .. seealso::
+
+        :py:func:`same_category` for the parameters.
+
+    """
+    if index.empty or classificator is None:
+        return np.ones(index.size, dtype=bool)
+    if date is None:
+        date = (index[-1].floor("D")) + pd.Timedelta("1D")
+    categories = classify(index, classificator, vectorized=vectorized, daily=daily)
+    ref_category = classify(
+        pd.DatetimeIndex([date]),
+        classificator,
+        vectorized=vectorized,
+        daily=daily,
+    )[0]
+    return _isin(categories, [ref_category])
+
+
+def keep_categories_mask(
+    index: pd.DatetimeIndex,
+    classificator: Callable | None = None,
+    keep: list | None = None,
+    *,
+    vectorized: bool = False,
+    daily: bool = False,
+) -> np.ndarray:
+    """Return the mask of the timestamps which category is in ``keep``.
+
+    .. seealso::
+
+        :py:func:`keep_categories` for the parameters.
+
+    """
+    if index.empty or classificator is None:
+        return np.ones(index.size, dtype=bool)
+    if keep is None:
+        keep = []
+    categories = classify(index, classificator, vectorized=vectorized, daily=daily)
+    return _isin(categories, keep)
+
+
+def remove_categories_mask(
+    index: pd.DatetimeIndex,
+    classificator: Callable | None = None,
+    remove: list | None = None,
+    *,
+    vectorized: bool = False,
+    daily: bool = False,
+) -> np.ndarray:
+    """Return the mask of the timestamps which category is not in ``remove``.
+
+    .. seealso::
+
+        :py:func:`remove_categories` for the parameters.
+
+    """
+    if index.empty or classificator is None:
+        return np.ones(index.size, dtype=bool)
     if remove is None:
         remove = []
-    categories = history.index.to_series().apply(classificator)
-    mask = [(day_cat not in remove) for day_cat in categories.to_numpy()]
-    return history.loc[mask]
+    categories = classify(index, classificator, vectorized=vectorized, daily=daily)
+    return ~_isin(categories, remove)
@@ -0,0 +1,229 @@
+"""Compose history filters and apply them at once.
+
+Chaining the filters of :py:mod:`.weekdays` and :py:mod:`.categories` copies the
+history at each step. A :py:class:`HistoryFilterPipeline` records the filters
+instead, evaluates them as boolean masks on the index of the history only, and
+takes the kept rows once.
+
+Example
+-------
+>>> pipeline = (
+...     HistoryFilterPipeline()
+...     .weekdays_only()
+...     .keep_categories(is_holiday, keep=[False], daily=True)
+... )
+>>> filtered = pipeline(history)
+>>> positions = pipeline.positions(history.index)  # rows kept, without copy
+
+"""
+
+from collections.abc import Callable
+
+import numpy as np
+import pandas as pd
+
+from .categories import (
+    keep_categories_mask,
+    remove_categories_mask,
+    same_category_mask,
+)
+from .weekdays import (
+    same_day_mask,
+    weekdays_mask,
+    weekends_mask,
+)
+
+
+class HistoryFilterPipeline:
+    """A sequence of history filters evaluated as masks on the index.
+
+    Each step is a function mapping a DatetimeIndex to the boolean mask of the
+    timestamps to be kept. The steps are evaluated in order, each one on the
+    timestamps kept by the previous ones, so that the result is the same as the
+    one of the chained filters, including the default reference dates which are
+    computed on the filtered history.
+
+    The methods adding a step return the pipeline, so that they can be chained.
+
+    """
+
+    def __init__(
+        self,
+        steps: list[Callable] | None = None,
+    ) -> None:
+        """Initialize a HistoryFilterPipeline instance.
+
+        Parameters
+        ----------
+        steps : list of callable, optional
+            The initial steps of the pipeline, as functions mapping a
+            DatetimeIndex to a boolean array of the same size.
+
+        """
+        self.steps = [] if steps is None else list(steps)
+
+    def __len__(self) -> int:
+        """Return the number of steps in the pipeline."""
+        return len(self.steps)
+
+    def __call__(
+        self,
+        history: pd.DataFrame,
+    ) -> pd.DataFrame:
+        """Return the filtered history, see :py:meth:`apply`."""
+        return self.apply(history)
+
+    def add(
+        self,
+        mask_function: Callable,
+    ) -> "HistoryFilterPipeline":
+        """Add a step to the pipeline.
+
+        Parameters
+        ----------
+        mask_function : callable
+            A function mapping a DatetimeIndex to the boolean array of the
+            timestamps to be kept.
+
+        Returns
+        -------
+        HistoryFilterPipeline
+            The pipeline itself.
+
+        """
+        self.steps.append(mask_function)
+        return self
+
+    def weekdays_only(self) -> "HistoryFilterPipeline":
+        """Keep the weekdays, see :py:func:`.weekdays_only`."""
+        return self.add(weekdays_mask)
+
+    def weekends_only(self) -> "HistoryFilterPipeline":
+        """Keep the weekends, see :py:func:`.weekends_only`."""
+        return self.add(weekends_mask)
+
+    def same_day_only(
+        self,
+        date: pd.Timestamp | None = None,
+    ) -> "HistoryFilterPipeline":
+        """Keep the same days of week as date, see :py:func:`.same_day_only`."""
+        return self.add(lambda index: same_day_mask(index, date))
+
+    def same_category(
+        self,
+        date: pd.Timestamp | None = None,
+        classificator: Callable | None = None,
+        *,
+        vectorized: bool = False,
+        daily: bool = False,
+    ) -> "HistoryFilterPipeline":
+        """Keep the same category as date, see :py:func:`.same_category`."""
+        return self.add(
+            lambda index: same_category_mask(
+                index,
+                date,
+                classificator,
+                vectorized=vectorized,
+                daily=daily,
+            ),
+        )
+
+    def keep_categories(
+        self,
+        classificator: Callable | None = None,
+        keep: list | None = None,
+        *,
+        vectorized: bool = False,
+        daily: bool = False,
+    ) -> "HistoryFilterPipeline":
+        """Keep the categories in a list, see :py:func:`.keep_categories`."""
+        return self.add(
+            lambda index: keep_categories_mask(
+                index,
+                classificator,
+                keep,
+                vectorized=vectorized,
+                daily=daily,
+            ),
+        )
+
+    def remove_categories(
+        self,
+        classificator: Callable | None = None,
+        remove: list | None = None,
+        *,
+        vectorized: bool = False,
+        daily: bool = False,
+    ) -> "HistoryFilterPipeline":
+        """Remove the categories in a list, see :py:func:`.remove_categories`."""
+        return self.add(
+            lambda index: remove_categories_mask(
+                index,
+                classificator,
+                remove,
+                vectorized=vectorized,
+                daily=daily,
+            ),
+        )
+
+    def positions(
+        self,
+        index: pd.DatetimeIndex,
+    ) -> np.ndarray:
+        """Return the positions of the timestamps kept by the pipeline.
+
+        Parameters
+        ----------
+        index : pd.DatetimeIndex
+            The index of the history to be filtered. It is expected to be sorted.
+
+        Returns
+        -------
+        np.ndarray
+            The sorted integer positions in ``index`` of the kept timestamps.
+
+        """
+        positions = np.arange(index.size)
+        for step in self.steps:
+            if positions.size == 0:
+                break
+            subset = index if positions.size == index.size else index[positions]
+            positions = positions[np.asarray(step(subset), dtype=bool)]
+        return positions
+
+    def mask(
+        self,
+        index: pd.DatetimeIndex,
+    ) -> np.ndarray:
+        """Return the boolean mask of the timestamps kept by the pipeline.
+
+        .. seealso::
+
+            :py:meth:`positions`
+
+        """
+        mask = np.zeros(index.size, dtype=bool)
+        mask[self.positions(index)] = True
+        return mask
+
+    def apply(
+        self,
+        history: pd.DataFrame,
+    ) -> pd.DataFrame:
+        """Return the history filtered by all the steps of the pipeline.
+
+        Parameters
+        ----------
+        history : pd.DataFrame or pd.Series
+            History data to be filtered. It is expected that the data is
+            time-indexed, with monotonic-increasing labels.
+
+        Returns
+        -------
+        pd.DataFrame or pd.Series
+            The rows of the history kept by the pipeline, taken at once.
+
+        """
+        if not self.steps:
+            return history
+        return history.take(self.positions(history.index))
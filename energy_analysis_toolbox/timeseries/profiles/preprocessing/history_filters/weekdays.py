@@ -1,7 +1,46 @@
-"""Filter history data based on day of week."""
+"""Filter history data based on day of week.
 
+Each filter has a ``*_mask`` counterpart which returns the boolean mask of the
+kept timestamps of an index, see :py:class:`.HistoryFilterPipeline`.
+"""
+
+import numpy as np
 import pandas as pd
 
+SATURDAY_DAY_OF_WEEK = 5
+
+
+def weekdays_mask(
+    index: pd.DatetimeIndex,
+) -> np.ndarray:
+    """Return the mask of the weekdays in an index, see :py:func:`weekdays_only`."""
+    return np.asarray(index.day_of_week < SATURDAY_DAY_OF_WEEK)
+
+
+def weekends_mask(
+    index: pd.DatetimeIndex,
+) -> np.ndarray:
+    """Return the mask of the weekends in an index, see :py:func:`weekends_only`."""
+    return np.asarray(index.day_of_week >= SATURDAY_DAY_OF_WEEK)
+
+
+def same_day_mask(
+    index: pd.DatetimeIndex,
+    date: pd.Timestamp | None = None,
+) -> np.ndarray:
+    """Return the mask of the same days of week as date.
+
+    .. seealso::
+
+        :py:func:`same_day_only` for the parameters.
+
+    """
+    if index.empty:
+        return np.ones(0, dtype=bool)
+    if date is None:
+        date = (index[-1].floor("D")) + pd.Timedelta("1D")
+    return np.asarray(index.day_of_week == date.day_of_week)
+
 
 def weekdays_only(
     history: pd.DataFrame,
@@ -20,8 +59,7 @@ def weekdays_only(
         Input history from which all weekends entry have been removed.
 
     """
-    saturday_day_of_week = 5
-    return history.loc[history.index.day_of_week < saturday_day_of_week]
+    return history.loc[weekdays_mask(history.index)]
 
 
 def weekends_only(
@@ -41,8 +79,7 @@ def weekends_only(
         Input history from which all weekdays entry have been removed.
 
     """
-    friday_day_of_week = 4
-    return history.loc[history.index.day_of_week > friday_day_of_week]
+    return history.loc[weekends_mask(history.index)]
 
 
 def same_day_only(
@@ -70,8 +107,4 @@ def same_day_only(
     """
     if history.empty:
         return history
-    if date is None:
-        date = (history.index[-1].floor("D")) + pd.Timedelta("1D")
-    else:
-        pass
-    return history.loc[history.index.day_of_week == date.day_of_week]
+    return history.loc[same_day_mask(history.index, date)]
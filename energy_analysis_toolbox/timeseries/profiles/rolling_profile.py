@@ -42,14 +42,12 @@ missing data via ``pandas``.
 
 .. note::
 
-    This look-up using ``pandas`` slices is significantly slow.
-
-    A solution to improve the performance of the rolling profile
-    is to make sure that all the expected rows are present (filled with NaNs if
-    necessary).
-
-    Using this pre-formatting step, we can use ``numpy`` to slice
-    using row indexes.
+    The bounds of the windows are the ones of the ``pandas`` rolling operation,
+    but the aggregation is computed with ``numpy`` on the rows of the pivoted
+    history : all the windows with the same number of rows are gathered in a
+    3D array and aggregated at once when the aggregation is a ``numpy``
+    reduction accepting an ``axis`` argument (see :py:func:`rows_aggregation`).
+    Other aggregations are called on each window.
 
 """
 
@@ -61,6 +59,206 @@ import pandas as pd
 
 from .mean_profile import MeanProfile
 
+# numpy reductions which give the same result on each row of a 2D array with
+# ``axis=1`` as on each raveled row.
+AXIS_AGGREGATIONS = frozenset(
+    {
+        np.mean,
+        np.nanmean,
+        np.median,
+        np.nanmedian,
+        np.quantile,
+        np.nanquantile,
+        np.percentile,
+        np.nanpercentile,
+        np.min,
+        np.nanmin,
+        np.max,
+        np.nanmax,
+        np.sum,
+        np.nansum,
+        np.std,
+        np.nanstd,
+        np.var,
+        np.nanvar,
+    },
+)
+# reductions of a window which are also the reduction of the reductions of its rows
+NESTED_AGGREGATIONS = frozenset({np.min, np.nanmin, np.max, np.nanmax})
+# maximum number of values gathered at once in the windows of an aggregation
+MAX_BLOCK_SIZE = 2**22
+# maximum ratio between the size of a daily matrix and the number of samples
+MAX_DAILY_MATRIX_FILL = 4
+DAY_NS = 24 * 3600 * 10**9
+
+
+def daily_matrix(series: pd.Series) -> pd.DataFrame | None:
+    """Return a timeseries as a table with time-of-day rows and date columns.
+
+    The table is the same as the one returned by :py:meth:`RollingProfile.daily_pivot`
+    but it is built by scattering the values in a 2D array, from the positions
+    computed with integer arithmetic on the timestamps in (ns).
+
+    Parameters
+    ----------
+    series : pd.Series
+        A timeseries with a DatetimeIndex.
+
+    Returns
+    -------
+    pd.DataFrame or None
+        The table with one row for each time elapsed since the midnight of the day,
+        and one column for each date, or |None| if the timeseries is empty or
+        irregularly sampled. The timeseries is considered irregular when the
+        table would contain more than :py:data:`MAX_DAILY_MATRIX_FILL` times as many
+        cells as there are samples.
+
+    Notes
+    -----
+    The following rules are the ones of a :py:func:`pandas.pivot_table` :
+
+    - the values at the same time of the same day (duplicated timestamps) are
+      averaged, missing values being skipped;
+    - the times and the days without any value are dropped.
+
+    """
+    if series.empty:
+        return None
+    index = series.index
+    unit = index.unit
+    instants = index.as_unit("ns").asi8
+    local = instants if index.tz is None else index.tz_localize(None).as_unit("ns").asi8
+    days = local // DAY_NS
+    unique_days, day_codes = np.unique(days, return_inverse=True)
+    midnights = pd.DatetimeIndex(unique_days * DAY_NS, dtype="datetime64[ns]")
+    if index.tz is None:
+        times = local - days * DAY_NS
+    else:
+        # elapsed time since midnight, as the difference of UTC instants
+        times = instants - midnights.tz_localize(index.tz).asi8[day_codes]
+    first = times.min()
+    step = np.gcd.reduce(times - first) or DAY_NS
+    time_codes = (times - first) // step
+    n_times = time_codes.max() + 1
+    if n_times * unique_days.size > MAX_DAILY_MATRIX_FILL * series.size:
+        return None
+    cells = time_codes * unique_days.size + day_codes
+    values = series.to_numpy(dtype=np.float64)
+    observed = ~np.isnan(values)
+    size = n_times * unique_days.size
+    counts = np.bincount(cells, weights=observed, minlength=size)
+    sums = np.bincount(cells, weights=np.where(observed, values, 0.0), minlength=size)
+    counts = counts.reshape(n_times, unique_days.size)
+    sums = sums.reshape(n_times, unique_days.size)
+    with np.errstate(invalid="ignore"):
+        matrix = np.where(counts > 0, sums / counts, np.nan)
+    kept_times = counts.any(axis=1)
+    kept_days = counts.any(axis=0)
+    return pd.DataFrame(
+        matrix[np.ix_(kept_times, kept_days)],
+        index=pd.TimedeltaIndex(
+            first + np.flatnonzero(kept_times) * step,
+            dtype="timedelta64[ns]",
+            name="time",
+        ).as_unit(unit),
+        columns=pd.Index(midnights[kept_days].date, dtype=object, name="day"),
+    )
+
+
+def rows_aggregation(
+    aggregation: Callable[[np.ndarray], float],
+) -> Callable[[np.ndarray], np.ndarray] | None:
+    """Return the version of an aggregation which reduces each row of a 2D array.
+
+    Parameters
+    ----------
+    aggregation : function
+        An aggregation function which works on a 1D numpy array.
+
+    Returns
+    -------
+    function or None
+        A function returning the aggregation of each row of a 2D array, or |None|
+        if ``aggregation`` is not one of the :py:data:`AXIS_AGGREGATIONS`, possibly
+        with keyword arguments set with :py:func:`functools.partial`.
+
+    Example
+    -------
+    >>> rows_aggregation(partial(np.quantile, q=0.8))(np.arange(10).reshape(2, 5))
+    array([3.2, 8.2])
+    >>> rows_aggregation(lambda x: x.max() - x.min()) is None
+    True
+
+    """
+    function, args, keywords = aggregation, (), {}
+    if isinstance(aggregation, partial):
+        function = aggregation.func
+        args, keywords = aggregation.args, aggregation.keywords
+    try:
+        known = function in AXIS_AGGREGATIONS
+    except TypeError:  # not hashable
+        known = False
+    if not known or args or "axis" in keywords:
+        return None
+    return partial(aggregation, axis=1)
+
+
+def windows_aggregation(
+    values: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    aggregation: Callable[[np.ndarray], float],
+) -> np.ndarray:
+    """Return the aggregation of the values in windows of consecutive rows.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        A 2D array of values.
+        The windows span contiguous rows and all the columns.
+    starts : np.ndarray
+        The index of the first row of each window.
+    ends : np.ndarray
+        The index of the row following the last row of each window.
+    aggregation : function
+        An aggregation function which works on a 1D numpy array. It is applied to
+        the raveled window ``values[start:end, :]``.
+
+    Returns
+    -------
+    np.ndarray
+        The aggregation of each window.
+
+    Notes
+    -----
+    When the aggregation can be computed along rows (see :py:func:`rows_aggregation`),
+    the windows with the same number of rows are gathered in blocks of at most
+    :py:data:`MAX_BLOCK_SIZE` values, which are aggregated at once. The extrema
+    in :py:data:`NESTED_AGGREGATIONS` are first computed on each row.
+
+    """
+    result = np.full(starts.size, np.nan)
+    reduce_rows = rows_aggregation(aggregation)
+    if reduce_rows is None:
+        for i, (start, end) in enumerate(zip(starts, ends, strict=True)):
+            result[i] = aggregation(values[start:end, :].ravel())
+        return result
+    if aggregation in NESTED_AGGREGATIONS:
+        values = reduce_rows(values)[:, np.newaxis]
+    values = np.ascontiguousarray(values)
+    n_columns = values.shape[1]
+    lengths = ends - starts
+    for length in np.unique(lengths):
+        windows = np.flatnonzero(lengths == length)
+        step = max(1, MAX_BLOCK_SIZE // max(1, length * n_columns))
+        for first in range(0, windows.size, step):
+            block = windows[first : first + step]
+            rows = starts[block, np.newaxis] + np.arange(length)
+            result[block] = reduce_rows(
+                values[rows].reshape(block.size, length * n_columns),
+            )
+    return result
+
 
 class RollingProfile:
     """Compute a profile by aggregating the history on time-periods rolling windows."""
@@ -169,8 +367,8 @@ class RollingProfile:
         This function handles Daylight Saving Time (DST) changes. Specifically:
           - For winter DST transitions (25-hour days), any times beyond 24 hours
             (e.g., the last hour of the day) are dropped to ensure consistency.
-          - Duplicated timestamps due to DST transitions are resolved by keeping the
-            first occurrence.
+          - Duplicated timestamps due to DST transitions in time-naive data are
+            averaged.
 
         - Times should be rounded to a consistent resolution (e.g., seconds or minutes)
           to avoid pivoting errors due to small differences in time values.
@@ -183,8 +381,17 @@ class RollingProfile:
             midnight this day, i.e. drops the last hour of the DST.
             This is not perfect but this is considered satisfactory to begin with.
 
+        .. seealso::
+
+            :py:func:`daily_matrix` which builds the table without a pivot, and is
+            used unless the history is irregularly sampled.
 
         """
+        df_day_by_time = daily_matrix(history[self.column_name])
+        if df_day_by_time is not None:
+            return df_day_by_time.drop(
+                labels=df_day_by_time.index[df_day_by_time.index >= pd.Timedelta("1D")],
+            )
         history = history.copy()
         history["time"] = history.index - history.index.floor("D")
         history["day"] = history.index.date
@@ -230,32 +437,46 @@ class RollingProfile:
             one column named ``self.column_name``.
 
 
-        .. note::
-
-            Using the setup allows to be sure that the dataframe ``pivoted_history``
-            upon which the agg is computed is the desired one (local scope of
-            ``custom_agg`` instead of global scope).
+        Notes
+        -----
+        The windows are the ones of a centered ``pandas`` rolling operation on the
+        index of ``pivoted_history``. As in this operation, the aggregation is |NaN|
+        when the first column contains less than the minimum number of
+        observations in the window (all the rows for a window with a number of
+        rows, one row for a duration window).
+        Otherwise, the aggregation is computed on all the values of the rows of
+        the window, missing values included.
 
         """
-
-        def custom_agg(
-            subseries: pd.Series,
-        ) -> float:
-            """Compute the ``agg`` function on ``pivoted_history`` using subseries.
-
-            For performance issue, slicing and ``ravel`` are used.
-            """
-            start, end = subseries.index[0], subseries.index[-1]
-            values = pivoted_history.loc[start:end, :].to_numpy().ravel()
-            return self.agg(values)
-
-        aggregated = (
-            pivoted_history.iloc[:, 0]  # select the first column, as we only roll once.
+        positions = pd.Series(
+            np.arange(len(pivoted_history), dtype=np.float64),
+            index=pivoted_history.index,
+        )
+        rolling = positions.rolling(self.window, center=True)
+        starts = rolling.min()
+        ends = rolling.max()
+        # same rule as pandas to decide if a window holds enough observations
+        valid = (
+            positions.where(pivoted_history.iloc[:, 0].notna())
             .rolling(self.window, center=True)
-            .apply(custom_agg, raw=False)  # we need the index passed.
+            .min()
+            .notna()
+            .to_numpy()
+        )
+        aggregated = np.full(len(pivoted_history), np.nan)
+        aggregated[valid] = windows_aggregation(
+            pivoted_history.to_numpy(),
+            starts.to_numpy()[valid].astype(np.int64),
+            ends.to_numpy()[valid].astype(np.int64) + 1,
+            self.agg,
+        )
+        return pd.DataFrame(
+            data=pd.Series(
+                aggregated,
+                index=pivoted_history.index,
+                name=self.column_name,
+            ),
         )
-        aggregated.name = self.column_name
-        return pd.DataFrame(data=aggregated)
 
 
 class RollingQuantileProfile(RollingProfile):
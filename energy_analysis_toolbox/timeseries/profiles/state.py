@@ -0,0 +1,296 @@
+"""Update a profile day after day on a sliding history.
+
+When a threshold profile is recomputed every day with the history of the last N
+days, the history gains one period and loses one at each update. The
+:py:class:`TrailingProfileState` keeps the statistics of each slot of the period
+(running sums, sums of squares and counts) and updates them with the samples of
+the new period and of the evicted one only, instead of regrouping the whole
+history.
+
+Example
+-------
+>>> state = TrailingProfileState(HybridThreshold(window=3), n_periods=28)
+>>> for day in days:
+...     state.push(history.loc[day : day + pd.Timedelta("1D")].iloc[:-1])
+...     threshold = state.compute(day + pd.Timedelta("1D"))
+
+"""
+
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from energy_analysis_toolbox.errors import EATInvalidTimeseriesError
+
+from .mean_profile import MIN_STD_COUNT, MeanProfile
+
+
+class TrailingProfileState:
+    """The statistics of a profile on the history of the last periods.
+
+    The state holds the samples of the last ``n_periods`` periods pushed, and, for
+    each slot of the period (see :py:meth:`.MeanProfile.group`) :
+
+    - the number of samples, missing or not;
+    - the count, sum and sum of squares of the values, from which the standard
+      deviation profile is obtained;
+    - the count and sum of the values smoothed with the rolling max (or min) of
+      :py:attr:`.MeanProfile.window`, from which the mean profile is obtained.
+
+    The sums of the values are offset by the first value of the slot to limit
+    rounding errors.
+
+    .. seealso::
+
+        :py:meth:`.MeanProfile.compute_many` which computes the profiles of many
+        target times at once when the whole history is known.
+
+    """
+
+    def __init__(
+        self,
+        profile: MeanProfile,
+        n_periods: int,
+    ) -> None:
+        """Initialize a TrailingProfileState instance.
+
+        Parameters
+        ----------
+        profile : MeanProfile
+            The profile to be computed on the history, e.g. a
+            :py:class:`.HybridThreshold`. Its ``threshold`` method combines the
+            mean and standard deviation profiles.
+        n_periods : int
+            The number of periods in the history. Pushing a new period beyond this
+            number evicts the oldest one.
+
+        """
+        if n_periods < 1:
+            err = f"The number of periods must be positive, got {n_periods}."
+            raise ValueError(err)
+        self.profile = profile
+        self.n_periods = n_periods
+        # number of samples of each period in the history
+        self._period_sizes = deque()
+        # buffers of the samples of the history, in rows [start:end]
+        self._codes = np.empty(0, dtype=np.int64)
+        self._values = np.empty(0, dtype=np.float64)
+        self._smoothed = np.empty(0, dtype=np.float64)
+        self._start, self._end = 0, 0
+        self._last_time = None
+        self._name = None
+        self._index_name = None
+        # statistics of each slot, in the order of creation of the slots
+        self._slots = np.empty(0, dtype=np.int64)
+        self._shifts = np.empty(0, dtype=np.float64)
+        self._samples = np.empty(0, dtype=np.float64)
+        self._counts = np.empty(0, dtype=np.float64)
+        self._sums = np.empty(0, dtype=np.float64)
+        self._squares = np.empty(0, dtype=np.float64)
+        self._smoothed_counts = np.empty(0, dtype=np.float64)
+        self._smoothed_sums = np.empty(0, dtype=np.float64)
+        # rows of truncated rolling window at the beginning and end of the history
+        self._before, self._after = 0, 0
+        if profile.window > 1:
+            edges = profile.smooth(pd.Series(np.zeros(2 * profile.window))).isna()
+            self._before = int(edges.to_numpy().argmin())
+            self._after = int(edges.to_numpy()[::-1].argmin())
+
+    def __len__(self) -> int:
+        """Return the number of periods in the history."""
+        return len(self._period_sizes)
+
+    def push(
+        self,
+        samples: pd.Series,
+    ) -> None:
+        """Add the samples of the next period to the history.
+
+        The oldest period is evicted if the history already contains
+        ``n_periods`` periods.
+
+        Parameters
+        ----------
+        samples : pd.Series
+            The timeseries of the next period, located after the samples in the
+            history. The period may be empty.
+
+        Raises
+        ------
+        EATInvalidTimeseriesError :
+            In case the samples are not sorted or not located after the samples
+            in the history.
+
+        """
+        index = samples.index
+        if not index.is_monotonic_increasing or not index.is_unique:
+            err = "The index of the samples must be sorted without duplicates."
+            raise EATInvalidTimeseriesError(err)
+        if (
+            not samples.empty
+            and self._last_time is not None
+            and index[0] <= self._last_time
+        ):
+            err = "The samples must be located after the history."
+            raise EATInvalidTimeseriesError(err)
+        if len(self._period_sizes) == self.n_periods:
+            self._evict(self._period_sizes.popleft())
+        self._period_sizes.append(samples.size)
+        if samples.empty:
+            return
+        if self._last_time is None:
+            self._name = samples.name
+            self._index_name = index.name
+        self._last_time = index[-1]
+        values = samples.to_numpy(dtype=np.float64)
+        codes = self._slot_codes(
+            (index - index.floor(self.profile.period)).as_unit("ns").asi8,
+            values,
+        )
+        self._update_values(codes, values, 1.0)
+        end = self._reserve(values.size)
+        # the smoothed values at the end of the history change with the new samples
+        changed = max(self._start, self._end - self._after)
+        context = max(self._start, changed - self._before)
+        self._update_smoothed(changed, self._end, -1.0)
+        self._codes[self._end : end] = codes
+        self._values[self._end : end] = values
+        self._end = end
+        smoothed = self.profile.smooth(pd.Series(self._values[context:end]))
+        self._smoothed[changed:end] = smoothed.to_numpy()[changed - context :]
+        self._update_smoothed(changed, end, 1.0)
+
+    def compute(
+        self,
+        time: pd.Timestamp,
+    ) -> pd.Series:
+        """Return the profile computed on the history.
+
+        Parameters
+        ----------
+        time : pd.Timestamp
+            The time at which the profile is of interest.
+
+        Returns
+        -------
+        pd.Series
+            The same profile as ``self.profile.compute(history, time)`` where
+            ``history`` is the concatenation of the periods in the state, up to
+            rounding errors.
+
+        """
+        order = np.argsort(self._slots)
+        kept = order[self._samples[order] > 0]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = self._smoothed_sums[kept] / self._smoothed_counts[kept]
+            counts = self._counts[kept]
+            sums = self._sums[kept]
+            variance = (self._squares[kept] - sums**2 / counts) / (counts - 1)
+        std = np.sqrt(np.clip(variance, 0.0, None))
+        std[counts < MIN_STD_COUNT] = np.nan
+        index = pd.DatetimeIndex(
+            time + pd.to_timedelta(self._slots[kept]),
+            name=self._index_name,
+        )
+        return self.profile.threshold(
+            pd.Series(mean, index=index, name=self._name),
+            pd.Series(std, index=index, name=self._name),
+        )
+
+    def _slot_codes(
+        self,
+        offsets: np.ndarray,
+        values: np.ndarray,
+    ) -> np.ndarray:
+        """Return the codes of the slots of offsets, creating the new slots."""
+        new, first = np.unique(offsets, return_index=True)
+        created = ~np.isin(new, self._slots)
+        if created.any():
+            shifts = np.nan_to_num(values[first[created]])
+            n_created = created.sum()
+            self._slots = np.r_[self._slots, new[created]]
+            self._shifts = np.r_[self._shifts, shifts]
+            for name in [
+                "_samples",
+                "_counts",
+                "_sums",
+                "_squares",
+                "_smoothed_counts",
+                "_smoothed_sums",
+            ]:
+                setattr(self, name, np.r_[getattr(self, name), np.zeros(n_created)])
+        order = np.argsort(self._slots)
+        return order[np.searchsorted(self._slots, offsets, sorter=order)]
+
+    def _reserve(self, size: int) -> int:
+        """Make room for ``size`` rows at the end of the buffers, return their end.
+
+        The rows of the history are moved to the beginning of the buffers when
+        they are full, and the buffers grow geometrically when this is not enough.
+        """
+        if self._end + size > self._values.size:
+            n_rows = self._end - self._start
+            capacity = max(self._values.size, 2 * (n_rows + size))
+            for name in ["_codes", "_values", "_smoothed"]:
+                buffer = getattr(self, name)
+                moved = np.empty(capacity, dtype=buffer.dtype)
+                moved[:n_rows] = buffer[self._start : self._end]
+                setattr(self, name, moved)
+            self._start, self._end = 0, n_rows
+        return self._end + size
+
+    def _evict(self, size: int) -> None:
+        """Remove the ``size`` oldest samples from the history."""
+        start, end = self._start, self._start + size
+        self._update_values(self._codes[start:end], self._values[start:end], -1.0)
+        # the rolling window of the new first values is now truncated
+        truncated = min(self._end, end + self._before)
+        self._update_smoothed(start, truncated, -1.0)
+        self._smoothed[end:truncated] = np.nan
+        self._start = end
+
+    def _update_values(
+        self,
+        codes: np.ndarray,
+        values: np.ndarray,
+        sign: float,
+    ) -> None:
+        """Add (or remove with ``sign=-1``) samples to the statistics of the slots."""
+        size = self._slots.size
+        observed = ~np.isnan(values)
+        deviations = np.where(observed, values - self._shifts[codes], 0.0)
+        self._samples += sign * np.bincount(codes, minlength=size)
+        self._counts += sign * np.bincount(codes, weights=observed, minlength=size)
+        self._sums += sign * np.bincount(codes, weights=deviations, minlength=size)
+        self._squares += sign * np.bincount(
+            codes,
+            weights=deviations**2,
+            minlength=size,
+        )
+        empty = self._counts == 0
+        self._sums[empty] = 0.0
+        self._squares[empty] = 0.0
+
+    def _update_smoothed(
+        self,
+        start: int,
+        end: int,
+        sign: float,
+    ) -> None:
+        """Add (or remove) smoothed values of history rows to the slot statistics."""
+        size = self._slots.size
+        codes = self._codes[start:end]
+        smoothed = self._smoothed[start:end]
+        observed = ~np.isnan(smoothed)
+        self._smoothed_counts += sign * np.bincount(
+            codes,
+            weights=observed,
+            minlength=size,
+        )
+        self._smoothed_sums += sign * np.bincount(
+            codes,
+            weights=np.where(observed, smoothed, 0.0),
+            minlength=size,
+        )
+        self._smoothed_sums[self._smoothed_counts == 0] = 0.0
@@ -45,7 +45,7 @@ class HybridThreshold(MeanProfile):
         self,
         history: pd.Series,
         time: pd.Timestamp,
-        **kwargs,
+        **kwargs,  # noqa:ARG002
     ) -> pd.Series:
         """Return a threshold profile.
 
@@ -97,11 +97,26 @@ class HybridThreshold(MeanProfile):
             In ``self.is_max == False``, replace "max" by "min" in the text above.
 
         """
-        # rel and ref on smoothed data
-        smooth_mean_profile = super().compute(history, time, **kwargs)
+        # rel and ref on smoothed data, std on unsmoothed data
+        smooth_mean_profile, std_profile = self.statistics(history)
+        smooth_mean_profile.index += time
+        return self.threshold(smooth_mean_profile, std_profile)
+
+    def threshold(
+        self,
+        reference: pd.Series,
+        std: pd.Series,
+    ) -> pd.Series:
+        """Return the hybrid threshold profile, see :py:meth:`compute`.
+
+        .. seealso::
+
+            :py:meth:`.MeanProfile.threshold`
+
+        """
+        smooth_mean_profile = reference
         rel_profile = smooth_mean_profile * self.offset_rel
-        # std on unsmoothed data
-        std_profile = self.group(history).std() * self.offset_std
+        std_profile = std * self.offset_std
         std_profile.index = rel_profile.index
         profile_deviations = pd.DataFrame.from_dict(
             {"std": std_profile, "tshd": rel_profile},
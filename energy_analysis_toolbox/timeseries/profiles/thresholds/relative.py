@@ -67,6 +67,20 @@ class RelativeThreshold(MeanProfile):
 
         """
         reference = super().compute(history, time, **kwargs)
+        return self.threshold(reference, None)
+
+    def threshold(
+        self,
+        reference: pd.Series,
+        std: pd.Series | None,  # noqa:ARG002
+    ) -> pd.Series:
+        """Return ``(1 + tshd) *`` the mean profile.
+
+        .. seealso::
+
+            :py:meth:`.MeanProfile.threshold`
+
+        """
         offset = self.offset_rel * reference
         offset.index = reference.index
         return reference + offset
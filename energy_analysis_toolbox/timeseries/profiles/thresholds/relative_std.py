@@ -35,7 +35,7 @@ class RelativeSTDThreshold(MeanProfile):
         self,
         history: pd.Series,
         time: pd.Timestamp,
-        **kwargs,
+        **kwargs,  # noqa:ARG002
     ) -> pd.Series:
         """Return a threshold profile.
 
@@ -63,8 +63,22 @@ class RelativeSTDThreshold(MeanProfile):
         from history + ``tshd`` times the standard deviation profile.
 
         """
-        profile_groups = self.group(history)
-        reference = super().compute(history, time, **kwargs)
-        offset = self.offset_std * profile_groups.std()
+        reference, std = self.statistics(history)
+        reference.index += time
+        return self.threshold(reference, std)
+
+    def threshold(
+        self,
+        reference: pd.Series,
+        std: pd.Series,
+    ) -> pd.Series:
+        """Return the mean profile + ``tshd`` times the standard deviation profile.
+
+        .. seealso::
+
+            :py:meth:`.MeanProfile.threshold`
+
+        """
+        offset = self.offset_std * std
         offset.index = reference.index
         return reference + offset
@@ -4,6 +4,14 @@ from ._facade import (
     to_freq,
     trim_out_of_bounds,
 )
+from .batch import (
+    flow_rate_conservative_batch,
+    flow_rate_to_freq_batch,
+    long_to_wide,
+    volume_conservative_batch,
+    volume_to_freq_batch,
+    wide_to_long,
+)
 from .conservative import (
     flow_rate_conservative,
     flow_rate_to_freq,
@@ -18,6 +26,20 @@ from .index_transformation import (
     tz_convert_or_localize,
 )
 from .interpolate import (
+    grid_positions,
     piecewise_affine,
+    piecewise_affine_kernel,
     piecewise_constant,
+    piecewise_constant_kernel,
+)
+from .ragged import (
+    RaggedTimeseries,
+    flow_rate_to_freq_ragged,
+    volume_to_freq_ragged,
+)
+from .streaming import (
+    ConservativeResampler,
+    append_to_freq,
+    flow_rate_to_freq_chunks,
+    volume_to_freq_chunks,
 )
@@ -3,6 +3,13 @@ from typing import Literal
 
 import pandas as pd
 
+from .batch import (
+    flow_rate_to_freq_batch,
+    is_long_format,
+    long_to_wide,
+    volume_to_freq_batch,
+    wide_to_long,
+)
 from .conservative import (
     flow_rate_to_freq,
     volume_to_freq,
@@ -25,19 +32,24 @@ resampling_methods = (
 
 
 def to_freq(
-    timeseries: "pd.Series[float]",
+    timeseries: "pd.Series[float] | pd.DataFrame",
     freq: str,
     origin: Literal["floor", "ceil"] | pd.Timestamp | None = None,
     last_step_duration: float | None = None,
     method: resampling_methods = "piecewise_affine",
     **kwargs,
-) -> "pd.Series[float]":
+) -> "pd.Series[float] | pd.DataFrame":
     """Return a timeseries resampled at a given frequency.
 
     Parameters
     ----------
-    timeseries : pd.Series
+    timeseries : pd.Series or pd.DataFrame
         Series of values of a function of time, indexed using DateTimeIndex.
+        A table of several timeseries can also be passed, either as a wide table
+        (one column per timeseries on a shared DatetimeIndex) or as a long-format
+        table (see :py:mod:`.batch`). In this case, the conservative methods
+        use the batched engine of :py:mod:`.batch` while the other methods are
+        applied to each timeseries in turn.
     freq : str
         Frequency of the resampled series. See :py:func:`pandas.Series.resample`
         for a list of possible values.
@@ -64,6 +76,10 @@ def to_freq(
         argument and a :py:class:`pandas.DatetimeIndex` as second argument.
         See the interface of :py:func:`piecewise_affine` function.
         The default is 'piecewise_affine'.
+    kwargs : mapping, optional
+        Additional keyword arguments of the method, such as ``left_pad`` for
+        'piecewise_constant'. The conservative methods take none, and raise a
+        TypeError if some are given with a table.
 
 
     .. important::
@@ -73,8 +89,9 @@ def to_freq(
 
     Returns
     -------
-    new_series : pd.Series
-        Values of the series resampled at the given frequency.
+    new_series : pd.Series or pd.DataFrame
+        Values of the series resampled at the given frequency. Tables are
+        returned in the same layout as ``timeseries``.
 
     Examples
     --------
@@ -103,7 +120,22 @@ def to_freq(
     See more examples of use in :doc:`/user_guide/Resampling_time_series`.
 
 
+    .. seealso::
+
+        :py:func:`.append_to_freq` which updates a conservative resampling
+        when new samples are appended to the source timeseries, without
+        recomputing the whole history.
+
     """
+    if isinstance(timeseries, pd.DataFrame):
+        return _frame_to_freq(
+            timeseries,
+            freq,
+            origin=origin,
+            last_step_duration=last_step_duration,
+            method=method,
+            **kwargs,
+        )
     # Directly apply the method if it is a conservative method for which an
     # integrated method exists
     integrated_methods = {
@@ -146,6 +178,70 @@ def to_freq(
     return new_series
 
 
+def _frame_to_freq(
+    data: pd.DataFrame,
+    freq: str,
+    origin: Literal["floor", "ceil"] | pd.Timestamp | None = None,
+    last_step_duration: float | None = None,
+    method: resampling_methods = "piecewise_affine",
+    **kwargs,
+) -> pd.DataFrame:
+    """Return a table of timeseries resampled at a given frequency.
+
+    See :py:func:`to_freq` for the description of the parameters.
+
+    Raises
+    ------
+    TypeError :
+        In case keyword arguments are given with a conservative method, which
+        would be ignored by the batched engine.
+
+    """
+    batched_methods = {
+        "volume_conservative": volume_to_freq_batch,
+        "flow_rate_conservative": flow_rate_to_freq_batch,
+    }
+    if isinstance(method, str) and method in batched_methods:
+        if kwargs:
+            err = (
+                f"The {method} method of tables takes no keyword arguments. "
+                f"Received {sorted(kwargs)}."
+            )
+            raise TypeError(err)
+        return batched_methods[method](
+            data,
+            freq,
+            origin=origin,
+            last_step_duration=last_step_duration,
+        )
+    if is_long_format(data):
+        return wide_to_long(
+            _frame_to_freq(
+                long_to_wide(data),
+                freq,
+                origin=origin,
+                last_step_duration=last_step_duration,
+                method=method,
+                **kwargs,
+            ),
+        )
+    return pd.concat(
+        {
+            column: to_freq(
+                data[column],
+                freq,
+                origin=origin,
+                last_step_duration=last_step_duration,
+                method=method,
+                **kwargs,
+            )
+            for column in data.columns
+        },
+        axis=1,
+        names=data.columns.names,
+    )
+
+
 def trim_out_of_bounds(
     data: pd.DataFrame | pd.Series,
     resampled_data: pd.DataFrame | pd.Series,
@@ -0,0 +1,452 @@
+"""Resample many timeseries sharing the same index in a conservative way.
+
+This module is the batched counterpart of
+:py:mod:`energy_analysis_toolbox.timeseries.resample.conservative`. Instead of
+processing one :py:class:`pandas.Series` at a time, the functions work on tables
+containing one timeseries per column (e.g. one column per meter), all sampled on
+the same index. The cumulated volumes of all the columns are interpolated at
+once on a 2D array, so that the cost of the index manipulations (durations,
+offsets, interpolation weights) is paid only once for the whole table.
+
+Two layouts of tables are accepted by the ``*_to_freq_batch`` functions:
+
+- **wide** tables: a :py:class:`pandas.DataFrame` with a ``DatetimeIndex`` and one
+  column per timeseries.
+- **long** tables: a :py:class:`pandas.DataFrame` with (at least) three columns
+  |eatk.meter_id_f|, |eatk.time_f| and |eatk.value_f|. When the meters do not
+  share the same timestamps, the table is processed with the ragged engine of
+  :py:mod:`energy_analysis_toolbox.timeseries.resample.ragged`.
+
+The results are returned in the same layout as the input.
+
+"""
+
+from collections.abc import Callable
+from typing import Literal
+
+import numpy as np
+import pandas as pd
+
+from energy_analysis_toolbox import keywords as eatk
+from energy_analysis_toolbox.core.basics import as_times
+from energy_analysis_toolbox.core.conservative import (
+    flow_rate_conservative as core_flow_rate_conservative,
+)
+from energy_analysis_toolbox.core.conservative import (
+    volume_conservative as core_volume_conservative,
+)
+from energy_analysis_toolbox.errors import EATInvalidTimeseriesError
+from energy_analysis_toolbox.timeseries.resample.index_transformation import (
+    index_to_freq,
+)
+from energy_analysis_toolbox.timeseries.resample.ragged import (
+    RaggedTimeseries,
+    flow_rate_to_freq_ragged,
+    volume_to_freq_ragged,
+)
+
+
+# =============================================================================
+# Layout conversions
+# =============================================================================
+def is_long_format(
+    data: pd.DataFrame,
+    meter_f: str = eatk.meter_id_f,
+    time_f: str = eatk.time_f,
+    value_f: str = eatk.value_f,
+) -> bool:
+    """Return True if ``data`` is a long-format table of timeseries.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        A table of timeseries.
+    meter_f : str, default |eatk.meter_id_f|
+        The name of the column identifying the timeseries.
+    time_f : str, default |eatk.time_f|
+        The name of the column containing the timestamps.
+    value_f : str, default |eatk.value_f|
+        The name of the column containing the values.
+
+    Returns
+    -------
+    bool :
+        True if ``data`` is not indexed with a ``DatetimeIndex`` and contains
+        the ``meter_f``, ``time_f`` and ``value_f`` columns.
+
+    """
+    return not isinstance(data.index, pd.DatetimeIndex) and {
+        meter_f,
+        time_f,
+        value_f,
+    }.issubset(data.columns)
+
+
+def long_to_wide(
+    table: pd.DataFrame,
+    meter_f: str = eatk.meter_id_f,
+    time_f: str = eatk.time_f,
+    value_f: str = eatk.value_f,
+) -> pd.DataFrame:
+    """Return a long-format table of timeseries as a wide table.
+
+    Parameters
+    ----------
+    table : pd.DataFrame
+        A table with one row per (meter, timestamp) couple.
+    meter_f : str, default |eatk.meter_id_f|
+        The name of the column identifying the timeseries.
+    time_f : str, default |eatk.time_f|
+        The name of the column containing the timestamps.
+    value_f : str, default |eatk.value_f|
+        The name of the column containing the values.
+
+    Returns
+    -------
+    pd.DataFrame :
+        A table indexed by the sorted timestamps, named ``time_f``, with one
+        column per meter, the columns index being named ``meter_f``.
+
+    Raises
+    ------
+    EATInvalidTimeseriesError :
+        If the meters in ``table`` do not share the same timestamps, or if
+        a (meter, timestamp) couple is duplicated.
+
+    """
+    n_rows = table.shape[0]
+    try:
+        # unlike pivot_table, pivot raises on duplicated couples
+        wide = table.pivot(index=time_f, columns=meter_f, values=value_f)  # noqa:PD010
+    except ValueError:
+        err = "Each (meter, timestamp) couple must appear at most once in the table."
+        raise EATInvalidTimeseriesError(err) from None
+    if wide.size != n_rows:
+        err = (
+            "All the meters in the long-format table must share the same timestamps "
+            "to be processed as a wide table."
+        )
+        raise EATInvalidTimeseriesError(err)
+    return wide.sort_index()
+
+
+def wide_to_long(
+    frame: pd.DataFrame,
+    meter_f: str = eatk.meter_id_f,
+    time_f: str = eatk.time_f,
+    value_f: str = eatk.value_f,
+) -> pd.DataFrame:
+    """Return a wide table of timeseries as a long-format table.
+
+    Parameters
+    ----------
+    frame : pd.DataFrame
+        A table with a ``DatetimeIndex`` and one column per meter.
+    meter_f : str, default |eatk.meter_id_f|
+        The name of the column identifying the timeseries in the result.
+    time_f : str, default |eatk.time_f|
+        The name of the column containing the timestamps in the result.
+    value_f : str, default |eatk.value_f|
+        The name of the column containing the values in the result.
+
+    Returns
+    -------
+    pd.DataFrame :
+        A table with columns ``meter_f``, ``time_f`` and ``value_f``, sorted by
+        meter and then by timestamp.
+
+    """
+    long = frame.rename_axis(index=time_f, columns=meter_f).melt(
+        ignore_index=False,
+        value_name=value_f,
+    )
+    long = long.reset_index()[[meter_f, time_f, value_f]]
+    return long.sort_values([meter_f, time_f], kind="stable", ignore_index=True)
+
+
+# =============================================================================
+# Batched resampling with volume conservation
+# =============================================================================
+def volume_conservative_batch(
+    volumes: pd.DataFrame,
+    target_instants: pd.DatetimeIndex,
+    last_step_duration: float | None = None,
+    last_target_step_duration: float | None = None,
+) -> pd.DataFrame:
+    """Resample each column of a table of volumes on target instants.
+
+    The function returns the same result as
+    :py:func:`.volume_conservative` applied to each column of ``volumes``, but
+    processes all the columns in one vectorized pass. The only difference is
+    about missing values: the volumes which cannot be determined are NaN in the
+    returned table, whereas :py:func:`.volume_conservative` drops them.
+
+    Parameters
+    ----------
+    volumes : pd.DataFrame
+        A table of volumes in (X), with a DatetimeIndex and one timeseries per
+        column. The value at a certain index is the volume consumed *until the
+        next index*.
+    target_instants : pd.DatetimeIndex
+        Instants at which the volumes have to be returned.
+    last_step_duration : float, optional
+        Duration of the last time-step in the ``volumes`` table in (s).
+        The default is |None| in which case the duration of the former-last
+        time-step is used.
+    last_target_step_duration : float, optional
+        Duration of the last time-step in the returned table in (s).
+        The default is |None| in which case the duration of the former-last
+        time-step is used.
+
+    Returns
+    -------
+    pd.DataFrame
+        The volumes resampled on ``target_instants``, with the same columns as
+        ``volumes``. The rows of all the target instants are kept, including the
+        ones with missing values.
+
+    Raises
+    ------
+    EATEmptySourceError :
+        In case ``volumes`` has no rows.
+    EATEmptyTargetsError :
+        In case ``target_instants`` is empty.
+    EATInvalidTimestepDurationError :
+        In case ``last_step_duration <= 0``.
+    EATInvalidTimestepDurationError :
+        In case ``last_target_step_duration <= 0``.
+
+    Notes
+    -----
+    The values of all the columns are stacked in a 2D array which is resampled
+    by :py:func:`energy_analysis_toolbox.core.volume_conservative`, the kernel
+    of :py:func:`.volume_conservative`. The interpolation weights of the
+    cumulated volumes are thus computed only once for the whole table.
+
+
+    .. seealso::
+
+        :py:func:`flow_rate_conservative_batch` which resamples flow-rates in
+        the same way.
+
+    """
+    new_values = core_volume_conservative(
+        as_times(volumes.index),
+        volumes.to_numpy(dtype=np.float64),
+        as_times(target_instants),
+        last_step_duration=last_step_duration,
+        last_target_step_duration=last_target_step_duration,
+    )
+    return pd.DataFrame(
+        new_values,
+        index=target_instants.rename(volumes.index.name),
+        columns=volumes.columns.copy(),
+    )
+
+
+def flow_rate_conservative_batch(
+    flow_rates: pd.DataFrame,
+    target_instants: pd.DatetimeIndex,
+    last_step_duration: float | None = None,
+    last_target_step_duration: float | None = None,
+) -> pd.DataFrame:
+    """Resample each column of a table of flow-rates on target instants.
+
+    The function returns the same result as
+    :py:func:`.flow_rate_conservative` applied to each column of ``flow_rates``,
+    but processes all the columns in one vectorized pass. As in
+    :py:func:`volume_conservative_batch`, the flow-rates which cannot be
+    determined are NaN in the returned table instead of being dropped.
+
+    Parameters
+    ----------
+    flow_rates : pd.DataFrame
+        A table of flow-rates in (X.s-1), with a DatetimeIndex and one timeseries
+        per column. The value at time ``ti`` is the flow-rate during the interval
+        ``[ti, ti+1[``.
+    target_instants : pd.DatetimeIndex
+        Instants at which the flow-rates have to be returned.
+    last_step_duration : float, optional
+        Duration of the last time-step in the ``flow_rates`` table in (s).
+        The default is |None| in which case the duration of the former-last
+        time-step is used.
+    last_target_step_duration : float, optional
+        Duration of the last time-step in the returned table in (s).
+        The default is |None| in which case the duration of the former-last
+        time-step is used.
+
+    Returns
+    -------
+    pd.DataFrame
+        The flow-rates resampled on ``target_instants``, with the same columns as
+        ``flow_rates``. The rows of all the target instants are kept, including
+        the ones with missing values.
+
+    Raises
+    ------
+    EATEmptySourceError :
+        In case ``flow_rates`` has no rows.
+    EATEmptyTargetsError :
+        In case ``target_instants`` is empty.
+    EATInvalidTimestepDurationError :
+        In case ``last_step_duration <= 0``
+    EATInvalidTimestepDurationError :
+        In case ``last_target_step_duration <= 0``
+
+
+    .. seealso::
+
+        :py:func:`volume_conservative_batch` which resamples volumes in the
+        same way.
+
+    """
+    new_values = core_flow_rate_conservative(
+        as_times(flow_rates.index),
+        flow_rates.to_numpy(dtype=np.float64),
+        as_times(target_instants),
+        last_step_duration=last_step_duration,
+        last_target_step_duration=last_target_step_duration,
+    )
+    return pd.DataFrame(
+        new_values,
+        index=target_instants.rename(flow_rates.index.name),
+        columns=flow_rates.columns.copy(),
+    )
+
+
+def _batch_to_freq(
+    data: pd.DataFrame,
+    freq: str | pd.Timedelta,
+    origin: Literal["floor", "ceil"] | pd.Timestamp | None,
+    last_step_duration: float | None,
+    *,
+    resampler: Callable[..., pd.DataFrame],
+    ragged_resampler: Callable[..., RaggedTimeseries],
+) -> pd.DataFrame:
+    """Resample a wide or long table to ``freq`` using ``resampler``.
+
+    Long tables which meters do not share the same timestamps are resampled
+    with ``ragged_resampler`` instead.
+    """
+    if is_long_format(data):
+        try:
+            wide = long_to_wide(data)
+        except EATInvalidTimeseriesError:
+            ragged = RaggedTimeseries.from_long(data)
+            return ragged_resampler(ragged, freq, origin, last_step_duration).to_long()
+        resampled = _batch_to_freq(
+            wide,
+            freq,
+            origin,
+            last_step_duration,
+            resampler=resampler,
+            ragged_resampler=ragged_resampler,
+        )
+        return wide_to_long(resampled)
+    target_instants = index_to_freq(data.index, freq, origin, last_step_duration)
+    return resampler(
+        data,
+        target_instants,
+        last_step_duration=last_step_duration,
+        last_target_step_duration=pd.Timedelta(freq).total_seconds(),
+    )
+
+
+def volume_to_freq_batch(
+    data: pd.DataFrame,
+    freq: str | pd.Timedelta,
+    origin: Literal["floor", "ceil"] | pd.Timestamp | None = None,
+    last_step_duration: float | None = None,
+) -> pd.DataFrame:
+    """Return a table of volumes resampled to freq such that the volume is conserved.
+
+    The last step duration of the resampled table is set to the frequency ``freq``.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        A wide table (one column per timeseries on a shared DatetimeIndex) or a
+        long-format table of volume-alike quantities. See the module
+        documentation for the details about the layouts.
+    freq : str | pd.Timedelta
+        the freq to which the table is resampled. Must be a valid
+        pandas frequency.
+    origin : {None, 'floor, 'ceil', pd.Timestamp}, optional
+        What origin should be used for the target resampling range.
+        See :py:func:`.index_to_freq` for details.
+    last_step_duration : float, optional
+        Duration of the last time-step in ``data`` in (s).
+        The default is |None| in which case the duration of the former-last
+        time-step is used.
+
+    Returns
+    -------
+    pd.DataFrame
+        The resampled table, in the same layout as ``data``. Missing values are
+        kept as NaN, see :py:func:`volume_conservative_batch`.
+
+
+    .. seealso::
+
+        * :py:func:`.volume_to_freq` which resamples a single series.
+        * :py:func:`flow_rate_to_freq_batch` which resamples flow-rates.
+
+    """
+    return _batch_to_freq(
+        data,
+        freq,
+        origin,
+        last_step_duration,
+        resampler=volume_conservative_batch,
+        ragged_resampler=volume_to_freq_ragged,
+    )
+
+
+def flow_rate_to_freq_batch(
+    data: pd.DataFrame,
+    freq: str | pd.Timedelta,
+    origin: Literal["floor", "ceil"] | pd.Timestamp | None = None,
+    last_step_duration: float | None = None,
+) -> pd.DataFrame:
+    """Return a table of flow-rates resampled to freq such that the volume is conserved.
+
+    The last step duration of the resampled table is set to the frequency ``freq``.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        A wide table (one column per timeseries on a shared DatetimeIndex) or a
+        long-format table of flow-rate-alike quantities. See the module
+        documentation for the details about the layouts.
+    freq : str | pd.Timedelta
+        the freq to which the table is resampled. Must be a valid
+        pandas frequency.
+    origin : {None, 'floor, 'ceil', pd.Timestamp}, optional
+        What origin should be used for the target resampling range.
+        See :py:func:`.index_to_freq` for details.
+    last_step_duration : float, optional
+        Duration of the last time-step in ``data`` in (s).
+        The default is |None| in which case the duration of the former-last
+        time-step is used.
+
+    Returns
+    -------
+    pd.DataFrame
+        The resampled table, in the same layout as ``data``. Missing values are
+        kept as NaN, see :py:func:`volume_conservative_batch`.
+
+
+    .. seealso::
+
+        * :py:func:`.flow_rate_to_freq` which resamples a single series.
+        * :py:func:`volume_to_freq_batch` which resamples volumes.
+
+    """
+    return _batch_to_freq(
+        data,
+        freq,
+        origin,
+        last_step_duration,
+        resampler=flow_rate_conservative_batch,
+        ragged_resampler=flow_rate_to_freq_ragged,
+    )
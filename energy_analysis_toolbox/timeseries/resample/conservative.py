@@ -5,19 +5,19 @@ from typing import Literal
 import numpy as np
 import pandas as pd
 
-from energy_analysis_toolbox.errors import (
-    EATEmptySourceError,
-    EATEmptyTargetsError,
-    EATInvalidTimestepDurationError,
+from energy_analysis_toolbox.core.basics import as_times
+from energy_analysis_toolbox.core.conservative import (
+    flow_rate_conservative as core_flow_rate_conservative,
+)
+from energy_analysis_toolbox.core.conservative import (
+    volume_conservative as core_volume_conservative,
 )
 from energy_analysis_toolbox.timeseries.extract_features.basics import (
-    index_to_timesteps,
     timestep_durations,
 )
 from energy_analysis_toolbox.timeseries.resample.index_transformation import (
     index_to_freq,
 )
-from energy_analysis_toolbox.timeseries.resample.interpolate import piecewise_affine
 
 
 # =============================================================================
@@ -134,6 +134,11 @@ def flow_rate_conservative(
 
     Notes
     -----
+    The computation is made by
+    :py:func:`energy_analysis_toolbox.core.flow_rate_conservative` on the
+    underlying arrays. Flow-rates which cannot be determined because of missing
+    values in ``flow_rates`` are discarded.
+
     The flow-rates are interpolated in such a way that the "volume is conserved".
     This means that the volume obtained when integrating the resampled flow-rate
     between two indices in the series should be the same as when computing this
@@ -155,28 +160,14 @@ def flow_rate_conservative(
       last interval is defined by ``last_target_step_duration``. [4.]
 
     """
-    if flow_rates.empty:
-        err = (
-            "Resampling an empty flow-rates series to new instants is an invalid "
-            "(undefined) operation."
-        )
-        raise EATEmptySourceError(err)
-    if target_instants.empty:
-        err = "Target instants must be provided for the series to be resampled."
-        raise EATEmptyTargetsError(err)
-    durations = timestep_durations(flow_rates, last_step=last_step_duration)  # [1.]
-    volumes = flow_rates * durations  # [2.]
-    interp_volumes = volume_conservative(
-        volumes,
-        target_instants,
+    new_values = core_flow_rate_conservative(
+        as_times(flow_rates.index),
+        flow_rates.to_numpy(dtype=np.float64),
+        as_times(target_instants),
         last_step_duration=last_step_duration,
         last_target_step_duration=last_target_step_duration,
-    )  # [3.]
-    target_durations = index_to_timesteps(target_instants, last_target_step_duration)
-    interp_flow_rates = interp_volumes / target_durations  # [4.]
-    interp_flow_rates.name = flow_rates.name
-    interp_flow_rates.index.name = flow_rates.index.name
-    return interp_flow_rates
+    )
+    return _to_series(new_values, target_instants, flow_rates)
 
 
 def volume_conservative(
@@ -309,7 +300,9 @@ def volume_conservative(
     with ``ti`` is the volume "consumed" during ``[ti, ti+1[``, assuming a
     constant flow-rate during the time-overconsumption defined in ``volumes``.
 
-    Accordingly, the function computes the resampled volumes as follows :
+    The computation is made by
+    :py:func:`energy_analysis_toolbox.core.volume_conservative` on the
+    underlying arrays, as follows :
 
     - Compute the cumulated sum of volumes for each time-step. [1.]
     - Add a virtual timestep at the end of the volume series located
@@ -322,7 +315,10 @@ def volume_conservative(
     - Also add a virtual timestep in the target series so that the cumulated
       sum at the implicit end of the target series is computed as well. [4.1]
     - Interpolate the series of cumulated volumes as a piecewise affine
-      function. Target timesteps outside the convex span of the source-indices
+      function. When the target instants (including the fictive one) are
+      regularly spaced and more numerous than the source ones, their positions
+      in the source instants are deduced from the grid step instead of being
+      searched. Target timesteps outside the convex span of the source-indices
       (including the fictive one) are assigned the corresponding border value:
 
       * 0 before the beginning of the ``volumes`` series
@@ -361,43 +357,28 @@ def volume_conservative(
         time-overconsumption in a volume-conservative way.
 
     """
-    if volumes.empty:
-        err = (
-            "Resampling an empty volumes series to new instants is an "
-            "invalid operation."
-        )
-        raise EATEmptySourceError(err)
-    if target_instants.empty:
-        err = "Target instants must be provided for the series to be resampled."
-        raise EATEmptyTargetsError(err)
-    if (
-        last_step_duration is not None
-        and last_step_duration <= 0
-        or last_target_step_duration is not None
-        and last_target_step_duration <= 0
-    ):
-        err = "Last step duration cannot be zero."
-        raise EATInvalidTimestepDurationError(err)
-    vol_index = volumes.cumsum()  # [1.]
-    # the function deals with None last_step_duration values
-    durations = timestep_durations(volumes.iloc[-2:], last_step=last_step_duration)
-    ghost_right = vol_index.index[-1] + pd.Timedelta(seconds=durations.iloc[-1])  # [2.]
-    vol_index.loc[ghost_right] = np.nan  # np.nan to not break dtype
-    vol_index = vol_index.shift(1, fill_value=0.0)  # [3.]
-    # the function deals with None last_target_step_duration
-    target_durations = index_to_timesteps(
-        target_instants[-2:],
-        last_target_step_duration,
+    new_values = core_volume_conservative(
+        as_times(volumes.index),
+        volumes.to_numpy(dtype=np.float64),
+        as_times(target_instants),
+        last_step_duration=last_step_duration,
+        last_target_step_duration=last_target_step_duration,
     )
-    target_instants = target_instants.insert(
-        target_instants.size,  # at the end
-        target_instants[-1] + pd.Timedelta(seconds=target_durations[-1]),
-    )  # [4.1]
-    interp_vol_index = piecewise_affine(vol_index, target_instants)  # [4.2]
-    interp_volumes = interp_vol_index.diff().shift(-1).dropna()  # [5.] [6.] [7.]
-    interp_volumes.name = volumes.name
-    interp_volumes.index.name = volumes.index.name
-    return interp_volumes
+    return _to_series(new_values, target_instants, volumes)
+
+
+def _to_series(
+    new_values: np.ndarray,
+    target_instants: pd.DatetimeIndex,
+    source: pd.Series,
+) -> pd.Series:
+    """Return the resampled values as a series, without the undefined ones."""
+    new_index = target_instants.rename(source.index.name)
+    is_defined = ~np.isnan(new_values)
+    if not is_defined.all():
+        new_values = new_values[is_defined]
+        new_index = new_index[is_defined]
+    return pd.Series(new_values, index=new_index, name=source.name)
 
 
 def volume_to_freq(
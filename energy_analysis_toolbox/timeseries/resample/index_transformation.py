@@ -16,6 +16,10 @@ from energy_analysis_toolbox.timeseries.extract_features.basics import (
 
 T = TypeVar("T", pd.Series, pd.DataFrame)
 
+# upper bound on the number of bins of the exact integer mode, as a multiple
+# of the number of timesteps, above which unique values are counted by sorting
+_MODE_BINS_FACTOR = 4
+
 
 def tz_convert_or_localize(
     timeseries: pd.Series | pd.DataFrame,
@@ -101,26 +105,7 @@ def index_to_freq(
     """
     if index.empty:
         return pd.DatetimeIndex([], name=index.name, tz=index.tz, freq=freq)
-    if origin is None:
-        start = index[0]
-    elif origin == "floor":
-        start = index[0].floor(freq)
-    elif origin == "ceil":
-        start = index[0].ceil(freq)
-    else:
-        start = pd.Timestamp(origin)
-        try:
-            start = start.tz_localize(index.tz)
-        except TypeError:
-            try:
-                start = start.tz_convert(index.tz)
-            except TypeError:
-                warn = (
-                    "The passed origin could not be localized or converted to the "
-                    "timezone of the original index. It is processed as if it were "
-                    "time-naive."
-                )
-                raise Warning(warn) from None
+    start = _resampling_start(index, freq, origin)
     if last_step_duration is None:
         try:
             last_step_duration = (index[-1] - index[-2]).seconds
@@ -140,9 +125,59 @@ def index_to_freq(
     )
 
 
+def _resampling_start(
+    index: pd.DatetimeIndex,
+    freq: str | pd.Timedelta | None,
+    origin: str | pd.Timestamp | None = None,
+) -> pd.Timestamp:
+    """Return the first instant of the resampling of a non-empty index.
+
+    See :py:func:`index_to_freq` for the meaning of the parameters.
+
+    """
+    return _resampling_starts(index[:1], freq, origin)[0]
+
+
+def _resampling_starts(
+    firsts: pd.DatetimeIndex,
+    freq: str | pd.Timedelta | None,
+    origin: str | pd.Timestamp | None = None,
+) -> pd.DatetimeIndex:
+    """Return the first instant of the resampling of each of several indexes.
+
+    ``firsts`` holds the first instant of each index. The floor and ceil
+    operations are performed in the wall time of its timezone, as for a
+    single index. See :py:func:`index_to_freq` for the meaning of the other
+    parameters.
+
+    """
+    if origin is None:
+        return firsts
+    if origin == "floor":
+        return firsts.floor(freq)
+    if origin == "ceil":
+        return firsts.ceil(freq)
+    start = pd.Timestamp(origin)
+    try:
+        start = start.tz_localize(firsts.tz)
+    except TypeError:
+        try:
+            start = start.tz_convert(firsts.tz)
+        except TypeError:
+            warn = (
+                "The passed origin could not be localized or converted to the "
+                "timezone of the original index. It is processed as if it were "
+                "time-naive."
+            )
+            raise Warning(warn) from None
+    return pd.DatetimeIndex([start]).repeat(firsts.size)
+
+
 def estimate_timestep(
     data: pd.Series | pd.DataFrame | pd.DatetimeIndex,
     method: str = "median",
+    max_samples: int | None = None,
+    seed: int = 0,
 ) -> float:
     """Return an estimation of the sampling period of a time series.
 
@@ -162,6 +197,13 @@ def estimate_timestep(
         the data to analyse. Must have (or be) a DatetimeIndex.
     method : {'mean', 'median', 'mode', 'kde'}, optional
         the method used to compute the expected timestep. Defaults to 'median'.
+    max_samples : int, optional
+        For the ``median`` and ``kde`` methods, the maximum number of timesteps
+        used for the estimation. If the data has more timesteps, the estimation
+        is made on ``max_samples`` timesteps drawn at random.
+        By default |None|, meaning that all the timesteps are used.
+    seed : int, optional
+        The seed of the random draw of the timesteps. By default 0.
 
     Returns
     -------
@@ -184,24 +226,35 @@ def estimate_timestep(
     if method == "mean":
         return mean_time_step(data)
     if method == "median":
-        return median_time_step(data)
+        return median_time_step(data, max_samples=max_samples, seed=seed)
     if method == "mode":
         return mode_time_step(data)
     if method == "kde":
-        return max_kde_time_step(data)
+        return max_kde_time_step(data, max_samples=max_samples, seed=seed)
     err = "method must be one of {'mean', 'median', 'mode', 'kde'}"
     raise ValueError(err)
 
 
 def median_time_step(
     data: pd.Series | pd.DataFrame | pd.DatetimeIndex,
+    max_samples: int | None = None,
+    seed: int = 0,
 ) -> float:
     """Return the median timestep of a time series.
 
+    .. note:: When ``max_samples`` timesteps are drawn, the returned value is
+        the median of the sample. Its rank in the whole set of timesteps lies
+        within ``0.5 +/- 1 / sqrt(max_samples)`` in about 95 % of the draws.
+
     Parameters
     ----------
     data : pd.Series, pd.DataFrame, pd.DatetimeIndex
         the data to analyse. Must have (or be) a DatetimeIndex.
+    max_samples : int, optional
+        The maximum number of timesteps used for the estimation.
+        By default |None|, meaning that all the timesteps are used.
+    seed : int, optional
+        The seed of the random draw of the timesteps. By default 0.
 
     Returns
     -------
@@ -215,7 +268,7 @@ def median_time_step(
 
     """
     data = data_to_datetimeindex(data)
-    timesteps = index_to_timesteps(data)
+    timesteps = sample_timesteps(data, max_samples=max_samples, seed=seed)
     return np.median(timesteps)
 
 
@@ -255,6 +308,10 @@ def mode_time_step(
         If the values vary slightly around a central value, the mode
         is not representative of the data.
 
+    .. note:: The timesteps are counted exactly as integer numbers of
+        nanoseconds. When they are multiples of a common quantum (e.g. a clock
+        resolution), they are counted in bins of this quantum.
+
     Parameters
     ----------
     data : pd.Series, pd.DataFrame, pd.DatetimeIndex
@@ -272,12 +329,54 @@ def mode_time_step(
 
     """
     data = data_to_datetimeindex(data)
-    timesteps = index_to_timesteps(data)
-    return mode(timesteps, nan_policy="omit").mode
+    min_time_indices_length = 2
+    if data.size < min_time_indices_length or data.hasnans:
+        timesteps = index_to_timesteps(data)
+        return mode(timesteps, nan_policy="omit").mode
+    times = data.as_unit("ns").asi8
+    timesteps = np.empty(times.size, dtype=np.int64)
+    timesteps[:-1] = np.diff(times)
+    timesteps[-1] = timesteps[-2]
+    return integer_mode(timesteps) / 1e9
+
+
+def integer_mode(values: np.ndarray) -> int:
+    """Return the most frequent value of an array of integers.
+
+    The values are shifted by their minimum and divided by their greatest common
+    divisor, so that they can be counted with :func:`numpy.bincount` when the
+    resulting number of bins is not much larger than the number of values.
+    Otherwise, they are counted using :func:`numpy.unique`.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        A non-empty 1D array of integers.
+
+    Returns
+    -------
+    int
+        The most frequent value. If there are several values with the same
+        frequency, the smallest one is returned.
+
+    """
+    low = values.min()
+    shifts = values - low
+    quantum = np.gcd.reduce(shifts)
+    if quantum == 0:
+        return low
+    n_bins = shifts.max() // quantum + 1
+    if n_bins <= _MODE_BINS_FACTOR * values.size:
+        counts = np.bincount(shifts // quantum)
+        return low + counts.argmax() * quantum
+    uniques, counts = np.unique(values, return_counts=True)
+    return uniques[counts.argmax()]
 
 
 def max_kde_time_step(
     data: pd.Series | pd.DataFrame | pd.DatetimeIndex,
+    max_samples: int | None = None,
+    seed: int = 0,
 ) -> float:
     """Return the maximum probable timestep of a time series.
 
@@ -288,10 +387,19 @@ def max_kde_time_step(
     .. warning:: The KDE cannot be estimated if the data is regularly
         spaced. In this case, use another method.
 
+    .. note:: Both the fit and the evaluation of the KDE scale linearly with
+        the number of timesteps. Use ``max_samples`` to bound their cost on
+        long time series.
+
     Parameters
     ----------
     data : pd.Series, pd.DataFrame, pd.DatetimeIndex
         the data to analyse. Must have (or be) a DatetimeIndex.
+    max_samples : int, optional
+        The maximum number of timesteps used to fit the KDE.
+        By default |None|, meaning that all the timesteps are used.
+    seed : int, optional
+        The seed of the random draw of the timesteps. By default 0.
 
     Returns
     -------
@@ -306,7 +414,7 @@ def max_kde_time_step(
 
     """
     data = data_to_datetimeindex(data)
-    timesteps = index_to_timesteps(data)
+    timesteps = sample_timesteps(data, max_samples=max_samples, seed=seed)
     kde = gaussian_kde(timesteps)
     no_samples = 50
     samples = np.linspace(min(timesteps), max(timesteps), no_samples)
@@ -315,6 +423,43 @@ def max_kde_time_step(
     return samples[maxima_index]
 
 
+def sample_timesteps(
+    data: pd.DatetimeIndex,
+    max_samples: int | None = None,
+    seed: int = 0,
+) -> np.ndarray:
+    """Return the timesteps of an index, or a random sample of them.
+
+    Parameters
+    ----------
+    data : pd.DatetimeIndex
+        A sequence of time-steps in chronological order.
+    max_samples : int, optional
+        The maximum number of returned timesteps. If the index has more
+        timesteps, ``max_samples`` of them are drawn uniformly with replacement,
+        without computing the others. By default |None|, meaning that all the
+        timesteps are returned.
+    seed : int, optional
+        The seed of the random draw. By default 0.
+
+    Returns
+    -------
+    np.ndarray
+        The timesteps in (s). When all of them are returned, they are the ones
+        of :py:func:`.index_to_timesteps`.
+
+    """
+    if max_samples is not None and max_samples < 1:
+        err = f"max_samples must be a positive integer. Received {max_samples}."
+        raise ValueError(err)
+    if max_samples is None or data.size <= max_samples or data.hasnans:
+        return index_to_timesteps(data)
+    rng = np.random.default_rng(seed=seed)
+    positions = rng.integers(0, data.size - 1, size=max_samples)
+    times = data.as_unit("ns").asi8
+    return (times[positions + 1] - times[positions]) / 1e9
+
+
 def data_to_datetimeindex(
     data: pd.Series | pd.DataFrame | pd.DatetimeIndex,
 ) -> pd.DatetimeIndex:
@@ -384,23 +529,31 @@ def fill_missing_entries(
         - :func:`estimate_timestep`
 
     """
-    durations = timestep_durations(data)
-    intervals_to_fill = durations[durations >= sampling_period * security_factor]
-    if intervals_to_fill.empty:
+    durations = timestep_durations(data).to_numpy()
+    n_missing = np.floor_divide(durations, sampling_period).astype(np.int64) - 1
+    n_missing[~(durations >= sampling_period * security_factor)] = 0
+    n_missing = np.clip(n_missing, 0, None)
+    if not n_missing.any():
         return data
-    new_indexes = []
-    for index, duration in intervals_to_fill.items():
-        number_missing_entries = int(duration // sampling_period)
-        tmp_indexes = [
-            index + k * pd.Timedelta(seconds=sampling_period)
-            for k in range(1, number_missing_entries)
-        ]
-        new_indexes += tmp_indexes
-    missing_index = pd.DatetimeIndex(new_indexes)
-    return data.reindex(
-        data.index.append(missing_index).sort_values(),
-        fill_value=fill_value,
-    )
+    # all the new entries at once, as int64 ns after the start of their interval
+    step = pd.Timedelta(seconds=sampling_period).value
+    times = data.index.as_unit("ns").asi8
+    n_before = np.cumsum(n_missing) - n_missing
+    ranks = np.arange(n_missing.sum()) - np.repeat(n_before, n_missing) + 1
+    missing = np.repeat(times, n_missing) + ranks * step
+    # merge the sorted new entries after their interval start
+    positions = np.arange(times.size) + n_before
+    merged = np.empty(times.size + missing.size, dtype=np.int64)
+    is_new = np.ones(merged.size, dtype=bool)
+    is_new[positions] = False
+    merged[positions] = times
+    merged[is_new] = missing
+    new_index = pd.DatetimeIndex(merged.view("M8[ns]"))
+    if data.index.tz is not None:
+        new_index = new_index.tz_localize("UTC").tz_convert(data.index.tz)
+    if not data.index.is_monotonic_increasing:
+        new_index = new_index.sort_values()
+    return data.reindex(new_index, fill_value=fill_value)
 
 
 def fill_data_holes(
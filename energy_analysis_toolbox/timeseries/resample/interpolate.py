@@ -6,6 +6,13 @@ coarse sampled one:
     - :py:func:`piecewise_affine`
     - :py:func:`piecewise_constant`
 
+Both functions are based on array kernels of :py:mod:`energy_analysis_toolbox.core`
+which work on epoch-ns int64 times and may be used directly on 2D arrays of
+values, in order to interpolate many columns sharing the same index at once:
+
+    - :py:func:`~energy_analysis_toolbox.core.piecewise_affine_kernel`
+    - :py:func:`~energy_analysis_toolbox.core.piecewise_constant_kernel`
+
 Resampling to coarser resolution may be done as well, but the relevance may
 be questioned VS a well-chosen aggregation.
 
@@ -18,6 +25,13 @@ be questioned VS a well-chosen aggregation.
 import numpy as np
 import pandas as pd
 
+from energy_analysis_toolbox.core.basics import as_times
+from energy_analysis_toolbox.core.interpolate import (
+    grid_positions,
+    piecewise_affine_kernel,
+    piecewise_constant_kernel,
+)
+
 
 def piecewise_affine(
     timeseries: pd.Series | float,
@@ -49,17 +63,18 @@ def piecewise_affine(
 
     .. seealso::
 
-        :py:func:`np.interp` on which the interpolation is based.
+        :py:func:`~energy_analysis_toolbox.core.piecewise_affine_kernel` on which
+        the interpolation is based.
 
 
     """
-    try:
-        ref_time = target_instants[0]
-    except IndexError:
+    if target_instants.empty:
         return pd.Series([], dtype=timeseries.dtype, index=target_instants.copy())
-    target_offsets = (target_instants - ref_time).total_seconds()
-    sample_dts = (timeseries.index - ref_time).total_seconds()
-    new_values = np.interp(target_offsets, sample_dts, timeseries.values)
+    new_values = piecewise_affine_kernel(
+        as_times(target_instants),
+        as_times(timeseries.index),
+        timeseries.to_numpy(dtype=np.float64),
+    )
     new_series = pd.Series(
         new_values,
         index=target_instants.copy(),
@@ -96,22 +111,18 @@ def piecewise_constant(
 
     .. seealso::
 
-        :py:func:`np.digitize` on which the function is based.
+        :py:func:`~energy_analysis_toolbox.core.piecewise_constant_kernel` on which
+        the function is based.
 
     """
-    try:
-        ref_time = target_instants[0]
-    except IndexError:
+    if target_instants.empty:
         return pd.Series([], dtype=timeseries.dtype, index=target_instants.copy())
-    target_offsets = (target_instants - ref_time).total_seconds()
-    sample_dts = (timeseries.index - ref_time).total_seconds()
-    ix_select = np.digitize(target_offsets, sample_dts, right=False) - 1
-    if left_pad is None:
-        ix_select[ix_select < 0] = 0  # index 0
-        new_values = timeseries.iloc[ix_select].to_numpy()
-    else:
-        new_values = timeseries.iloc[ix_select].to_numpy()
-        new_values[ix_select < 0] = left_pad
+    new_values = piecewise_constant_kernel(
+        as_times(target_instants),
+        as_times(timeseries.index),
+        timeseries.to_numpy(),
+        left_pad=left_pad,
+    )
     new_series = pd.Series(new_values, index=target_instants, name=timeseries.name)
     new_series.index.name = timeseries.index.name
     return new_series
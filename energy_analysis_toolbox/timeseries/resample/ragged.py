@@ -0,0 +1,470 @@
+"""Resample many timeseries with their own indexes in a conservative way.
+
+This module deals with collections of timeseries which do not share the same
+index, e.g. meters reporting on irregular and meter-specific timestamps. Such
+collections are represented as "ragged arrays" by :py:class:`RaggedTimeseries`,
+using a layout similar to the one of the CSR sparse matrices:
+
+- ``values``: the concatenated values of all the timeseries (float64),
+- ``timestamps``: the concatenated timestamps as int64 nanoseconds since epoch,
+- ``offsets``: an int64 array such that the values of the i-th timeseries are
+  ``values[offsets[i]:offsets[i + 1]]``.
+
+The functions :py:func:`volume_to_freq_ragged` and :py:func:`flow_rate_to_freq_ragged`
+resample all the timeseries of the collection at once, without creating any
+per-timeseries pandas object, and return a collection in the same layout, so
+that the result can be chained into further processing stages.
+
+"""
+
+from collections.abc import Hashable, Mapping
+from typing import Literal
+
+import numpy as np
+import pandas as pd
+
+from energy_analysis_toolbox import keywords as eatk
+from energy_analysis_toolbox.core.interpolate import piecewise_affine_kernel
+from energy_analysis_toolbox.errors import (
+    EATInvalidTimeseriesError,
+    EATInvalidTimestepDurationError,
+    EATUndefinedTimestepError,
+)
+from energy_analysis_toolbox.timeseries.resample.index_transformation import (
+    _resampling_starts,
+)
+
+
+class RaggedTimeseries:
+    """A collection of timeseries stored as concatenated arrays with offsets."""
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        timestamps: np.ndarray,
+        offsets: np.ndarray,
+        meter_ids: pd.Index | None = None,
+        tz: str | None = None,
+    ) -> None:
+        """Initialize a RaggedTimeseries instance.
+
+        Parameters
+        ----------
+        values : np.ndarray
+            1D array of the concatenated values of the timeseries.
+        timestamps : np.ndarray
+            1D array of the concatenated timestamps of the timeseries, as int64
+            nanoseconds since epoch (UTC). The timestamps of each timeseries must
+            be sorted in increasing order.
+        offsets : np.ndarray
+            1D array with one more element than the number of timeseries, starting
+            with 0 and ending with ``values.size``. The i-th timeseries is located
+            at ``[offsets[i], offsets[i + 1][`` in ``values`` and ``timestamps``.
+        meter_ids : pd.Index, optional
+            Labels of the timeseries. Default is |None| in which case the positions
+            of the timeseries are used.
+        tz : str or tzinfo, optional
+            The timezone used when timestamps are converted back to pandas objects.
+            Default is |None| meaning that timestamps are time-naive.
+
+        Raises
+        ------
+        EATInvalidTimeseriesError :
+            If the shapes of the arrays are inconsistent.
+
+        """
+        self.values = np.asarray(values, dtype=float)
+        self.timestamps = np.asarray(timestamps, dtype=np.int64)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        if meter_ids is None:
+            meter_ids = pd.RangeIndex(self.offsets.size - 1)
+        self.meter_ids = pd.Index(meter_ids)
+        self.tz = tz
+        if (
+            self.values.shape != self.timestamps.shape
+            or self.offsets[0] != 0
+            or self.offsets[-1] != self.values.size
+            or self.meter_ids.size != self.offsets.size - 1
+        ):
+            err = "Inconsistent values, timestamps, offsets and meter ids."
+            raise EATInvalidTimeseriesError(err)
+
+    def __len__(self) -> int:
+        """Return the number of timeseries in the collection."""
+        return self.meter_ids.size
+
+    @property
+    def lengths(self) -> np.ndarray:
+        """The number of samples in each timeseries."""
+        return np.diff(self.offsets)
+
+    @property
+    def meter_codes(self) -> np.ndarray:
+        """The position of the timeseries to which each sample belongs."""
+        return np.repeat(np.arange(len(self)), self.lengths)
+
+    @classmethod
+    def from_series(
+        cls,
+        series: Mapping[Hashable, pd.Series],
+    ) -> "RaggedTimeseries":
+        """Return a collection from a mapping of timeseries.
+
+        Parameters
+        ----------
+        series : Mapping
+            A mapping from meter ids to timeseries with DatetimeIndex. All the
+            series must share the same timezone.
+
+        Returns
+        -------
+        RaggedTimeseries
+
+        """
+        lengths = [s.size for s in series.values()]
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        tz = next((s.index.tz for s in series.values()), None)
+        return cls(
+            np.concatenate([s.to_numpy(dtype=float) for s in series.values()]),
+            np.concatenate([s.index.as_unit("ns").asi8 for s in series.values()]),
+            offsets,
+            meter_ids=pd.Index(list(series.keys())),
+            tz=tz,
+        )
+
+    @classmethod
+    def from_long(
+        cls,
+        table: pd.DataFrame,
+        meter_f: str = eatk.meter_id_f,
+        time_f: str = eatk.time_f,
+        value_f: str = eatk.value_f,
+    ) -> "RaggedTimeseries":
+        """Return a collection from a long-format table of timeseries.
+
+        Parameters
+        ----------
+        table : pd.DataFrame
+            A table with one row per (meter, timestamp) couple.
+        meter_f : str, default |eatk.meter_id_f|
+            The name of the column identifying the timeseries.
+        time_f : str, default |eatk.time_f|
+            The name of the column containing the timestamps.
+        value_f : str, default |eatk.value_f|
+            The name of the column containing the values.
+
+        Returns
+        -------
+        RaggedTimeseries :
+            The collection, with timeseries sorted by meter id.
+
+        Raises
+        ------
+        EATInvalidTimeseriesError :
+            If a (meter, timestamp) couple is duplicated.
+
+        """
+        codes, meter_ids = pd.factorize(table[meter_f], sort=True)
+        times = pd.DatetimeIndex(table[time_f])
+        timestamps = times.as_unit("ns").asi8
+        order = np.lexsort((timestamps, codes))
+        codes, timestamps = codes[order], timestamps[order]
+        same_couple = (np.diff(codes) == 0) & (np.diff(timestamps) == 0)
+        if same_couple.any():
+            err = (
+                "Each (meter, timestamp) couple must appear at most once in the table."
+            )
+            raise EATInvalidTimeseriesError(err)
+        offsets = np.zeros(meter_ids.size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(codes, minlength=meter_ids.size), out=offsets[1:])
+        return cls(
+            table[value_f].to_numpy(dtype=float)[order],
+            timestamps,
+            offsets,
+            meter_ids=pd.Index(meter_ids, name=meter_f),
+            tz=times.tz,
+        )
+
+    def to_long(
+        self,
+        meter_f: str = eatk.meter_id_f,
+        time_f: str = eatk.time_f,
+        value_f: str = eatk.value_f,
+    ) -> pd.DataFrame:
+        """Return the collection as a long-format table.
+
+        Parameters
+        ----------
+        meter_f : str, default |eatk.meter_id_f|
+            The name of the column identifying the timeseries in the result.
+        time_f : str, default |eatk.time_f|
+            The name of the column containing the timestamps in the result.
+        value_f : str, default |eatk.value_f|
+            The name of the column containing the values in the result.
+
+        Returns
+        -------
+        pd.DataFrame :
+            A table with columns ``meter_f``, ``time_f`` and ``value_f``.
+
+        """
+        times = pd.DatetimeIndex(self.timestamps.view("datetime64[ns]"))
+        if self.tz is not None:
+            times = times.tz_localize("UTC").tz_convert(self.tz)
+        return pd.DataFrame(
+            {
+                meter_f: self.meter_ids.take(self.meter_codes),
+                time_f: times,
+                value_f: self.values,
+            },
+        )
+
+    def get(
+        self,
+        meter_id: Hashable,
+    ) -> pd.Series:
+        """Return one of the timeseries in the collection as a pandas Series.
+
+        Parameters
+        ----------
+        meter_id : Hashable
+            The id of the timeseries.
+
+        Returns
+        -------
+        pd.Series
+
+        """
+        position = self.meter_ids.get_loc(meter_id)
+        chunk = slice(self.offsets[position], self.offsets[position + 1])
+        index = pd.DatetimeIndex(self.timestamps[chunk].view("datetime64[ns]"))
+        if self.tz is not None:
+            index = index.tz_localize("UTC").tz_convert(self.tz)
+        return pd.Series(self.values[chunk], index=index, name=meter_id)
+
+
+# =============================================================================
+# Ragged resampling with volume conservation
+# =============================================================================
+def _origins(
+    first_timestamps: np.ndarray,
+    freq: str | pd.Timedelta,
+    origin: Literal["floor", "ceil"] | pd.Timestamp | None,
+    tz: str | None = None,
+) -> np.ndarray:
+    """Return the start of the target grid of each timeseries in (ns)."""
+    firsts = pd.DatetimeIndex(first_timestamps.view("datetime64[ns]"))
+    if tz is not None:
+        firsts = firsts.tz_localize("UTC").tz_convert(tz)
+    return _resampling_starts(firsts, freq, origin).as_unit("ns").asi8
+
+
+def _source_durations(
+    ragged: RaggedTimeseries,
+    last_step_duration: float | None,
+) -> np.ndarray:
+    """Return the duration in (ns) of each sample, including the last ones."""
+    lengths = ragged.lengths
+    if last_step_duration is not None and last_step_duration <= 0:
+        err = "Last step duration cannot be zero."
+        raise EATInvalidTimestepDurationError(err)
+    if last_step_duration is None and (lengths == 1).any():
+        err = (
+            "The timeseries should contain at least 2 elements to infer a duration"
+            "when last_step value is None."
+        )
+        raise EATUndefinedTimestepError(err)
+    durations = np.empty_like(ragged.timestamps)
+    durations[:-1] = np.diff(ragged.timestamps)
+    last = ragged.offsets[1:][lengths > 0] - 1
+    if last_step_duration is None:
+        durations[last] = durations[last - 1]
+    else:
+        durations[last] = round(last_step_duration * 1e9)
+    return durations
+
+
+def volume_to_freq_ragged(
+    ragged: RaggedTimeseries,
+    freq: str | pd.Timedelta,
+    origin: Literal["floor", "ceil"] | pd.Timestamp | None = None,
+    last_step_duration: float | None = None,
+) -> RaggedTimeseries:
+    """Return a collection of volumes resampled to freq such that volume is conserved.
+
+    Each timeseries is resampled on its own grid, as :py:func:`.volume_to_freq`
+    would do, but all the timeseries are processed at once.
+
+    Parameters
+    ----------
+    ragged : RaggedTimeseries
+        A collection of timeseries of volume-alike quantities.
+    freq : str | pd.Timedelta
+        the freq to which the timeseries are resampled. Must be a fixed
+        frequency.
+    origin : {None, 'floor, 'ceil', pd.Timestamp}, optional
+        What origin should be used for the target resampling ranges.
+        See :py:func:`.index_to_freq` for details.
+    last_step_duration : float, optional
+        Duration of the last time-step in each timeseries in (s).
+        The default is |None| in which case the duration of the former-last
+        time-step of each timeseries is used.
+
+    Returns
+    -------
+    RaggedTimeseries
+        The resampled collection, with the same meter ids. Empty timeseries
+        remain empty. The target instants for which the volume is undefined due
+        to missing values receive ``nan`` values (they are dropped by
+        :py:func:`.volume_to_freq`), so that each timeseries remains sampled on
+        a regular grid.
+
+    Raises
+    ------
+    EATUndefinedTimestepError :
+        If a timeseries contains a single element while ``last_step_duration``
+        is |None|.
+    EATInvalidTimestepDurationError :
+        In case ``last_step_duration <= 0``.
+
+    Notes
+    -----
+    The algorithm is the same as the one of :py:func:`.volume_conservative`,
+    applied on all the timeseries at once:
+
+    - Each timeseries is extended with a virtual sample one last step after its
+      last sample, and the cumulated volumes are computed for each of them. [1.]
+    - The target grid of each timeseries is deduced from its first and last
+      instants, and extended with a virtual instant one ``freq`` after its last
+      instant. [2.]
+    - The position of each target instant in the sources of its timeseries is
+      obtained by counting, for each target, the number of source samples before
+      it. As the target grids are regular, this is done with integer arithmetic
+      and a single cumulated sum over all the timeseries. [3.]
+    - The cumulated volumes are interpolated at the target instants by
+      :py:func:`energy_analysis_toolbox.core.piecewise_affine_kernel`, and their
+      differences within each timeseries are returned. [4.]
+
+
+    .. seealso::
+
+        :py:func:`flow_rate_to_freq_ragged` which resamples flow-rates.
+
+    """
+    freq_ns = pd.Timedelta(freq).value
+    n_meters = len(ragged)
+    lengths = ragged.lengths
+    not_empty = lengths > 0
+    # [1.] sources with one ghost sample per timeseries
+    durations = _source_durations(ragged, last_step_duration)
+    src_offsets = ragged.offsets + np.arange(n_meters + 1)
+    src_codes = np.repeat(np.arange(n_meters), lengths + 1)
+    is_ghost = np.zeros(src_codes.size, dtype=bool)
+    is_ghost[src_offsets[1:] - 1] = True
+    src_times = np.zeros(src_codes.size, dtype=np.int64)
+    src_times[~is_ghost] = ragged.timestamps
+    last = src_offsets[1:][not_empty] - 2
+    src_times[last + 1] = src_times[last] + durations[ragged.offsets[1:][not_empty] - 1]
+    # the volume of a sample has flowed at the next one, hence the shift by one
+    cumulated = np.zeros(src_codes.size)
+    cumulated[np.arange(ragged.values.size) + ragged.meter_codes + 1] = (
+        pd.Series(ragged.values).groupby(ragged.meter_codes).cumsum().to_numpy()
+    )
+    # [2.] target grids with one ghost target per timeseries
+    starts = np.zeros(n_meters, dtype=np.int64)
+    starts[not_empty] = _origins(
+        ragged.timestamps[ragged.offsets[:-1][not_empty]],
+        freq,
+        origin,
+        ragged.tz,
+    )
+    ends = src_times[src_offsets[1:] - 1]
+    n_targets = np.where(not_empty, -((starts - ends) // freq_ns), 0).clip(min=0)
+    tgt_offsets = np.zeros(n_meters + 1, dtype=np.int64)
+    np.cumsum(n_targets + not_empty, out=tgt_offsets[1:])
+    tgt_codes = np.repeat(np.arange(n_meters), n_targets + not_empty)
+    tgt_ranks = np.arange(tgt_codes.size) - tgt_offsets[tgt_codes]
+    tgt_times = starts[tgt_codes] + tgt_ranks * freq_ns
+    # [3.] number of sources before or at each target
+    slots = tgt_offsets + np.arange(n_meters + 1)  # one overflow slot per series
+    src_ranks = -((starts[src_codes] - src_times) // freq_ns)
+    src_slots = slots[src_codes] + np.clip(
+        src_ranks,
+        0,
+        (n_targets + not_empty)[src_codes],
+    )
+    counts = np.cumsum(np.bincount(src_slots, minlength=slots[-1]))
+    n_before = counts[slots[tgt_codes] + tgt_ranks] - src_offsets[tgt_codes]
+    # [4.] interpolation of the cumulated volumes, the positions being kept
+    # within the sources of each timeseries
+    lower = src_offsets[tgt_codes] + np.clip(n_before - 1, 0, lengths[tgt_codes] - 1)
+    interp_cumulated = piecewise_affine_kernel(
+        tgt_times,
+        src_times,
+        cumulated,
+        positions=lower,
+    )
+    is_target = np.ones(tgt_codes.size, dtype=bool)
+    is_target[tgt_offsets[1:][not_empty] - 1] = False
+    volumes = np.diff(interp_cumulated, append=np.nan)[is_target]
+    offsets = np.zeros(n_meters + 1, dtype=np.int64)
+    np.cumsum(n_targets, out=offsets[1:])
+    return RaggedTimeseries(
+        volumes,
+        tgt_times[is_target],
+        offsets,
+        meter_ids=ragged.meter_ids,
+        tz=ragged.tz,
+    )
+
+
+def flow_rate_to_freq_ragged(
+    ragged: RaggedTimeseries,
+    freq: str | pd.Timedelta,
+    origin: Literal["floor", "ceil"] | pd.Timestamp | None = None,
+    last_step_duration: float | None = None,
+) -> RaggedTimeseries:
+    """Return a collection of flow-rates resampled to freq with volume conservation.
+
+    Each timeseries is resampled on its own grid, as :py:func:`.flow_rate_to_freq`
+    would do, but all the timeseries are processed at once.
+
+    Parameters
+    ----------
+    ragged : RaggedTimeseries
+        A collection of timeseries of flow-rate-alike quantities.
+    freq : str | pd.Timedelta
+        the freq to which the timeseries are resampled. Must be a fixed
+        frequency.
+    origin : {None, 'floor, 'ceil', pd.Timestamp}, optional
+        What origin should be used for the target resampling ranges.
+        See :py:func:`volume_to_freq_ragged` for details.
+    last_step_duration : float, optional
+        Duration of the last time-step in each timeseries in (s).
+        The default is |None| in which case the duration of the former-last
+        time-step of each timeseries is used.
+
+    Returns
+    -------
+    RaggedTimeseries
+        The resampled collection, with the same meter ids.
+
+
+    .. seealso::
+
+        :py:func:`volume_to_freq_ragged` which is used to resample the volumes
+        deduced from the flow-rates.
+
+    """
+    durations = _source_durations(ragged, last_step_duration) / 1e9
+    volumes = RaggedTimeseries(
+        ragged.values * durations,
+        ragged.timestamps,
+        ragged.offsets,
+        meter_ids=ragged.meter_ids,
+        tz=ragged.tz,
+    )
+    resampled = volume_to_freq_ragged(volumes, freq, origin, last_step_duration)
+    resampled.values /= pd.Timedelta(freq).total_seconds()
+    return resampled
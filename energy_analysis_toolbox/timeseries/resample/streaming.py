@@ -0,0 +1,643 @@
+"""Resample timeseries chunk by chunk in a conservative way.
+
+The functions of :py:mod:`.conservative` need the whole timeseries in memory:
+the volumes are cumulated from the first sample and the end of the resampling
+range depends on the last samples. This module provides
+:py:class:`ConservativeResampler`, a stateful object which is fed with
+successive chunks of a timeseries (e.g. read from the row-groups of a file)
+and returns the resampled bins as soon as they are fully determined.
+
+Only the state required to continue the computation is kept between two chunks
+(the last samples, the cumulated volume and the value of the pending bin), so
+that arbitrarily long timeseries can be resampled with a bounded memory.
+The concatenation of the returned pieces is identical to the result of
+:py:func:`.volume_to_freq` (or :py:func:`.flow_rate_to_freq`) applied to the
+whole timeseries.
+
+Example
+-------
+>>> resampler = ConservativeResampler("15min", origin="floor")
+>>> pieces = [resampler.update(chunk) for chunk in chunks]
+>>> pieces.append(resampler.close())
+>>> resampled = pd.concat(pieces)
+
+The same object can be used to maintain a resampled timeseries while new
+samples are appended to the source one: :py:func:`append_to_freq` only
+recomputes the trailing bins which depend on the new samples.
+
+>>> resampler = ConservativeResampler("10min")
+>>> _, resampled = append_to_freq(None, history, resampler)
+>>> position, tail = append_to_freq(resampled, new_samples, resampler)
+
+"""
+
+import copy
+from typing import TYPE_CHECKING, Literal
+
+import numpy as np
+import pandas as pd
+
+from energy_analysis_toolbox.core.basics import as_times, timesteps
+from energy_analysis_toolbox.core.interpolate import piecewise_affine_kernel
+from energy_analysis_toolbox.errors import (
+    EATEmptySourceError,
+    EATEmptyTargetsError,
+    EATInvalidTimeseriesError,
+    EATInvalidTimestepDurationError,
+    EATResamplingError,
+)
+from energy_analysis_toolbox.timeseries.resample.index_transformation import (
+    _resampling_start,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+
+class ConservativeResampler:
+    """Resample a volume or flow-rate timeseries to a frequency, one chunk at a time.
+
+    The bin ``[t, t + freq[`` is returned by :py:meth:`update` as soon as the
+    samples received cover it entirely. The remaining bins, which depend on
+    the duration of the last time-step, are returned by :py:meth:`close`, or
+    can be previewed with :py:meth:`preview` while more samples are expected.
+
+    The state of the resampler is made of a few scalar values, so that instances
+    can be copied or pickled to be stored between two ingestions of new samples.
+
+    .. seealso::
+
+        :py:func:`.volume_to_freq` and :py:func:`.flow_rate_to_freq` which
+        resample a whole timeseries at once, with the same conventions.
+
+    """
+
+    def __init__(
+        self,
+        freq: str | pd.Timedelta,
+        origin: Literal["floor", "ceil"] | pd.Timestamp | None = None,
+        last_step_duration: float | None = None,
+        method: Literal[
+            "volume_conservative",
+            "flow_rate_conservative",
+        ] = "volume_conservative",
+    ) -> None:
+        """Initialize a ConservativeResampler instance.
+
+        Parameters
+        ----------
+        freq : str | pd.Timedelta
+            the freq to which the series is resampled. Must be a valid
+            pandas frequency.
+        origin : {None, 'floor, 'ceil', pd.Timestamp}, optional
+            What origin should be used for the target resampling range.
+            It is computed from the first chunk. See :py:func:`.index_to_freq`
+            for details.
+        last_step_duration : float, optional
+            Duration of the last time-step of the whole timeseries in (s).
+            The default is |None| in which case the duration of the former-last
+            time-step is used.
+        method : {'volume_conservative', 'flow_rate_conservative'}, optional
+            Whether the timeseries contains volumes, resampled as with
+            :py:func:`.volume_to_freq`, or flow-rates, resampled as with
+            :py:func:`.flow_rate_to_freq`. The default is volumes.
+
+        Raises
+        ------
+        EATInvalidTimestepDurationError :
+            In case ``last_step_duration <= 0``.
+        ValueError :
+            In case ``method`` is not one of the accepted values.
+
+        """
+        if last_step_duration is not None and last_step_duration <= 0:
+            err = "Last step duration cannot be zero."
+            raise EATInvalidTimestepDurationError(err)
+        if method not in ("volume_conservative", "flow_rate_conservative"):
+            err = (
+                "method must be one of {'volume_conservative', "
+                f"'flow_rate_conservative'}}. Received {method}."
+            )
+            raise ValueError(err)
+        self.freq = freq
+        self.origin = origin
+        self.last_step_duration = last_step_duration
+        self.method = method
+        self._closed = False
+        self._name = None
+        self._index_name = None
+        # grid of the targets
+        self._start = None
+        self._next_target = None  # first target with an unknown cumulated volume
+        self._target = None  # last target with a known cumulated volume
+        self._target_cumulated = np.nan  # cumulated volume at this target
+        # last received source samples
+        self._previous_time = None
+        self._last_time = None
+        self._cumulated_before = 0.0  # cumulated volume until the last sample
+        self._cumulated_after = np.nan  # same, including the last sample
+        self._running_sum = 0.0  # sum of the volumes, missing values skipped
+        # last received flow-rate, which volume is known with the next sample
+        self._flow_previous_time = None
+        self._flow_time = None
+        self._flow_rate = np.nan
+
+    @property
+    def started(self) -> bool:
+        """Whether at least one sample has been received."""
+        return self._last_time is not None or self._flow_time is not None
+
+    @property
+    def pending_start(self) -> pd.Timestamp | None:
+        """Start of the first bin which has not been returned by :py:meth:`update`.
+
+        |None| if no sample has been received yet.
+        """
+        if self._target is not None:
+            return self._target
+        return self._start
+
+    @property
+    def closed(self) -> bool:
+        """Whether :py:meth:`close` has been called."""
+        return self._closed
+
+    def update(self, chunk: "pd.Series[float]") -> "pd.Series[float]":
+        """Process the next chunk of the timeseries.
+
+        Parameters
+        ----------
+        chunk : pd.Series
+            The next samples of the volume timeseries, with a DatetimeIndex.
+            All the samples must be located after the ones of the former chunks.
+
+        Returns
+        -------
+        pd.Series
+            The resampled volumes of the bins which are fully determined by the
+            samples received so far and were not returned yet. May be empty.
+
+        Raises
+        ------
+        EATResamplingError :
+            In case the resampler is already closed.
+        EATInvalidTimeseriesError :
+            In case the chunk is not sorted or overlaps the former ones.
+
+        """
+        self._check_open()
+        if chunk.empty:
+            return self._empty_result(chunk)
+        times = chunk.index
+        if not times.is_monotonic_increasing or not times.is_unique:
+            err = "The chunks must be indexed with increasing unique instants."
+            raise EATInvalidTimeseriesError(err)
+        last_time = self._flow_time if self._is_flow else self._last_time
+        if last_time is not None and times[0] <= last_time:
+            err = (
+                f"The chunk starts at {times[0]} which is not after the last "
+                f"sample already received at {last_time}."
+            )
+            raise EATInvalidTimeseriesError(err)
+        if self._name is None:
+            self._name = chunk.name
+            self._index_name = times.name
+        values = chunk.to_numpy(dtype=np.float64, copy=True)
+        if self._is_flow:
+            times, values = self._flows_to_volumes(times, values)
+            if times.empty:
+                return self._empty_result(chunk)
+        return self._update_volumes(times, values)
+
+    def preview(self) -> "pd.Series[float]":
+        """Return the bins which :py:meth:`close` would return at this point.
+
+        The state of the resampler is not modified, so that more samples can
+        be processed afterwards.
+
+        Returns
+        -------
+        pd.Series
+            The provisional resampled values of the last bins.
+
+
+        .. seealso::
+
+            :py:meth:`close` for the raised errors.
+
+        """
+        return copy.copy(self).close()
+
+    def append(self, chunk: "pd.Series[float]") -> "pd.Series[float]":
+        """Process the next chunk and return all the bins from :py:attr:`pending_start`.
+
+        Parameters
+        ----------
+        chunk : pd.Series
+            The next samples of the timeseries. See :py:meth:`update`.
+
+        Returns
+        -------
+        pd.Series
+            The bins which are fully determined by the received samples and were
+            not returned yet, followed by the provisional last bins as returned
+            by :py:meth:`preview`. These bins replace the ones starting at
+            :py:attr:`pending_start` (before the call) in the former result.
+
+        Raises
+        ------
+        EATResamplingError :
+            In case the resampler is already closed.
+        EATInvalidTimeseriesError :
+            In case the chunk is not sorted or overlaps the former ones.
+        EATUndefinedTimestepError :
+            In case only one sample has been received and ``last_step_duration``
+            is |None|.
+
+        In case of error, the resampler is left in its state before the call,
+        so that the chunk can be processed again, e.g. with more samples.
+
+        """
+        state = copy.copy(self)
+        try:
+            resampled = self.update(chunk)
+            preview = self.preview()
+        except Exception:
+            vars(self).update(vars(state))
+            raise
+        return pd.concat([resampled, preview])
+
+    @property
+    def _is_flow(self) -> bool:
+        """Whether flow-rates are resampled."""
+        return self.method == "flow_rate_conservative"
+
+    def _flows_to_volumes(
+        self,
+        times: pd.DatetimeIndex,
+        flow_rates: np.ndarray,
+    ) -> tuple[pd.DatetimeIndex, np.ndarray]:
+        """Return the volumes of the flow-rate samples which durations are known.
+
+        The volume of the last sample remains unknown until the next sample is
+        received, so that it is kept as pending.
+        """
+        if self._flow_time is not None:
+            times = times.insert(0, self._flow_time)
+            flow_rates = np.r_[self._flow_rate, flow_rates]
+        if times.size > 1:
+            self._flow_previous_time = times[-2]
+        self._flow_time = times[-1]
+        self._flow_rate = flow_rates[-1]
+        # the same durations as in flow_rate_conservative, the one of the last
+        # sample being unknown yet
+        durations = timesteps(as_times(times), last_step=0.0)[:-1]
+        return times[:-1], flow_rates[:-1] * durations
+
+    def _update_volumes(
+        self,
+        times: pd.DatetimeIndex,
+        values: np.ndarray,
+    ) -> "pd.Series[float]":
+        """Process the next volume samples and return the new bins."""
+        missing = np.isnan(values)
+        values[missing] = 0.0
+        cumulated = np.cumsum(np.r_[self._running_sum, values])[1:]
+        self._running_sum = cumulated[-1]
+        cumulated[missing] = np.nan
+        if self._last_time is not None:
+            source_times = times.insert(0, self._last_time)
+            source_values = np.r_[
+                self._cumulated_before,
+                self._cumulated_after,
+                cumulated[:-1],
+            ]
+        else:
+            self._start = _resampling_start(times, self.freq, self.origin)
+            self._next_target = self._start
+            source_times = times
+            source_values = np.r_[0.0, cumulated[:-1]]
+        if times.size > 1:
+            self._previous_time = times[-2]
+        else:
+            self._previous_time = self._last_time
+        self._last_time = times[-1]
+        self._cumulated_before = source_values[-1]
+        self._cumulated_after = cumulated[-1]
+        targets = _targets_before(self._next_target, self._last_time, self.freq)
+        return self._advance(source_times, source_values, targets)
+
+    def close(self) -> "pd.Series[float]":
+        """Terminate the resampling and return the remaining bins.
+
+        The end of the resampling range is deduced from the last samples of the
+        timeseries, as in :py:func:`.volume_to_freq`. The resampler cannot be
+        updated afterwards.
+
+        Returns
+        -------
+        pd.Series
+            The resampled values of the last bins.
+
+        Raises
+        ------
+        EATResamplingError :
+            In case the resampler is already closed.
+        EATEmptySourceError :
+            In case no sample has been received.
+        EATUndefinedTimestepError :
+            In case only one sample has been received and ``last_step_duration``
+            is |None|.
+        EATEmptyTargetsError :
+            In case the resampling range contains no target instant.
+
+        """
+        self._check_open()
+        if not self.started:
+            err = (
+                "Resampling an empty volumes series to new instants is an "
+                "invalid operation."
+            )
+            raise EATEmptySourceError(err)
+        if self._is_flow:
+            # the volume of the last flow-rate sample, as in flow_rate_conservative
+            if self._flow_previous_time is None:
+                tail = pd.DatetimeIndex([self._flow_time])
+            else:
+                tail = pd.DatetimeIndex([self._flow_previous_time, self._flow_time])
+            durations = timesteps(as_times(tail), self.last_step_duration)
+            last_volume = np.r_[self._flow_rate * durations[-1]]
+            resampled = self._update_volumes(tail[-1:], last_volume)
+        else:
+            resampled = self._empty_result()
+        if self._previous_time is None:
+            tail = pd.DatetimeIndex([self._last_time])
+        else:
+            tail = pd.DatetimeIndex([self._previous_time, self._last_time])
+        # ghost source sample, as in volume_conservative
+        durations = timesteps(as_times(tail), self.last_step_duration)
+        ghost_right = self._last_time + pd.Timedelta(seconds=durations[-1])
+        # end of the resampling range, as in index_to_freq
+        grid_step = self.last_step_duration
+        if grid_step is None:
+            grid_step = (tail[-1] - tail[-2]).seconds
+        end = self._last_time + pd.Timedelta(seconds=grid_step)
+        targets = _targets_before(self._next_target, end, self.freq)
+        if targets.empty and self._target is None:
+            err = "Target instants must be provided for the series to be resampled."
+            raise EATEmptyTargetsError(err)
+        # ghost target at the end of the last bin, as in volume_conservative
+        last_target = self._target if targets.empty else targets[-1]
+        ghost_target = last_target + pd.Timedelta(
+            seconds=pd.Timedelta(self.freq).total_seconds(),
+        )
+        self._closed = True
+        source_times = pd.DatetimeIndex([self._last_time, ghost_right])
+        source_values = np.r_[self._cumulated_before, self._cumulated_after]
+        last_bins = self._advance(
+            source_times,
+            source_values,
+            targets.insert(targets.size, ghost_target),
+        )
+        if resampled.empty:
+            return last_bins
+        return pd.concat([resampled, last_bins])
+
+    def _check_open(self) -> None:
+        """Raise an error if the resampler is closed."""
+        if self._closed:
+            err = "The resampler is closed and cannot process more data."
+            raise EATResamplingError(err)
+
+    def _advance(
+        self,
+        source_times: pd.DatetimeIndex,
+        source_values: np.ndarray,
+        targets: pd.DatetimeIndex,
+    ) -> "pd.Series[float]":
+        """Interpolate the cumulated volumes on new targets and return new bins.
+
+        Parameters
+        ----------
+        source_times : pd.DatetimeIndex
+            Instants of the source samples covering the new targets.
+        source_values : np.ndarray
+            Cumulated volumes at ``source_times``.
+        targets : pd.DatetimeIndex
+            The next targets of the resampling grid, which cumulated volumes
+            are determined by the source samples.
+
+        """
+        if targets.empty:
+            return self._empty_result()
+        # the same kernel as in volume_conservative so that results are identical
+        cumulated = piecewise_affine_kernel(
+            as_times(targets),
+            as_times(source_times),
+            source_values,
+        )
+        if self._target is not None:
+            cumulated = np.r_[self._target_cumulated, cumulated]
+            targets = targets.insert(0, self._target)
+        self._target = targets[-1]
+        self._target_cumulated = cumulated[-1]
+        self._next_target = pd.date_range(
+            start=self._target,
+            periods=2,
+            freq=self.freq,
+        )[-1]
+        values = np.diff(cumulated)
+        if self._is_flow:
+            values = values / (targets[1:] - targets[0:-1]).total_seconds()
+        resampled = pd.Series(
+            values,
+            index=targets[:-1].rename(self._index_name),
+            name=self._name,
+        )
+        return resampled.dropna()
+
+    def _empty_result(self, chunk: "pd.Series | None" = None) -> "pd.Series[float]":
+        """Return an empty result with the right name and index type."""
+        if chunk is not None and self._name is None:
+            tz, index_name, name = chunk.index.tz, chunk.index.name, chunk.name
+        elif self._start is not None:
+            tz, index_name, name = self._start.tz, self._index_name, self._name
+        elif chunk is not None:
+            tz, index_name, name = chunk.index.tz, self._index_name, self._name
+        else:
+            tz, index_name, name = None, None, None
+        return pd.Series(
+            [],
+            index=pd.DatetimeIndex([], tz=tz, name=index_name),
+            name=name,
+            dtype=np.float64,
+        )
+
+
+def _targets_before(
+    start: pd.Timestamp,
+    end: pd.Timestamp,
+    freq: str | pd.Timedelta,
+) -> pd.DatetimeIndex:
+    """Return the instants of the grid from ``start`` included to ``end`` excluded.
+
+    ``pd.date_range`` with ``inclusive="left"`` returns ``[start]`` instead of
+    an empty index when ``start == end``.
+    """
+    if start >= end:
+        return pd.date_range(start=start, periods=0, freq=freq)
+    return pd.date_range(start=start, end=end, freq=freq, inclusive="left")
+
+
+def volume_to_freq_chunks(
+    chunks: "Iterable[pd.Series[float]]",
+    freq: str | pd.Timedelta,
+    origin: Literal["floor", "ceil"] | pd.Timestamp | None = None,
+    last_step_duration: float | None = None,
+) -> "Iterator[pd.Series[float]]":
+    """Resample a volume timeseries provided as successive chunks.
+
+    Parameters
+    ----------
+    chunks : Iterable of pd.Series
+        The successive chunks of the timeseries. See
+        :py:meth:`ConservativeResampler.update`.
+    freq : str | pd.Timedelta
+        the freq to which the series is resampled. Must be a valid
+        pandas frequency.
+    origin : {None, 'floor, 'ceil', pd.Timestamp}, optional
+        What origin should be used for the target resampling range.
+        See :py:func:`.index_to_freq` for details.
+    last_step_duration : float, optional
+        Duration of the last time-step of the timeseries in (s).
+        The default is |None| in which case the duration of the former-last
+        time-step is used.
+
+    Yields
+    ------
+    pd.Series
+        The resampled bins, as soon as they are determined. Empty pieces are
+        not yielded.
+
+
+    .. seealso::
+
+        * :py:class:`ConservativeResampler` which is used to process the chunks.
+        * :py:func:`.volume_to_freq` which returns the same result from the
+          whole timeseries.
+
+    """
+    resampler = ConservativeResampler(
+        freq,
+        origin=origin,
+        last_step_duration=last_step_duration,
+    )
+    return _resample_chunks(chunks, resampler)
+
+
+def flow_rate_to_freq_chunks(
+    chunks: "Iterable[pd.Series[float]]",
+    freq: str | pd.Timedelta,
+    origin: Literal["floor", "ceil"] | pd.Timestamp | None = None,
+    last_step_duration: float | None = None,
+) -> "Iterator[pd.Series[float]]":
+    """Resample a flow-rate timeseries provided as successive chunks.
+
+    See :py:func:`volume_to_freq_chunks` for the parameters.
+
+    Yields
+    ------
+    pd.Series
+        The resampled bins, as soon as they are determined. Empty pieces are
+        not yielded.
+
+
+    .. seealso::
+
+        * :py:class:`ConservativeResampler` which is used to process the chunks.
+        * :py:func:`.flow_rate_to_freq` which returns the same result from the
+          whole timeseries.
+
+    """
+    resampler = ConservativeResampler(
+        freq,
+        origin=origin,
+        last_step_duration=last_step_duration,
+        method="flow_rate_conservative",
+    )
+    return _resample_chunks(chunks, resampler)
+
+
+def _resample_chunks(
+    chunks: "Iterable[pd.Series[float]]",
+    resampler: ConservativeResampler,
+) -> "Iterator[pd.Series[float]]":
+    """Yield the non-empty pieces returned by ``resampler`` fed with ``chunks``."""
+    for chunk in chunks:
+        resampled = resampler.update(chunk)
+        if not resampled.empty:
+            yield resampled
+    resampled = resampler.close()
+    if not resampled.empty:
+        yield resampled
+
+
+def append_to_freq(
+    resampled: "pd.Series[float] | None",
+    new_samples: "pd.Series[float]",
+    resampler: ConservativeResampler,
+) -> "tuple[int, pd.Series[float]]":
+    """Return the bins of a resampled timeseries which change with new samples.
+
+    Only the trailing bins of ``resampled`` which depend on the new samples are
+    recomputed, and ``resampled`` is not copied, so that the cost of an update
+    depends on the number of new samples rather than on the length of the
+    history. The caller replaces the trailing bins in its own storage, e.g. a
+    preallocated array or a table in which the rows are upserted.
+
+    Parameters
+    ----------
+    resampled : pd.Series or None
+        The resampled timeseries so far, as maintained from the former results
+        of this function for the same ``resampler``, or |None| for the first
+        call.
+    new_samples : pd.Series
+        The samples appended to the source timeseries since the last call,
+        located after the samples already processed by ``resampler``.
+    resampler : ConservativeResampler
+        The resampler which received all the former samples of the source
+        timeseries, and which holds the state of the resampling (last samples,
+        cumulated volume, pending bin). It is updated in place and should not
+        be closed.
+
+    Returns
+    -------
+    position : int
+        The position in ``resampled`` from which the bins are replaced. 0 for
+        the first call.
+    tail : pd.Series
+        The bins which replace the ones of ``resampled`` from ``position`` on.
+        ``pd.concat([resampled.iloc[:position], tail])`` is the resampled
+        timeseries, as :py:func:`.volume_to_freq` (or
+        :py:func:`.flow_rate_to_freq` depending on the ``resampler`` method)
+        would return from the whole source timeseries.
+
+    Example
+    -------
+    >>> resampler = ConservativeResampler("10min", method="flow_rate_conservative")
+    >>> _, resampled = append_to_freq(None, history, resampler)
+    >>> # ... later, when new readings are available
+    >>> position, tail = append_to_freq(resampled, new_readings, resampler)
+
+
+    .. seealso::
+
+        :py:meth:`ConservativeResampler.append` which returns the updated
+        trailing bins from :py:attr:`ConservativeResampler.pending_start`.
+
+    """
+    start = resampler.pending_start
+    tail = resampler.append(new_samples)
+    if resampled is None or start is None:
+        return 0, tail
+    return int(resampled.index.searchsorted(start)), tail
@@ -10,6 +10,10 @@ Main Features
   of degree days to measure energy needs based on temperature.
 - **Flexible Calculation Methods**: Supports multiple methods for calculating degree
   days, such as integral, mean temperature, and min-max methods.
+- **Degree Days Cache**: Precompute the temperature data once to get the degree days
+  for many reference temperatures, e.g. when calibrating a base temperature.
+- **Degree Days Store**: Share the degree days of a weather station between the
+  buildings which use it, within a memory budget.
 - **Temperature Analysis**: Tools to understand and model the effect of temperature
   on energy consumption, helping to quantify the impact of weather conditions.
 
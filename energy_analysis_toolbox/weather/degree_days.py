@@ -50,7 +50,7 @@ Freq: D, Name: cooling_degree_days, dtype: float64
 """
 
 from collections.abc import Callable
-from typing import Literal, cast
+from typing import TYPE_CHECKING, Literal, cast
 
 import pandas as pd
 
@@ -60,6 +60,9 @@ from energy_analysis_toolbox.errors.degree_days import (
     EATInvalidDegreeDaysMethodError,
 )
 
+if TYPE_CHECKING:
+    from energy_analysis_toolbox.weather.degree_days_store import DegreeDayStore
+
 dd_types = [
     "heating",
     "cooling",
@@ -368,6 +371,8 @@ def dd_compute(
     dd_type: literal_valid_dd_types,
     clip_tshd: float = 0,
     method: literal_computation_dd_types = "integral",
+    *,
+    store: "DegreeDayStore | None" = None,
     **kwargs,
 ) -> pd.Series:
     """Return daily degree-days with the specified method.
@@ -389,6 +394,13 @@ def dd_compute(
         - 'mean' : Mean method :py:func:`dd_mean`
         - 'integral' : Integral method :py:func:`dd_integral`
         - 'pro' : Pro method :py:func:`dd_pro`
+    store : DegreeDayStore or None, optional
+        A store of the degree days of weather stations. If given, the degree days
+        are read from the store when they have already been computed for the same
+        ``temperature`` object, else computed from the cache of the station and
+        stored. See
+        :py:class:`energy_analysis_toolbox.weather.degree_days_store.DegreeDayStore`.
+        The default is None.
     kwargs : mapping, optional
         A dictionary of keyword arguments passed to the degree-days computation
         methods, such as :py:func:`dd_integral`.
@@ -423,6 +435,8 @@ def dd_compute(
     Freq: D, Name: heating_degree_days, dtype: float64
 
     """
+    if store is not None:
+        return store.daily(temperature, reference, dd_type, clip_tshd, method, **kwargs)
     methods: dict[str, DegreeDaysFunction] = {
         "min_max": dd_min_max,
         "mean": dd_mean,
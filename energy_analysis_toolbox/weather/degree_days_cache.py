@@ -0,0 +1,351 @@
+r"""Compute degree-days repeatedly for many reference temperatures.
+
+The functions of :py:mod:`energy_analysis_toolbox.weather.degree_days` go through
+the whole temperature series for each reference temperature. When degree-days are
+computed for many references, e.g. while calibrating a base temperature, the
+:py:class:`DegreeDaysCache` does this pass once, and then computes the degree-days
+of each reference from per-day quantities only.
+
+For the ``integral`` method, the temperatures of each day are sorted and the
+cumulated sums of the timestep durations :math:`\\Delta t_i` and of
+:math:`T_i \\cdot \\Delta t_i` are stored in this order. For a reference
+temperature, the samples colder than the reference are a prefix of each day,
+which length is found by a ``searchsorted``. The heating degree-days of the day are
+then:
+
+.. math::
+    DD = \\frac{T_{ref} \\cdot \\sum_{T_i < T_{ref}} \\Delta t_i
+    - \\sum_{T_i < T_{ref}} T_i \\cdot \\Delta t_i}{\\sum_{i=1}^{N} \\Delta t_i}
+
+The other methods only need the daily min, max and mean temperatures.
+
+Examples
+--------
+>>> temp = pd.Series(np.random.randn(100), index=pd.date_range("2020-01-01",
+... periods=100, freq='h'))
+>>> cache = DegreeDaysCache(temp, method="integral")
+>>> cache.compute(17, "heating").head()
+2020-01-01    17.147638
+2020-01-02    17.262956
+2020-01-03    16.903173
+2020-01-04    17.132581
+2020-01-05    16.918075
+Freq: D, Name: heating_degree_days, dtype: float64
+
+"""
+
+import numpy as np
+import pandas as pd
+
+import energy_analysis_toolbox as eat
+from energy_analysis_toolbox.errors.degree_days import EATInvalidDegreeDaysMethodError
+from energy_analysis_toolbox.weather.degree_days import (
+    _assert_dd_type,
+    computation_dd_types,
+    literal_computation_dd_types,
+    literal_valid_dd_types,
+)
+
+
+class DegreeDaysCache:
+    """Degree-days of a temperature series, for any reference temperature.
+
+    The result of :py:meth:`compute` is the same as the one of
+    ``dd_compute(temperature, reference, dd_type, clip_tshd, method).resample(
+    frequency).sum()``, but the temperature series is processed only once, when
+    the cache is created.
+    """
+
+    def __init__(
+        self,
+        temperature: pd.Series,
+        method: literal_computation_dd_types = "integral",
+        frequency: str = "1D",
+        intraday_clip_tshd: float | None = 0,
+    ) -> None:
+        """Precompute the daily quantities of a temperature series.
+
+        Parameters
+        ----------
+        temperature : pd.Series
+            The timeseries of temperature measures from which DD data has to be
+            inferred.
+        method : {'min_max', 'mean', 'integral', 'pro'}, optional
+            The method used to compute the degree-days. See
+            :py:func:`energy_analysis_toolbox.weather.degree_days.dd_compute`.
+            The default is 'integral'.
+        frequency : str, optional
+            The frequency at which the daily degree-days are summed by
+            :py:meth:`compute` and :py:meth:`degree_days`. The default is "1D".
+        intraday_clip_tshd : float or None, optional
+            Used by the ``integral`` method only. See
+            :py:func:`energy_analysis_toolbox.weather.degree_days.dd_integral`.
+            The default is ``0``.
+
+        Raises
+        ------
+        EATInvalidDegreeDaysMethodError
+            If the method is not recognized.
+
+        """
+        if method not in computation_dd_types:
+            raise EATInvalidDegreeDaysMethodError(method, computation_dd_types)
+        self.method = method
+        self.frequency = frequency
+        self.intraday_clip_tshd = intraday_clip_tshd
+        day_codes = temperature.groupby(pd.Grouper(freq="D")).ngroup().to_numpy()
+        self._days = temperature.resample("D").size().index
+        by_period = pd.Series(0.0, index=self._days).groupby(pd.Grouper(freq=frequency))
+        self._period_codes = by_period.ngroup().to_numpy()
+        self._periods = by_period.sum().index
+        if method == "integral":
+            self._init_integral(temperature, day_codes)
+        else:
+            stats = temperature.resample("D").agg(["min", "max", "mean"])
+            self._min = stats["min"].to_numpy(dtype=np.float64)
+            self._max = stats["max"].to_numpy(dtype=np.float64)
+            self._mean = stats["mean"].to_numpy(dtype=np.float64)
+
+    def _init_integral(
+        self,
+        temperature: pd.Series,
+        day_codes: np.ndarray,
+    ) -> None:
+        """Sort the temperatures of each day and cumulate the weighted sums."""
+        durations = eat.timeseries.extract_features.timestep_durations(temperature)
+        durations = durations.to_numpy()
+        values = temperature.to_numpy(dtype=np.float64)
+        n_days = self._days.size
+        # missing temperatures count in the durations of the days only
+        self._day_durations = np.bincount(
+            day_codes,
+            weights=durations,
+            minlength=n_days,
+        )
+        is_valid = ~np.isnan(values)
+        values = values[is_valid]
+        durations = durations[is_valid]
+        day_codes = day_codes[is_valid]
+        order = np.lexsort((values, day_codes))
+        self._sorted = values[order]
+        self._cum_durations = np.r_[0.0, np.cumsum(durations[order])]
+        self._cum_products = np.r_[0.0, np.cumsum(durations[order] * self._sorted)]
+        self._starts = np.searchsorted(day_codes[order], np.arange(n_days))
+        self._ends = np.searchsorted(day_codes[order], np.arange(n_days), side="right")
+        # each day lies in its own interval of width span, in increasing order
+        self._offset = self._sorted.min() if self._sorted.size else 0.0
+        self._span = (
+            (self._sorted.max() - self._offset + 1) if self._sorted.size else 1.0
+        )
+        self._keys = self._sorted - self._offset + self._span * day_codes[order]
+
+    @property
+    def days(self) -> pd.DatetimeIndex:
+        """The days of the daily degree-days."""
+        return self._days
+
+    @property
+    def periods(self) -> pd.DatetimeIndex:
+        """The periods of the degree-days summed at the cache frequency."""
+        return self._periods
+
+    @property
+    def nbytes(self) -> int:
+        """The memory used by the precomputed arrays, in bytes."""
+        arrays = [
+            value for value in vars(self).values() if isinstance(value, np.ndarray)
+        ]
+        return (
+            sum(array.nbytes for array in arrays)
+            + self._days.nbytes
+            + self._periods.nbytes
+        )
+
+    def daily_degree_days(
+        self,
+        reference: float | np.ndarray,
+        dd_type: literal_valid_dd_types,
+        clip_tshd: float = 0,
+    ) -> np.ndarray:
+        """Return the daily degree-days for one or several reference temperatures.
+
+        Parameters
+        ----------
+        reference : float or np.ndarray
+            The reference temperature for degree-days computation. An array of
+            references computes the degree-days of all of them at once.
+        dd_type : {'heating', 'cooling'}
+            The type of degree-days to compute.
+        clip_tshd : float, optional
+            A threshold under which the computed degree-days are clipped.
+            The default is 0.
+
+        Returns
+        -------
+        np.ndarray
+            The degree-days of each day in :py:attr:`days`, with shape
+            ``reference.shape + (days.size,)``. Days without data receive ``nan``
+            values.
+
+        """
+        _assert_dd_type(dd_type)
+        # the references vary along all the axes but the last one of the days
+        reference = np.asarray(reference, dtype=np.float64)[..., np.newaxis]
+        if self.method == "integral":
+            degree_days = self._dd_integral(reference, dd_type)
+        elif self.method == "pro":
+            return self._dd_pro(reference, dd_type, clip_tshd)
+        elif self.method == "mean":
+            degree_days = reference - self._mean
+        else:
+            degree_days = reference - (self._min + self._max) / 2
+        if dd_type == "cooling" and self.method != "integral":
+            degree_days = -degree_days
+        if clip_tshd is not None:
+            np.maximum(degree_days, clip_tshd, out=degree_days)
+        return degree_days
+
+    def degree_days(
+        self,
+        reference: float | np.ndarray,
+        dd_type: literal_valid_dd_types,
+        clip_tshd: float = 0,
+    ) -> np.ndarray:
+        """Return the degree-days summed at the cache frequency.
+
+        Parameters
+        ----------
+        reference : float or np.ndarray
+            The reference temperature for degree-days computation. An array of
+            references computes the degree-days of all of them at once.
+        dd_type : {'heating', 'cooling'}
+            The type of degree-days to compute.
+        clip_tshd : float, optional
+            A threshold under which the computed daily degree-days are clipped.
+            The default is 0.
+
+        Returns
+        -------
+        np.ndarray
+            The sum of the daily degree-days in each period of :py:attr:`periods`,
+            with shape ``reference.shape + (periods.size,)``. Days without data are
+            ignored.
+
+        """
+        daily = self.daily_degree_days(reference, dd_type, clip_tshd)
+        n_periods = self._periods.size
+        batch = np.nan_to_num(daily, nan=0.0).reshape(-1, daily.shape[-1])
+        codes = self._period_codes + n_periods * np.arange(batch.shape[0])[:, None]
+        return np.bincount(
+            codes.ravel(),
+            weights=batch.ravel(),
+            minlength=batch.shape[0] * n_periods,
+        ).reshape((*daily.shape[:-1], n_periods))
+
+    def compute(
+        self,
+        reference: float,
+        dd_type: literal_valid_dd_types,
+        clip_tshd: float = 0,
+    ) -> pd.Series:
+        """Return the timeseries of degree-days summed at the cache frequency.
+
+        See :py:meth:`degree_days` for the parameters, with a single reference
+        temperature.
+
+        Returns
+        -------
+        pd.Series :
+            The timeseries of degree-days for the period covered by the temperature.
+
+        """
+        return pd.Series(
+            self.degree_days(reference, dd_type, clip_tshd),
+            index=self._periods,
+            name=(
+                eat.keywords.heating_dd_f
+                if dd_type == "heating"
+                else eat.keywords.cooling_dd_f
+            ),
+        )
+
+    def _split(
+        self,
+        threshold: np.ndarray,
+        *,
+        inclusive: bool,
+    ) -> np.ndarray:
+        """Return the end positions of the samples under a threshold in each day.
+
+        The sorted temperatures of the days are shifted apart in :py:attr:`_keys`,
+        so that a single ``searchsorted`` call splits all the days at once.
+        """
+        shifted = np.clip(threshold - self._offset, -0.5, self._span - 0.5)
+        return np.searchsorted(
+            self._keys,
+            shifted + self._span * np.arange(self._days.size),
+            side="right" if inclusive else "left",
+        )
+
+    def _dd_integral(
+        self,
+        reference: np.ndarray,
+        dd_type: literal_valid_dd_types,
+    ) -> np.ndarray:
+        """Return the daily degree-days with the integral method."""
+        total_durations = (
+            self._cum_durations[self._ends] - self._cum_durations[self._starts]
+        )
+        total_products = (
+            self._cum_products[self._ends] - self._cum_products[self._starts]
+        )
+        clip = self.intraday_clip_tshd
+        if clip is None:
+            integral = reference * total_durations - total_products
+            if dd_type == "cooling":
+                integral = -integral
+        else:
+            if dd_type == "heating":
+                split = self._split(reference - clip, inclusive=False)
+            else:
+                split = self._split(reference + clip, inclusive=True)
+            low_durations = (
+                self._cum_durations[split] - self._cum_durations[self._starts]
+            )
+            low_products = self._cum_products[split] - self._cum_products[self._starts]
+            if dd_type == "heating":
+                integral = (
+                    reference * low_durations
+                    - low_products
+                    + clip * (total_durations - low_durations)
+                )
+            else:
+                integral = (
+                    total_products
+                    - low_products
+                    - reference * (total_durations - low_durations)
+                    + clip * low_durations
+                )
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return integral / self._day_durations
+
+    def _dd_pro(
+        self,
+        reference: np.ndarray,
+        dd_type: literal_valid_dd_types,
+        clip_tshd: float,
+    ) -> np.ndarray:
+        """Return the daily degree-days with the pro method."""
+        t_min, t_max, t_mean = self._min, self._max, self._mean
+        if dd_type == "cooling":
+            # Invert all the signs to compute cooling degree days
+            t_min, t_max, t_mean = -self._max, -self._min, -self._mean
+            reference = -reference
+            clip_tshd = -clip_tshd
+        degree_days = np.where(t_min > reference, clip_tshd, reference - t_mean)
+        between = (t_min <= reference) & (t_max >= reference)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            intermediate = (reference - t_min) * (
+                0.08 + 0.42 * (reference - t_min) / (t_max - t_min)
+            )
+        return np.where(between, intermediate, degree_days)
@@ -0,0 +1,313 @@
+"""Share the degree days of a weather station between buildings.
+
+Many buildings use the temperature of the same weather station. The
+:py:class:`DegreeDayStore` memoizes the temperature-side computations, so that they
+are done once per station rather than once per building:
+
+- the daily degree days of
+  :py:func:`energy_analysis_toolbox.weather.degree_days.dd_compute` and their sums at
+  a given frequency;
+- the mean temperature at a given frequency;
+- the :py:class:`energy_analysis_toolbox.weather.degree_days_cache.DegreeDaysCache`
+  used to calibrate the base temperatures.
+
+The degree days are computed from the cache of the station, hence equal the ones of
+:py:func:`energy_analysis_toolbox.weather.degree_days.dd_compute` up to rounding
+errors, and each new base temperature costs a few operations per day only.
+
+The results are kept in a least recently used (LRU) order, and the oldest ones are
+evicted when the memory used by the store exceeds its budget.
+
+A station is identified by its name when one is given, else by the temperature
+series object itself. Hence buildings on the same station should share the same
+temperature series, or give the same station name.
+
+Examples
+--------
+>>> store = DegreeDayStore(max_bytes=2**20)
+>>> dd_compute(temperature, 17, "heating", store=store)  # computed
+>>> dd_compute(temperature, 17, "heating", store=store)  # read from the store
+>>> store.hits, store.misses
+(1, 1)
+
+"""
+
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from contextlib import suppress
+from typing import Any
+
+import pandas as pd
+
+import energy_analysis_toolbox as eat
+from energy_analysis_toolbox.weather.degree_days import (
+    literal_computation_dd_types,
+    literal_valid_dd_types,
+)
+from energy_analysis_toolbox.weather.degree_days_cache import DegreeDaysCache
+
+
+class DegreeDayStore:
+    """Memoize the degree days of weather stations, within a memory budget."""
+
+    def __init__(
+        self,
+        max_bytes: int = 2**27,
+    ) -> None:
+        """Initialize an empty store.
+
+        Parameters
+        ----------
+        max_bytes : int, optional
+            The memory budget of the store, in bytes. A result larger than the
+            budget is returned without being stored. The default is 128 MiB.
+
+        """
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._nbytes = 0
+        # key -> (result, size in bytes, temperature which identifies the station)
+        self._entries: OrderedDict[tuple, tuple[Any, int, pd.Series]] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of stored results."""
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        """The memory used by the stored results, in bytes."""
+        return self._nbytes
+
+    def clear(self) -> None:
+        """Remove all the stored results."""
+        self._entries.clear()
+        self._nbytes = 0
+
+    def daily(
+        self,
+        temperature: pd.Series,
+        reference: float,
+        dd_type: literal_valid_dd_types,
+        clip_tshd: float = 0,
+        method: literal_computation_dd_types = "integral",
+        *,
+        station: Hashable | None = None,
+        **kwargs,
+    ) -> pd.Series:
+        """Return the daily degree days of a station.
+
+        See :py:func:`energy_analysis_toolbox.weather.degree_days.dd_compute` for
+        the parameters. Only the ``intraday_clip_tshd`` keyword argument of the
+        ``integral`` method is accepted in ``kwargs``.
+
+        Parameters
+        ----------
+        station : Hashable or None, optional
+            The name of the weather station. If None, the station is identified by
+            the ``temperature`` object. The default is None.
+
+        Returns
+        -------
+        pd.Series :
+            The timeseries of daily degree-days for the period covered by the
+            temperature.
+
+        """
+        key = (
+            "daily",
+            float(reference),
+            dd_type,
+            clip_tshd,
+            method,
+            tuple(sorted(kwargs.items())),
+        )
+        return self._get(
+            key,
+            temperature,
+            station,
+            lambda: self._compute_daily(
+                self.cache(temperature, method, "1D", station=station, **kwargs),
+                reference,
+                dd_type,
+                clip_tshd,
+            ),
+        ).copy()
+
+    @staticmethod
+    def _compute_daily(
+        cache: DegreeDaysCache,
+        reference: float,
+        dd_type: literal_valid_dd_types,
+        clip_tshd: float,
+    ) -> pd.Series:
+        """Return the daily degree days of a cache, nan for the days without data.
+
+        The sums of :py:meth:`DegreeDaysCache.compute` ignore the days without
+        data, which would be 0 instead of nan as in ``dd_compute``.
+        """
+        return pd.Series(
+            cache.daily_degree_days(reference, dd_type, clip_tshd),
+            index=cache.days,
+            name=(
+                eat.keywords.heating_dd_f
+                if dd_type == "heating"
+                else eat.keywords.cooling_dd_f
+            ),
+        )
+
+    def resampled(
+        self,
+        temperature: pd.Series,
+        reference: float,
+        dd_type: literal_valid_dd_types,
+        frequency: str,
+        *,
+        clip_tshd: float = 0,
+        method: literal_computation_dd_types = "integral",
+        station: Hashable | None = None,
+        **kwargs,
+    ) -> pd.Series:
+        """Return the degree days of a station summed at a frequency.
+
+        See :py:meth:`daily` for the parameters.
+
+        Parameters
+        ----------
+        frequency : str
+            The frequency at which the daily degree days are summed.
+
+        Returns
+        -------
+        pd.Series :
+            The timeseries of degree-days summed at the frequency.
+
+        """
+        key = (
+            "resampled",
+            float(reference),
+            dd_type,
+            frequency,
+            clip_tshd,
+            method,
+            tuple(sorted(kwargs.items())),
+        )
+        return self._get(
+            key,
+            temperature,
+            station,
+            lambda: self.cache(
+                temperature,
+                method,
+                frequency,
+                station=station,
+                **kwargs,
+            ).compute(reference, dd_type, clip_tshd),
+        ).copy()
+
+    def mean_temperature(
+        self,
+        temperature: pd.Series,
+        frequency: str,
+        *,
+        station: Hashable | None = None,
+    ) -> pd.Series:
+        """Return the mean temperature of a station at a frequency.
+
+        Parameters
+        ----------
+        temperature : pd.Series
+            The timeseries of temperature measures of the station.
+        frequency : str
+            The frequency at which the temperature is averaged.
+        station : Hashable or None, optional
+            The name of the weather station. If None, the station is identified by
+            the ``temperature`` object. The default is None.
+
+        Returns
+        -------
+        pd.Series :
+            The mean temperature of each period.
+
+        """
+        return self._get(
+            ("mean_temperature", frequency),
+            temperature,
+            station,
+            lambda: temperature.resample(frequency).mean(),
+        ).copy()
+
+    def cache(
+        self,
+        temperature: pd.Series,
+        method: literal_computation_dd_types = "integral",
+        frequency: str = "1D",
+        intraday_clip_tshd: float | None = 0,
+        *,
+        station: Hashable | None = None,
+    ) -> DegreeDaysCache:
+        """Return the degree days cache of a station.
+
+        See
+        :py:class:`energy_analysis_toolbox.weather.degree_days_cache.DegreeDaysCache`
+        for the parameters.
+
+        Parameters
+        ----------
+        station : Hashable or None, optional
+            The name of the weather station. If None, the station is identified by
+            the ``temperature`` object. The default is None.
+
+        Returns
+        -------
+        DegreeDaysCache
+            The cache, shared by all the callers. It must not be modified.
+
+        """
+        return self._get(
+            ("cache", method, frequency, intraday_clip_tshd),
+            temperature,
+            station,
+            lambda: DegreeDaysCache(
+                temperature,
+                method=method,
+                frequency=frequency,
+                intraday_clip_tshd=intraday_clip_tshd,
+            ),
+        )
+
+    def _get(
+        self,
+        key: tuple,
+        temperature: pd.Series,
+        station: Hashable | None,
+        compute: Callable[[], Any],
+    ) -> Any:  # noqa:ANN401
+        """Return a stored result, or compute and store it.
+
+        Without a station name, the key holds the identity of the temperature. The
+        entry keeps a reference to the temperature, so that its identity cannot be
+        reused by another object while the entry is stored.
+        """
+        if station is None:
+            key = ("temperature", id(temperature), *key)
+        else:
+            key = ("station", station, *key)
+        with suppress(KeyError):
+            result = self._entries[key][0]
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+        self.misses += 1
+        result = compute()
+        if isinstance(result, DegreeDaysCache):
+            size = result.nbytes
+        else:
+            size = int(result.memory_usage(index=True, deep=False))
+        if size <= self.max_bytes:
+            self._entries[key] = (result, size, temperature)
+            self._nbytes += size
+            while self._nbytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._nbytes -= evicted_size
+        return result